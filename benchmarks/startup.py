@@ -0,0 +1,60 @@
+"""Measures how long markdowndotnet takes to start
+
+Each command is run several times in a new interpreter, reporting the best and median wall times.
+Startup should stay low for commands that don't need the assembly, since heavy dependencies
+(pythonnet, requests, yaml) are only imported by the phases that use them.
+
+Usage: python benchmarks/startup.py [--runs N] [--xml PATH]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+script = os.path.join(root, "markdowndotnet.py")
+
+
+def measure(args, runs):
+    """Runs a command several times
+
+    :param list[str] args: The command's arguments.
+    :param int runs: How many times the command is run.
+    :return: The time of each run, in seconds.
+    :rtype: list[float]
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+@click.command()
+@click.option('-n', '--runs', type=click.IntRange(min=1), default=10, help="Times each command is run")
+@click.option('--xml', 'xml_path', type=click.Path(exists=True, dir_okay=False), help="XML file used to time an --xml-only build")
+def main(runs, xml_path):
+    commands = [
+        ("interpreter", [sys.executable, "-c", "pass"]),
+        ("import", [sys.executable, "-c", "import markdowndotnet"]),
+        ("--help", [sys.executable, script, "--help"]),
+    ]
+    with tempfile.TemporaryDirectory() as output:
+        if xml_path is not None:
+            commands.append(("--xml-only", [sys.executable, script, "--xml-only", "--offline", "--force", "-q",
+                                            "--cache", os.path.join(output, "cache.sqlite"), "-o", output,
+                                            os.path.abspath(xml_path)]))
+        click.echo("{:<12} {:>9} {:>9}".format("command", "best", "median"))
+        for name, args in commands:
+            times = measure(args, runs)
+            click.echo("{:<12} {:>7.1f}ms {:>7.1f}ms".format(name, min(times) * 1000,
+                                                           statistics.median(times) * 1000))
+
+
+if __name__ == '__main__':
+    main()
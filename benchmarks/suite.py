@@ -0,0 +1,315 @@
+"""Measures the time taken by each phase of a build, on synthetic documentation of configurable size
+
+For each scale, an XML documentation file is generated with the given number of members, spread over types in
+deeply nested namespaces, with overloaded methods and constructors and plenty of 'see' references to local and
+external types and members. Since the assembly itself can't be generated, types and members are taken from the
+XML file (see :class:`markdowndotnet.XmlAssembly`), and xref requests are answered locally, so no network is used.
+
+The phases timed are parsing the XML file (:func:`parse_documentation`), converting the parsed contents into
+markdown (:func:`parse_content`), resolving the links of every reference (:meth:`TypeResolver.get_link`) and
+generating every page (:func:`build_documentation`). Each phase is run several times, keeping the best time.
+
+Results can be saved as a baseline, following runs are compared to it, and phases slower than the baseline by more
+than the threshold are reported as regressions, exiting with an error code. Timings depend on the machine, so the
+baseline is local to it and isn't committed: save one before making changes, then compare to it afterwards.
+
+Usage: python benchmarks/suite.py [--members N]... [--runs N] [--baseline PATH] [--save] [--threshold PERCENT]
+"""
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import click
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+import markdowndotnet  # noqa: E402
+
+default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+external_types = ["System.String", "System.Int32", "System.Int64", "System.Boolean", "System.Double", "System.Object",
+                  "System.DateTime", "System.TimeSpan", "System.Guid", "System.Uri", "System.Exception",
+                  "System.IO.Stream", "System.Text.StringBuilder", "System.Threading.CancellationToken"]
+
+phases = ("parse_documentation", "parse_content", "get_link", "build_documentation")
+
+
+def generate(path, members, depth=4, members_per_type=25, overloads=4, seed=0):
+    """Writes a synthetic XML documentation file
+
+    :param str path: The path of the file to write.
+    :param int members: The approximate number of members to generate, types included.
+    :param int depth: The number of levels of the namespaces.
+    :param int members_per_type: The number of members of each type.
+    :param int overloads: The maximum number of overloads of each method and constructor.
+    :param int seed: The seed of the random generator, so the same file is generated every time.
+    """
+    rng = random.Random(seed)
+    type_count = max(1, members // (members_per_type + 1))
+    namespace_count = max(1, type_count // 20)
+    namespaces = []
+    for i in range(namespace_count):
+        parts = ["Bench"] + ["Level{0}".format((i >> (2 * level)) % 4) for level in range(depth - 2)]
+        namespaces.append(".".join(parts + ["Ns{0}".format(i)]))
+    types = ["{0}.Type{1}".format(namespaces[i % namespace_count], i) for i in range(type_count)]
+
+    def type_name():
+        return rng.choice(types) if rng.random() < 0.5 else rng.choice(external_types)
+
+    def reference():
+        kind = rng.random()
+        if kind < 0.4:
+            return "T:" + type_name()
+        if kind < 0.7:
+            return "P:{0}.Property{1}".format(rng.choice(types), rng.randrange(3))
+        if kind < 0.8:
+            return "F:{0}.Field{1}".format(rng.choice(types), rng.randrange(3))
+        return "M:{0}.Method{1}".format(rng.choice(types), rng.randrange(3))
+
+    def text(words):
+        content = []
+        for i in range(words):
+            if rng.random() < 0.15:
+                content.append('<see cref="{0}"/>'.format(reference()))
+            elif rng.random() < 0.05:
+                content.append("<c>value{0}</c>".format(i))
+            else:
+                content.append("word{0}".format(rng.randrange(1000)))
+        return " ".join(content)
+
+    def parameters(count):
+        return [type_name() + ("[]" if rng.random() < 0.1 else "") for _ in range(count)]
+
+    def write_member(file, name, summary, params=(), returns=False, value=False):
+        file.write('<member name="{0}">\n<summary>{1}</summary>\n'.format(name, summary))
+        for i, _ in enumerate(params):
+            file.write('<param name="arg{0}">{1}</param>\n'.format(i, text(6)))
+        if returns:
+            file.write("<returns>{0}</returns>\n".format(text(5)))
+        if value:
+            file.write("<value>{0}</value>\n".format(text(5)))
+        file.write("</member>\n")
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('<?xml version="1.0"?>\n<doc>\n<assembly>\n<name>Bench</name>\n</assembly>\n<members>\n')
+        for i, full_name in enumerate(types):
+            if i % 50 == 49:
+                # Delegates only have parameters and a return value
+                write_member(file, "T:" + full_name, text(15), parameters(rng.randint(1, 3)), returns=True)
+                continue
+            write_member(file, "T:" + full_name, text(30))
+            count = 0
+            while count < members_per_type:
+                kind = count % 5
+                if kind == 0:
+                    for overload in range(min(rng.randint(1, overloads), members_per_type - count)):
+                        params = parameters(overload)
+                        name = "M:{0}.#ctor{1}".format(full_name, "({0})".format(",".join(params)) if params else "")
+                        write_member(file, name, text(12), params)
+                        count += 1
+                elif kind == 1 or kind == 4:
+                    method = "Method{0}".format(count)
+                    for overload in range(min(rng.randint(1, overloads), members_per_type - count)):
+                        params = parameters(overload + 1)
+                        name = "M:{0}.{1}({2})".format(full_name, method, ",".join(params))
+                        write_member(file, name, text(15), params, returns=rng.random() < 0.7)
+                        count += 1
+                elif kind == 2:
+                    write_member(file, "P:{0}.Property{1}".format(full_name, count), text(10), value=True)
+                    count += 1
+                else:
+                    prefix, name = ("E", "Event") if rng.random() < 0.2 else ("F", "Field")
+                    write_member(file, "{0}:{1}.{2}{3}".format(prefix, full_name, name, count), text(8))
+                    count += 1
+        file.write("</members>\n</doc>\n")
+
+
+def request_external_link(full_name):
+    """Answers xref requests locally, in place of :func:`markdowndotnet.request_external_link`
+
+    :param str full_name: The full name of the type.
+    :return: A tuple containing the name and url of the type's documentation.
+    :rtype: tuple[str, str]
+    """
+    return full_name.rsplit(".", 1)[-1], "https://docs.microsoft.com/dotnet/api/" + full_name.lower()
+
+
+def reset_xref_cache():
+    """Replaces the xref cache with an empty one, kept in memory"""
+    if markdowndotnet.xref_cache is not None:
+        markdowndotnet.xref_cache.close()
+    markdowndotnet.xref_cache = markdowndotnet.XrefCache(":memory:", 3600)
+
+
+def best_time(function, runs, setup=None):
+    """Runs a function several times, returning the fastest run
+
+    :param function: The function to time.
+    :param int runs: How many times the function is run.
+    :param setup: A function called before each run, whose result is passed to the timed function. Not timed.
+    :return: The time of the fastest run, in seconds.
+    :rtype: float
+    """
+    times = []
+    for _ in range(runs):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        function(argument)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def collect_contents(hierarchy):
+    """Gets every parsed documentation content of the hierarchy, along with the file it is shown in
+
+    :param dict[str, markdowndotnet.Namespace] hierarchy: The documentation hierarchy.
+    :return: A list of tuples containing the content and the page's path.
+    :rtype: list[tuple[str or list, str]]
+    """
+    contents = []
+
+    def collect(documentation, file_path):
+        for value in documentation.values():
+            if isinstance(value, dict):
+                collect(value, file_path)
+            else:
+                contents.append((value, file_path))
+
+    for namespace in hierarchy.values():
+        for type_doc in namespace.types.values():
+            file_path = os.path.join(markdowndotnet.output_dir,
+                                     markdowndotnet.get_filename(type_doc.namespace, type_doc.name))
+            collect(type_doc.documentation, file_path)
+            for member_doc in type_doc.children.values():
+                collect(member_doc.documentation, file_path)
+    return contents
+
+
+def run_scale(members, runs, work_dir):
+    """Times every phase for a number of members
+
+    :param int members: The number of members of the generated documentation.
+    :param int runs: How many times each phase is run.
+    :param str work_dir: The folder where the XML file is generated.
+    :return: The best time of each phase, in seconds.
+    :rtype: dict[str, float]
+    """
+    xml_path = os.path.join(work_dir, "Bench{0}.xml".format(members))
+    generate(xml_path, members)
+    results = {}
+
+    results["parse_documentation"] = best_time(lambda _: markdowndotnet.parse_documentation(xml_path, dump=False),
+                                               runs)
+    hierarchy = markdowndotnet.parse_documentation(xml_path, dump=False)
+    contents = collect_contents(hierarchy)
+    # Only references to types, fields, properties and events are links
+    references = [(segment, file_path) for content, file_path in contents if isinstance(content, list)
+                  for segment in content if not isinstance(segment, str) and segment[0] in "TPFE"]
+
+    def new_resolver():
+        reset_xref_cache()
+        return markdowndotnet.TypeResolver(markdowndotnet.XmlAssembly(hierarchy))
+
+    def parse_contents(resolver):
+        for content, file_path in contents:
+            markdowndotnet.parse_content(resolver, content, file_path)
+
+    results["parse_content"] = best_time(parse_contents, runs, new_resolver)
+
+    def get_links(resolver):
+        for (member_type, full_name), file_path in references:
+            if member_type == "T":
+                resolver.get_link(type_name=full_name, current_file=file_path)
+            else:
+                type_name, _, name = full_name.rpartition(".")
+                resolver.get_link(type_name=type_name, current_file=file_path, anchor=name)
+
+    results["get_link"] = best_time(get_links, runs, new_resolver)
+
+    def build(resolver):
+        markdowndotnet.output_sink = markdowndotnet.MemoryOutput()
+        markdowndotnet.build_documentation(None, hierarchy, force=True, resolver=resolver)
+
+    results["build_documentation"] = best_time(build, runs, new_resolver)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Compares results to a baseline
+
+    :param dict results: The results of each scale, keyed by the number of members.
+    :param dict baseline: The baseline's results, in the same format.
+    :param float threshold: How much slower a phase can be than the baseline, in percent.
+    :return: The phases slower than the baseline, as tuples of scale, phase and percentage.
+    :rtype: list[tuple[str, str, float]]
+    """
+    regressions = []
+    for scale, timings in results.items():
+        for phase, seconds in timings.items():
+            previous = baseline.get(scale, {}).get(phase)
+            if not previous:
+                continue
+            change = (seconds - previous) / previous * 100
+            if change > threshold:
+                regressions.append((scale, phase, change))
+    return regressions
+
+
+@click.command()
+@click.option('-m', '--members', type=click.IntRange(min=1), multiple=True, default=[1000, 10000],
+              show_default=True, help="Number of members to generate, can be used several times")
+@click.option('-n', '--runs', type=click.IntRange(min=1), default=3, show_default=True,
+              help="Times each phase is run")
+@click.option('--baseline', 'baseline_path', type=click.Path(dir_okay=False), default=default_baseline,
+              help="File with the results to compare to")
+@click.option('--save', is_flag=True, help="Save the results as the new baseline")
+@click.option('--threshold', type=float, default=20, show_default=True,
+              help="Percentage a phase can be slower than the baseline before being reported")
+def main(members, runs, baseline_path, save, threshold):
+    logging.basicConfig(level=logging.ERROR)
+    markdowndotnet.log.setLevel(logging.ERROR)
+    markdowndotnet.request_external_link = request_external_link
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f).get("results", {})
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        markdowndotnet.output_dir = work_dir
+        # Dependencies imported on first use would be counted in the first phase using them otherwise
+        run_scale(100, 1, work_dir)
+        click.echo("{:>8} {:<20} {:>10} {:>10} {:>8}".format("members", "phase", "time", "baseline", "change"))
+        for scale in members:
+            timings = run_scale(scale, runs, work_dir)
+            results[str(scale)] = timings
+            for phase in phases:
+                previous = baseline.get(str(scale), {}).get(phase)
+                click.echo("{:>8} {:<20} {:>8.1f}ms {:>10} {:>8}".format(
+                    scale, phase, timings[phase] * 1000,
+                    "{:.1f}ms".format(previous * 1000) if previous else "-",
+                    "{:+.1f}%".format((timings[phase] - previous) / previous * 100) if previous else "-"))
+    markdowndotnet.xref_cache.close()
+
+    regressions = compare(results, baseline, threshold)
+    for scale, phase, change in regressions:
+        click.echo("Regression: {0} is {1:.1f}% slower with {2} members".format(phase, change, scale), err=True)
+    if save:
+        baseline_results = dict(baseline)
+        baseline_results.update(results)
+        with open(baseline_path, "w") as f:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                       "results": baseline_results}, f, indent=1, sort_keys=True)
+        click.echo("Saved baseline to {0}".format(baseline_path))
+    elif regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
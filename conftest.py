@@ -0,0 +1 @@
+# Makes pytest add the repository's root to the path, so the tests import markdowndotnet from the working tree
@@ -1,18 +1,148 @@
+"""Copies the generated files into the mkdocs documentation folder, and adds them to the mkdocs configuration
+
+Only files that changed since the last deploy are copied. Files are hardlinked when possible, so an unchanged page
+is recognized by being the same file, and copied otherwise. Files generated by a previous deploy that are no longer
+in the output are removed.
+"""
+import filecmp
+import json
+import os
+import shutil
+
+import click
 import yaml
-from distutils import dir_util, file_util
 
-# Copy generated files in output to docs
-dir_util.copy_tree("output", "docs")
+# The C implementations are much faster, but are only available if PyYAML was built with libyaml
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Lists the files copied by the last deploy, so the ones no longer generated can be removed.
+# mkdocs ignores files starting with a dot.
+state_file = ".markdowndotnet-deploy.json"
+
+
+def sync_file(source, destination):
+    """Makes a file in the documentation folder the same as a generated file
+
+    :param str source: The path of the generated file.
+    :param str destination: The path in the documentation folder.
+    :return: Whether the file's contents changed.
+    :rtype: bool
+    """
+    changed = True
+    if os.path.exists(destination):
+        # Generated files are replaced when written, so a hardlinked file is only the same file if it didn't change
+        if os.path.samefile(source, destination):
+            return False
+        changed = os.path.getsize(source) != os.path.getsize(destination) or \
+            not filecmp.cmp(source, destination, shallow=False)
+    else:
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+    temp_path = destination + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        # Hardlinks are not supported, or the folders are in different file systems
+        if not changed:
+            return False
+        shutil.copy2(source, temp_path)
+    os.replace(temp_path, destination)
+    return changed
+
+
+def remove_file(path, root):
+    """Removes a file, and its parent folders up to the root if they are left empty
+
+    :param str path: The path of the file.
+    :param str root: The folder whose subfolders may be removed.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    folder = os.path.dirname(path)
+    while os.path.abspath(folder) != os.path.abspath(root) and os.path.isdir(folder) and not os.listdir(folder):
+        os.rmdir(folder)
+        folder = os.path.dirname(folder)
+
+
+def sync(output_dir, docs_dir):
+    """Copies the changed files of the output folder into the documentation folder, removing stale ones
+
+    :param str output_dir: The folder with the generated files.
+    :param str docs_dir: The mkdocs documentation folder.
+    :return: The number of changed files and the number of removed files.
+    :rtype: tuple[int, int]
+    """
+    state_path = os.path.join(docs_dir, state_file)
+    try:
+        with open(state_path) as f:
+            previous = set(json.load(f))
+    except (OSError, ValueError):
+        previous = set()
+    current = []
+    changed = 0
+    for folder, _, files in os.walk(output_dir):
+        for filename in files:
+            source = os.path.join(folder, filename)
+            relative_path = os.path.relpath(source, output_dir).replace(os.sep, "/")
+            current.append(relative_path)
+            if sync_file(source, os.path.join(docs_dir, relative_path)):
+                changed += 1
+    stale = previous.difference(current)
+    for relative_path in stale:
+        remove_file(os.path.join(docs_dir, relative_path), docs_dir)
+    os.makedirs(docs_dir, exist_ok=True)
+    with open(state_path, "w") as f:
+        json.dump(sorted(current), f, indent=0)
+    return changed, len(stale)
+
+
+def merge_nav(config_path, index_path, mkdocs_path):
+    """Writes the mkdocs configuration, adding the generated index to its navigation
+
+    The configuration is only written if it changed.
 
-# Append generated index to mkdocs file
-with open("_mkdocs.yml", "r") as f:
-    config = yaml.load(f)  # Original mkdocs config
+    :param str config_path: The path of the original mkdocs configuration.
+    :param str index_path: The path of the generated YAML index.
+    :param str mkdocs_path: The path of the mkdocs configuration to write.
+    :return: Whether the configuration changed.
+    :rtype: bool
+    """
+    with open(config_path) as f:
+        config = yaml.load(f, Loader=Loader)
+    with open(index_path) as f:
+        new_pages = yaml.load(f, Loader=Loader)
+    # Older versions of mkdocs call it 'pages'
+    key = "pages" if "pages" in config else "nav"
+    config[key] = (config.get(key) or []) + new_pages
+    content = yaml.dump(config, Dumper=Dumper, default_flow_style=False)
+    try:
+        with open(mkdocs_path) as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    with open(mkdocs_path, "w") as f:
+        f.write(content)
+    return True
 
-with open("docs/index.yml", 'r') as f:
-    new_pages = yaml.load(f)
 
-config["pages"].extend(new_pages)
+@click.command()
+@click.option('--output', 'output_dir', type=click.Path(exists=True, file_okay=False), default="output",
+              help="Folder with the generated files")
+@click.option('--docs', 'docs_dir', type=click.Path(file_okay=False), default="docs",
+              help="The mkdocs documentation folder")
+@click.option('--config', 'config_path', type=click.Path(exists=True, dir_okay=False), default="_mkdocs.yml",
+              help="The original mkdocs configuration")
+@click.option('--mkdocs', 'mkdocs_path', type=click.Path(dir_okay=False), default="mkdocs.yml",
+              help="Where the mkdocs configuration with the generated pages is written")
+def main(output_dir, docs_dir, config_path, mkdocs_path):
+    changed, removed = sync(output_dir, docs_dir)
+    click.echo("Updated {} files, removed {} files".format(changed, removed))
+    if merge_nav(config_path, os.path.join(docs_dir, "index.yml"), mkdocs_path):
+        click.echo("Updated {}".format(mkdocs_path))
 
-with open("mkdocs.yml", "w") as f:
-    yaml.dump(config, f, default_flow_style=False)
 
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1276 @@
+"""Pure Python reader for the metadata of .NET assemblies (ECMA-335, partition II)
+
+The metadata tables are read straight from the assembly's PE file, so no .NET runtime is needed.
+The file is read into memory at once and closed, so it's never locked. Rows are unpacked only when they're needed,
+and blobs are read through memory views of the file's content instead of being copied.
+
+Referenced assemblies are only read when the full name of a closed generic type needs the assemblies of its arguments,
+from the folder of the assembly, following type forwarders like the runtime does.
+
+The objects returned mimic the subset of System.Reflection used by markdowndotnet (same property and method names),
+so they can be used in place of pythonnet's reflection objects.
+"""
+import enum
+import hashlib
+import os
+import struct
+
+
+class MetadataError(Exception):
+    """Raised when a file is not a valid .NET assembly, or its metadata can't be read."""
+    pass
+
+
+class AmbiguousMatchError(MetadataError):
+    """Raised when more than one member matches a lookup, like System.Reflection.AmbiguousMatchException."""
+    pass
+
+
+class BindingFlags(enum.IntFlag):
+    """Flags controlling which members are returned, with the same values as System.Reflection.BindingFlags."""
+    Default = 0
+    IgnoreCase = 1
+    DeclaredOnly = 2
+    Instance = 4
+    Static = 8
+    Public = 16
+    NonPublic = 32
+
+
+class MethodAttributes(enum.IntFlag):
+    """Attributes of methods, with the same values as System.Reflection.MethodAttributes.
+
+    Fields, properties and events use the same values for their access and for being static.
+    """
+    Private = 1
+    Public = 6
+    Static = 0x10
+    Final = 0x20
+    Virtual = 0x40
+    Abstract = 0x400
+    SpecialName = 0x800
+
+
+_DEFAULT_FLAGS = BindingFlags.Public | BindingFlags.Instance | BindingFlags.Static
+
+# Column kinds, besides fixed size constants (1, 2 and 4 bytes)
+_STRING = "string"
+_GUID = "guid"
+_BLOB = "blob"
+
+# Coded indexes: number of tag bits and tables referenced by each tag
+_CODED_INDEXES = {
+    "TypeDefOrRef": (2, ["TypeDef", "TypeRef", "TypeSpec"]),
+    "HasConstant": (2, ["Field", "Param", "Property"]),
+    "HasCustomAttribute": (5, ["MethodDef", "Field", "TypeRef", "TypeDef", "Param", "InterfaceImpl", "MemberRef",
+                               "Module", "DeclSecurity", "Property", "Event", "StandAloneSig", "ModuleRef",
+                               "TypeSpec", "Assembly", "AssemblyRef", "File", "ExportedType", "ManifestResource",
+                               "GenericParam", "GenericParamConstraint", "MethodSpec"]),
+    "HasFieldMarshal": (1, ["Field", "Param"]),
+    "HasDeclSecurity": (2, ["TypeDef", "MethodDef", "Assembly"]),
+    "MemberRefParent": (3, ["TypeDef", "TypeRef", "ModuleRef", "MethodDef", "TypeSpec"]),
+    "HasSemantics": (1, ["Event", "Property"]),
+    "MethodDefOrRef": (1, ["MethodDef", "MemberRef"]),
+    "MemberForwarded": (1, ["Field", "MethodDef"]),
+    "Implementation": (2, ["File", "AssemblyRef", "ExportedType"]),
+    "CustomAttributeType": (3, [None, None, "MethodDef", "MemberRef", None]),
+    "ResolutionScope": (2, ["Module", "ModuleRef", "AssemblyRef", "TypeRef"]),
+    "TypeOrMethodDef": (1, ["TypeDef", "MethodDef"]),
+}
+
+# Metadata tables, in order of their number, with their columns.
+# Columns are either a fixed size in bytes, a heap, a table name (simple index) or a coded index name.
+_TABLES = [
+    ("Module", [2, _STRING, _GUID, _GUID, _GUID]),
+    ("TypeRef", ["ResolutionScope", _STRING, _STRING]),
+    ("TypeDef", [4, _STRING, _STRING, "TypeDefOrRef", "Field", "MethodDef"]),
+    ("FieldPtr", ["Field"]),
+    ("Field", [2, _STRING, _BLOB]),
+    ("MethodPtr", ["MethodDef"]),
+    ("MethodDef", [4, 2, 2, _STRING, _BLOB, "Param"]),
+    ("ParamPtr", ["Param"]),
+    ("Param", [2, 2, _STRING]),
+    ("InterfaceImpl", ["TypeDef", "TypeDefOrRef"]),
+    ("MemberRef", ["MemberRefParent", _STRING, _BLOB]),
+    ("Constant", [2, "HasConstant", _BLOB]),
+    ("CustomAttribute", ["HasCustomAttribute", "CustomAttributeType", _BLOB]),
+    ("FieldMarshal", ["HasFieldMarshal", _BLOB]),
+    ("DeclSecurity", [2, "HasDeclSecurity", _BLOB]),
+    ("ClassLayout", [2, 4, "TypeDef"]),
+    ("FieldLayout", [4, "Field"]),
+    ("StandAloneSig", [_BLOB]),
+    ("EventMap", ["TypeDef", "Event"]),
+    ("EventPtr", ["Event"]),
+    ("Event", [2, _STRING, "TypeDefOrRef"]),
+    ("PropertyMap", ["TypeDef", "Property"]),
+    ("PropertyPtr", ["Property"]),
+    ("Property", [2, _STRING, _BLOB]),
+    ("MethodSemantics", [2, "MethodDef", "HasSemantics"]),
+    ("MethodImpl", ["TypeDef", "MethodDefOrRef", "MethodDefOrRef"]),
+    ("ModuleRef", [_STRING]),
+    ("TypeSpec", [_BLOB]),
+    ("ImplMap", [2, "MemberForwarded", _STRING, "ModuleRef"]),
+    ("FieldRVA", [4, "Field"]),
+    ("EncLog", [4, 4]),
+    ("EncMap", [4]),
+    ("Assembly", [4, 2, 2, 2, 2, 4, _BLOB, _STRING, _STRING]),
+    ("AssemblyProcessor", [4]),
+    ("AssemblyOS", [4, 4, 4]),
+    ("AssemblyRef", [2, 2, 2, 2, 4, _BLOB, _STRING, _STRING, _BLOB]),
+    ("AssemblyRefProcessor", [4, "AssemblyRef"]),
+    ("AssemblyRefOS", [4, 4, 4, "AssemblyRef"]),
+    ("File", [4, _STRING, _BLOB]),
+    ("ExportedType", [4, 4, _STRING, _STRING, "Implementation"]),
+    ("ManifestResource", [4, 4, _STRING, "Implementation"]),
+    ("NestedClass", ["TypeDef", "TypeDef"]),
+    ("GenericParam", [2, 2, "TypeOrMethodDef", _STRING]),
+    ("MethodSpec", ["MethodDefOrRef", _BLOB]),
+    ("GenericParamConstraint", ["GenericParam", "TypeDefOrRef"]),
+]
+_TABLE_NUMBERS = {name: number for number, (name, _) in enumerate(_TABLES)}
+
+# Element types used in signatures
+_ELEMENT_TYPES = {
+    0x01: "Void", 0x02: "Boolean", 0x03: "Char", 0x04: "SByte", 0x05: "Byte", 0x06: "Int16", 0x07: "UInt16",
+    0x08: "Int32", 0x09: "UInt32", 0x0a: "Int64", 0x0b: "UInt64", 0x0c: "Single", 0x0d: "Double", 0x0e: "String",
+    0x16: "TypedReference", 0x18: "IntPtr", 0x19: "UIntPtr", 0x1c: "Object",
+}
+_PTR, _BYREF, _VALUETYPE, _CLASS, _VAR, _ARRAY, _GENERICINST, _FNPTR, _SZARRAY, _MVAR, _CMOD_REQD, _CMOD_OPT, \
+    _SENTINEL, _PINNED = 0x0f, 0x10, 0x11, 0x12, 0x13, 0x14, 0x15, 0x1b, 0x1d, 0x1e, 0x1f, 0x20, 0x41, 0x45
+
+# Member flags
+_ACCESS_MASK = 0x7
+_PRIVATE = 1
+_PUBLIC = 6
+_STATIC = 0x10
+_FINAL = 0x20
+_VIRTUAL = 0x40
+_ABSTRACT = 0x400
+_SPECIAL_NAME = 0x800
+_LITERAL = 0x40
+_VISIBILITY_MASK = 0x7
+_INTERFACE = 0x20
+
+# Method semantics
+_SETTER = 0x1
+_GETTER = 0x2
+_ADD_ON = 0x8
+
+
+def _read_compressed(data, offset):
+    """Reads a compressed unsigned integer from a signature.
+
+    :return: The value and the offset after it.
+    :rtype: tuple[int, int]
+    """
+    first = data[offset]
+    if first & 0x80 == 0:
+        return first, offset + 1
+    if first & 0xc0 == 0x80:
+        return ((first & 0x3f) << 8) | data[offset + 1], offset + 2
+    return ((first & 0x1f) << 24) | (data[offset + 1] << 16) | (data[offset + 2] << 8) | data[offset + 3], offset + 4
+
+
+def _display_name(name, version, culture, public_key, is_full_key):
+    """Gets the display name of an assembly, as in System.Reflection.AssemblyName.FullName.
+
+    :param bool is_full_key: Whether ``public_key`` is the full public key, or only its token.
+    """
+    if not len(public_key):
+        token = "null"
+    elif is_full_key:
+        # The token is the last 8 bytes of the key's SHA-1 hash, reversed
+        token = hashlib.sha1(public_key).digest()[-8:][::-1].hex()
+    else:
+        token = bytes(public_key).hex()
+    return "{0}, Version={1}.{2}.{3}.{4}, Culture={5}, PublicKeyToken={6}".format(name, *version, culture or "neutral",
+                                                                                    token)
+
+
+class Type:
+    """Base class of all types, mimicking System.Type."""
+    Name = None
+    Namespace = None
+    Assembly = None
+    BaseType = None
+    DeclaringType = None
+    Attributes = 0
+    HasElementType = False
+    IsArray = False
+    IsByRef = False
+    IsPointer = False
+    IsGenericParameter = False
+    IsGenericType = False
+    ContainsGenericParameters = False
+    IsEnum = False
+    IsNested = False
+    IsInterface = False
+    MemberType = "TypeInfo"
+
+    @property
+    def FullName(self):
+        if self.Name is None:
+            return None
+        if self.DeclaringType is not None:
+            declaring_name = self.DeclaringType.FullName
+            return None if declaring_name is None else "{0}+{1}".format(declaring_name, self.Name)
+        if self.Namespace:
+            return "{0}.{1}".format(self.Namespace, self.Name)
+        return self.Name
+
+    @property
+    def AssemblyQualifiedName(self):
+        full_name = self.FullName
+        if full_name is None:
+            return None
+        assembly_name = self._assembly_name()
+        return full_name if assembly_name is None else "{0}, {1}".format(full_name, assembly_name)
+
+    def _assembly_name(self):
+        """Gets the full name of the assembly defining the type, if known."""
+        return getattr(self.Assembly, "FullName", None)
+
+    def GetElementType(self):
+        return None
+
+    def GetConstructors(self, flags=BindingFlags.Public | BindingFlags.Instance):
+        return []
+
+    def GetMethod(self, name, types=None):
+        return None
+
+    def GetMethods(self, flags=_DEFAULT_FLAGS):
+        return []
+
+    def GetFields(self, flags=_DEFAULT_FLAGS):
+        return []
+
+    def GetProperties(self, flags=_DEFAULT_FLAGS):
+        return []
+
+    def GetEvents(self, flags=_DEFAULT_FLAGS):
+        return []
+
+    def GetNestedTypes(self, flags=BindingFlags.Public):
+        return []
+
+    def GetMembers(self, flags=_DEFAULT_FLAGS):
+        return []
+
+    def GetGenericArguments(self):
+        return []
+
+    def _key(self):
+        return self.FullName or self.Name
+
+    def __eq__(self, other):
+        # A type referenced by an assembly is the same as its definition in another one
+        return isinstance(other, Type) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __str__(self):
+        return self.FullName or self.Name
+
+    def __repr__(self):
+        return "<{0} {1}>".format(self.__class__.__name__, self)
+
+
+class TypeReference(Type):
+    """A type defined in another assembly.
+
+    Since the other assembly is not read, only the type's name is known.
+    """
+    def __init__(self, assembly, namespace, name, declaring_type=None, scope=None, scope_row=0):
+        self.Assembly = assembly
+        self.Namespace = namespace
+        self.Name = name
+        self.DeclaringType = declaring_type
+        self.IsNested = declaring_type is not None
+        self.Scope = scope
+        self._scope_row = scope_row
+
+    def _assembly_name(self):
+        if self.DeclaringType is not None:
+            return self.DeclaringType._assembly_name()
+        if self.Scope != "AssemblyRef" or not self._scope_row:
+            return None
+        return self.Assembly._defining_assembly_name(self._scope_row, self.FullName)
+
+
+class TypeDefinition(Type):
+    """A type defined in the assembly, with all of its members."""
+    def __init__(self, assembly, row_number):
+        self.Assembly = assembly
+        self._row_number = row_number
+        row = assembly._row("TypeDef", row_number)
+        self.Attributes = row[0]
+        self.Name = assembly._string(row[1])
+        self._namespace = assembly._string(row[2]) or None
+        self._extends = row[3]
+        self._members = None
+        self._generic_parameters = None
+        self.IsInterface = self.Attributes & _INTERFACE != 0
+        self.IsNested = self.Attributes & _VISIBILITY_MASK >= 2
+
+    @property
+    def Namespace(self):
+        if self.DeclaringType is not None:
+            return self.DeclaringType.Namespace
+        return self._namespace
+
+    @property
+    def DeclaringType(self):
+        if not self.IsNested:
+            return None
+        return self.Assembly._enclosing_type(self._row_number)
+
+    @property
+    def BaseType(self):
+        if self.IsInterface or not self._extends:
+            return None
+        return self.Assembly._type_def_or_ref(self._extends, self)
+
+    @property
+    def IsEnum(self):
+        base_type = self.BaseType
+        return base_type is not None and base_type.FullName == "System.Enum"
+
+    @property
+    def IsPublic(self):
+        return self.Attributes & _VISIBILITY_MASK == 1
+
+    @property
+    def IsNestedPublic(self):
+        return self.Attributes & _VISIBILITY_MASK == 2
+
+    @property
+    def IsGenericType(self):
+        return bool(self.GetGenericArguments())
+
+    @property
+    def ContainsGenericParameters(self):
+        return self.IsGenericType
+
+    def GetGenericTypeDefinition(self):
+        return self
+
+    def GetGenericArguments(self):
+        if self._generic_parameters is None:
+            self._generic_parameters = self.Assembly._generic_parameters("TypeDef", self._row_number, self)
+        return list(self._generic_parameters)
+
+    def _load_members(self):
+        if self._members is None:
+            self._members = self.Assembly._load_members(self)
+        return self._members
+
+    def _inherited(self, kind, flags):
+        """Gets members of a kind, including inherited ones from base types defined in the same assembly."""
+        flags = int(flags)
+        members = [x for x in self._load_members()[kind] if _matches(x, flags)]
+        if flags & BindingFlags.DeclaredOnly or kind == "constructors":
+            return members
+        seen = {(x.Name, str(x)) for x in members}
+        base_type = self.BaseType
+        while isinstance(base_type, TypeDefinition):
+            for member in base_type._load_members()[kind]:
+                if member.IsPrivate or member.IsStatic or not _matches(member, flags):
+                    continue
+                key = (member.Name, str(member))
+                if key not in seen:
+                    seen.add(key)
+                    members.append(member)
+            base_type = base_type.BaseType
+        return members
+
+    @staticmethod
+    def _single(members):
+        if len(members) > 1:
+            raise AmbiguousMatchError("Ambiguous match found for '{0}'".format(members[0].Name))
+        return members[0] if members else None
+
+    def GetConstructors(self, flags=BindingFlags.Public | BindingFlags.Instance):
+        return self._inherited("constructors", flags)
+
+    def GetMethod(self, name, types=None):
+        methods = [x for x in self.GetMethods() if x.Name == name]
+        if types is None:
+            return self._single(methods)
+        for method in methods:
+            if _parameters_match(method, types):
+                return method
+        return None
+
+    def GetMethods(self, flags=_DEFAULT_FLAGS):
+        return self._inherited("methods", flags)
+
+    def GetFields(self, flags=_DEFAULT_FLAGS):
+        return self._inherited("fields", flags)
+
+    def GetProperties(self, flags=_DEFAULT_FLAGS):
+        return self._inherited("properties", flags)
+
+    def GetEvents(self, flags=_DEFAULT_FLAGS):
+        return self._inherited("events", flags)
+
+    def GetNestedTypes(self, flags=BindingFlags.Public):
+        flags = int(flags)
+        nested = self.Assembly._nested_types(self._row_number)
+        return [x for x in nested if flags & (BindingFlags.Public if x.IsNestedPublic else BindingFlags.NonPublic)]
+
+    def GetMembers(self, flags=_DEFAULT_FLAGS):
+        return self.GetConstructors(flags) + self.GetMethods(flags) + self.GetFields(flags) + \
+            self.GetProperties(flags) + self.GetEvents(flags) + self.GetNestedTypes(flags)
+
+
+class ArrayType(Type):
+    """An array of another type."""
+    HasElementType = True
+    IsArray = True
+
+    def __init__(self, element_type, rank=1):
+        self._element_type = element_type
+        self.Rank = rank
+        self.Assembly = element_type.Assembly
+        self.Namespace = element_type.Namespace
+
+    @property
+    def _suffix(self):
+        return "[{0}]".format("," * (self.Rank - 1))
+
+    @property
+    def Name(self):
+        return self._element_type.Name + self._suffix
+
+    @property
+    def FullName(self):
+        full_name = self._element_type.FullName
+        return None if full_name is None else full_name + self._suffix
+
+    @property
+    def ContainsGenericParameters(self):
+        return self._element_type.ContainsGenericParameters
+
+    def _assembly_name(self):
+        return self._element_type._assembly_name()
+
+    def GetElementType(self):
+        return self._element_type
+
+    def GetArrayRank(self):
+        return self.Rank
+
+
+class ByRefType(ArrayType):
+    """A type passed by reference, e.g. 'ref' or 'out' parameters."""
+    IsArray = False
+    IsByRef = True
+    _suffix = "&"
+
+
+class PointerType(ArrayType):
+    """An unmanaged pointer to another type."""
+    IsArray = False
+    IsPointer = True
+    _suffix = "*"
+
+
+class GenericInstanceType(Type):
+    """A generic type with its type arguments, e.g. List<string>."""
+    IsGenericType = True
+
+    def __init__(self, definition, arguments):
+        self._definition = definition
+        self._arguments = arguments
+        self.Assembly = definition.Assembly
+        self.Namespace = definition.Namespace
+        self.Name = definition.Name
+        self.DeclaringType = definition.DeclaringType
+        self.IsNested = definition.IsNested
+
+    @property
+    def FullName(self):
+        # Like in reflection, only types with all of their arguments closed have a full name,
+        # where arguments are written along with the assembly defining them
+        if self.ContainsGenericParameters:
+            return None
+        arguments = [x.AssemblyQualifiedName for x in self._arguments]
+        return "{0}[{1}]".format(self._definition.FullName, ",".join("[{0}]".format(x) for x in arguments))
+
+    @property
+    def ContainsGenericParameters(self):
+        return any(x.ContainsGenericParameters for x in self._arguments)
+
+    def _assembly_name(self):
+        return self._definition._assembly_name()
+
+    def __str__(self):
+        return "{0}[{1}]".format(self._definition.FullName, ",".join(str(x) for x in self._arguments))
+
+    def _key(self):
+        return str(self)
+
+    def GetGenericTypeDefinition(self):
+        return self._definition
+
+    def GetGenericArguments(self):
+        return list(self._arguments)
+
+
+class GenericParameter(Type):
+    """A generic type parameter, e.g. the 'T' in List<T>."""
+    IsGenericParameter = True
+    ContainsGenericParameters = True
+
+    def __init__(self, owner, name, position):
+        self._owner = owner
+        self.Name = name
+        self.GenericParameterPosition = position
+        self.Assembly = getattr(owner, "Assembly", None)
+
+    @property
+    def FullName(self):
+        return None
+
+    @property
+    def DeclaringMethod(self):
+        return self._owner if isinstance(self._owner, MethodInfo) else None
+
+    def _key(self):
+        return "{0}!{1}".format(id(self._owner), self.Name)
+
+
+class MemberInfo:
+    """Base class of type members, mimicking System.Reflection.MemberInfo."""
+    MemberType = None
+
+    def __init__(self, declaring_type, name, attributes):
+        self.DeclaringType = declaring_type
+        self.Name = name
+        self.Attributes = attributes
+
+    @property
+    def IsPublic(self):
+        return self.Attributes & _ACCESS_MASK == _PUBLIC
+
+    @property
+    def IsPrivate(self):
+        return self.Attributes & _ACCESS_MASK == _PRIVATE
+
+    @property
+    def IsStatic(self):
+        return self.Attributes & _STATIC != 0
+
+    def __repr__(self):
+        return "<{0} {1}>".format(self.__class__.__name__, self)
+
+
+class ParameterInfo:
+    """A method's parameter, mimicking System.Reflection.ParameterInfo."""
+    def __init__(self, name, parameter_type, position):
+        self.Name = name
+        self.ParameterType = parameter_type
+        self.Position = position
+
+    def __str__(self):
+        return "{0} {1}".format(self.ParameterType, self.Name)
+
+
+class MethodInfo(MemberInfo):
+    """A method or constructor, mimicking System.Reflection.MethodInfo and ConstructorInfo."""
+    def __init__(self, declaring_type, name, attributes, return_type, parameters, generic_parameters=()):
+        super().__init__(declaring_type, name, attributes)
+        self.ReturnType = return_type
+        self._parameters = parameters
+        self._generic_parameters = generic_parameters
+        self.IsConstructor = name in (".ctor", ".cctor")
+        self.MemberType = "Constructor" if self.IsConstructor else "Method"
+
+    @property
+    def IsAbstract(self):
+        return self.Attributes & _ABSTRACT != 0
+
+    @property
+    def IsVirtual(self):
+        return self.Attributes & _VIRTUAL != 0
+
+    @property
+    def IsFinal(self):
+        return self.Attributes & _FINAL != 0
+
+    @property
+    def IsSpecialName(self):
+        return self.Attributes & _SPECIAL_NAME != 0
+
+    @property
+    def IsGenericMethod(self):
+        return bool(self._generic_parameters)
+
+    def GetParameters(self):
+        return list(self._parameters)
+
+    def GetGenericArguments(self):
+        return list(self._generic_parameters)
+
+    def __str__(self):
+        parameters = ", ".join(str(x.ParameterType) for x in self._parameters)
+        if self.IsConstructor:
+            return "Void {0}({1})".format(self.Name, parameters)
+        return "{0} {1}({2})".format(self.ReturnType.Name, self.Name, parameters)
+
+
+class FieldInfo(MemberInfo):
+    """A field, mimicking System.Reflection.FieldInfo."""
+    MemberType = "Field"
+
+    def __init__(self, declaring_type, name, attributes, field_type):
+        super().__init__(declaring_type, name, attributes)
+        self.FieldType = field_type
+
+    @property
+    def IsLiteral(self):
+        return self.Attributes & _LITERAL != 0
+
+    def __str__(self):
+        return "{0} {1}".format(self.FieldType.Name, self.Name)
+
+
+class PropertyInfo(MemberInfo):
+    """A property, mimicking System.Reflection.PropertyInfo.
+
+    Its visibility is the one of its most visible accessor.
+    """
+    MemberType = "Property"
+
+    def __init__(self, declaring_type, name, attributes, property_type, parameters, getter, setter):
+        super().__init__(declaring_type, name, attributes)
+        self.PropertyType = property_type
+        self._parameters = parameters
+        self._getter = getter
+        self._setter = setter
+
+    def _accessors(self):
+        return [x for x in (self._getter, self._setter) if x is not None]
+
+    @property
+    def IsPublic(self):
+        return any(x.IsPublic for x in self._accessors())
+
+    @property
+    def IsPrivate(self):
+        return all(x.IsPrivate for x in self._accessors())
+
+    @property
+    def IsStatic(self):
+        return any(x.IsStatic for x in self._accessors())
+
+    def GetGetMethod(self, nonPublic=False):
+        if self._getter is None or not (nonPublic or self._getter.IsPublic):
+            return None
+        return self._getter
+
+    def GetSetMethod(self, nonPublic=False):
+        if self._setter is None or not (nonPublic or self._setter.IsPublic):
+            return None
+        return self._setter
+
+    def GetIndexParameters(self):
+        return list(self._parameters)
+
+    def __str__(self):
+        if self._parameters:
+            return "{0} {1} [{2}]".format(self.PropertyType.Name, self.Name,
+                                          ", ".join(str(x.ParameterType) for x in self._parameters))
+        return "{0} {1}".format(self.PropertyType.Name, self.Name)
+
+
+class EventInfo(MemberInfo):
+    """An event, mimicking System.Reflection.EventInfo.
+
+    Its visibility is the one of its 'add' accessor.
+    """
+    MemberType = "Event"
+
+    def __init__(self, declaring_type, name, attributes, handler_type, add_method):
+        super().__init__(declaring_type, name, attributes)
+        self.EventHandlerType = handler_type
+        self._add_method = add_method
+
+    @property
+    def IsPublic(self):
+        return self._add_method is not None and self._add_method.IsPublic
+
+    @property
+    def IsPrivate(self):
+        return self._add_method is None or self._add_method.IsPrivate
+
+    @property
+    def IsStatic(self):
+        return self._add_method is not None and self._add_method.IsStatic
+
+    def GetAddMethod(self, nonPublic=False):
+        if self._add_method is None or not (nonPublic or self._add_method.IsPublic):
+            return None
+        return self._add_method
+
+    def __str__(self):
+        return "{0} {1}".format(self.EventHandlerType, self.Name)
+
+
+def _matches(member, flags):
+    """Checks if a member matches the visibility and static binding flags."""
+    if member.IsPublic:
+        if not flags & BindingFlags.Public:
+            return False
+    elif not flags & BindingFlags.NonPublic:
+        return False
+    if member.IsStatic:
+        return bool(flags & BindingFlags.Static)
+    return bool(flags & BindingFlags.Instance)
+
+
+def _parameters_match(method, types):
+    """Checks if a method's parameter types are exactly the given types."""
+    parameters = method.GetParameters()
+    if len(parameters) != len(types):
+        return False
+    return all(t is not None and x.ParameterType == t for x, t in zip(parameters, types))
+
+
+class Assembly:
+    """A .NET assembly read from its file, mimicking System.Reflection.Assembly.
+
+    :param str path: The path to the assembly's dll file.
+    :raises MetadataError: if the file is not a .NET assembly.
+    """
+    def __init__(self, path):
+        self.Location = path
+        # The file is read at once, so it isn't kept open or locked, and can be rewritten while the assembly is in use
+        with open(path, "rb") as f:
+            self._data = f.read()
+        try:
+            self._read_metadata()
+        except (struct.error, IndexError, ValueError) as e:
+            raise MetadataError("{0} is not a valid .NET assembly: {1}".format(path, e))
+        self._strings = {}
+        self._type_definitions = {}
+        self._type_references = {}
+        self._type_specs = {}
+        self._enclosing = None
+        self._nested = None
+        self._generic_parameter_names = None
+        self._semantics = None
+        self._maps = {}
+        self._types_by_name = None
+        self._full_name = None
+        self._core_reference = None
+        self._exported_types = None
+        self._references = {}
+
+    def _read_metadata(self):
+        data = self._data
+        if data[:2] != b"MZ":
+            raise MetadataError("{0} is not a PE file".format(self.Location))
+        pe_offset = struct.unpack_from("<I", data, 0x3c)[0]
+        if data[pe_offset:pe_offset + 4] != b"PE\0\0":
+            raise MetadataError("{0} is not a PE file".format(self.Location))
+        section_count, optional_size = struct.unpack_from("<2xH12xH", data, pe_offset + 4)
+        optional_offset = pe_offset + 24
+        magic = struct.unpack_from("<H", data, optional_offset)[0]
+        directories_offset = optional_offset + (96 if magic == 0x10b else 112)
+        # The CLI header is the 15th data directory
+        cli_rva = struct.unpack_from("<I", data, directories_offset + 14 * 8)[0]
+        if not cli_rva:
+            raise MetadataError("{0} is not a .NET assembly".format(self.Location))
+        self._sections = []
+        section_offset = optional_offset + optional_size
+        for i in range(section_count):
+            virtual_size, virtual_address, raw_size, raw_offset = struct.unpack_from("<8xIIII", data,
+                                                                                     section_offset + i * 40)
+            self._sections.append((virtual_address, max(virtual_size, raw_size), raw_offset))
+        cli_offset = self._offset(cli_rva)
+        metadata_rva = struct.unpack_from("<I", data, cli_offset + 8)[0]
+        root = self._offset(metadata_rva)
+        if struct.unpack_from("<I", data, root)[0] != 0x424a5342:
+            raise MetadataError("Invalid metadata signature in {0}".format(self.Location))
+        version_length = struct.unpack_from("<I", data, root + 12)[0]
+        offset = root + 16 + version_length
+        stream_count = struct.unpack_from("<2xH", data, offset)[0]
+        offset += 4
+        streams = {}
+        for _ in range(stream_count):
+            stream_offset, stream_size = struct.unpack_from("<II", data, offset)
+            end = data.find(b"\0", offset + 8)
+            name = data[offset + 8:end].decode("ascii")
+            streams[name] = (root + stream_offset, stream_size)
+            offset = (end + 4) & ~3
+        tables = streams.get("#~") or streams.get("#-")
+        if tables is None:
+            raise MetadataError("No metadata tables in {0}".format(self.Location))
+        self._strings_heap = streams.get("#Strings", (0, 0))[0]
+        self._blob_heap = streams.get("#Blob", (0, 0))[0]
+        self._read_tables(tables[0])
+
+    def _offset(self, rva):
+        for virtual_address, size, raw_offset in self._sections:
+            if virtual_address <= rva < virtual_address + size:
+                return rva - virtual_address + raw_offset
+        raise MetadataError("Invalid RVA {0:#x} in {1}".format(rva, self.Location))
+
+    def _read_tables(self, offset):
+        data = self._data
+        heap_sizes, valid = struct.unpack_from("<6xB1xQ", data, offset)
+        offset += 24
+        self._rows = [0] * len(_TABLES)
+        for number in range(64):
+            if valid & (1 << number):
+                if number >= len(_TABLES):
+                    raise MetadataError("Unknown metadata table {0:#x} in {1}".format(number, self.Location))
+                self._rows[number] = struct.unpack_from("<I", data, offset)[0]
+                offset += 4
+        if heap_sizes & 0x40:
+            # Extra data present in some edit and continue assemblies
+            offset += 4
+        string_size = 4 if heap_sizes & 0x01 else 2
+        guid_size = 4 if heap_sizes & 0x02 else 2
+        blob_size = 4 if heap_sizes & 0x04 else 2
+
+        def index_size(table):
+            return 2 if self._rows[_TABLE_NUMBERS[table]] < 0x10000 else 4
+
+        def coded_size(name):
+            bits, tables = _CODED_INDEXES[name]
+            largest = max(self._rows[_TABLE_NUMBERS[x]] for x in tables if x is not None)
+            return 2 if largest < (1 << (16 - bits)) else 4
+
+        formats = {1: "B", 2: "H", 4: "I"}
+        self._structs = []
+        self._table_offsets = []
+        for number, (name, columns) in enumerate(_TABLES):
+            row_format = "<"
+            for column in columns:
+                if isinstance(column, int):
+                    size = column
+                elif column == _STRING:
+                    size = string_size
+                elif column == _GUID:
+                    size = guid_size
+                elif column == _BLOB:
+                    size = blob_size
+                elif column in _CODED_INDEXES:
+                    size = coded_size(column)
+                else:
+                    size = index_size(column)
+                row_format += formats[size]
+            row_struct = struct.Struct(row_format)
+            self._structs.append(row_struct)
+            self._table_offsets.append(offset)
+            offset += row_struct.size * self._rows[number]
+
+    def _count(self, table):
+        return self._rows[_TABLE_NUMBERS[table]]
+
+    def _row(self, table, row_number):
+        """Unpacks a row of a table, row numbers start at 1."""
+        number = _TABLE_NUMBERS[table]
+        row_struct = self._structs[number]
+        return row_struct.unpack_from(self._data, self._table_offsets[number] + (row_number - 1) * row_struct.size)
+
+    def _iter_rows(self, table):
+        number = _TABLE_NUMBERS[table]
+        row_struct = self._structs[number]
+        offset = self._table_offsets[number]
+        for i in range(self._rows[number]):
+            yield i + 1, row_struct.unpack_from(self._data, offset + i * row_struct.size)
+
+    def _list(self, table, column, row_number, target, pointer_table):
+        """Gets the row numbers of a list owned by a row, e.g. the fields of a type."""
+        start = self._row(table, row_number)[column]
+        if row_number < self._count(table):
+            end = self._row(table, row_number + 1)[column]
+        else:
+            end = self._count(target) + 1
+        rows = range(start, end)
+        if self._count(pointer_table):
+            return [self._row(pointer_table, x)[0] for x in rows]
+        return rows
+
+    @staticmethod
+    def _decode(name, value):
+        """Decodes a coded index into its table name and row number."""
+        bits, tables = _CODED_INDEXES[name]
+        return tables[value & ((1 << bits) - 1)], value >> bits
+
+    def _string(self, index):
+        value = self._strings.get(index)
+        if value is None:
+            start = self._strings_heap + index
+            value = self._data[start:self._data.find(b"\0", start)].decode("utf-8")
+            self._strings[index] = value
+        return value
+
+    def _blob(self, index):
+        start = self._blob_heap + index
+        length, start = _read_compressed(self._data, start)
+        return memoryview(self._data)[start:start + length]
+
+    def _type_definition(self, row_number):
+        type_definition = self._type_definitions.get(row_number)
+        if type_definition is None:
+            type_definition = TypeDefinition(self, row_number)
+            self._type_definitions[row_number] = type_definition
+        return type_definition
+
+    def _type_reference(self, row_number):
+        type_reference = self._type_references.get(row_number)
+        if type_reference is None:
+            scope, name, namespace = self._row("TypeRef", row_number)
+            scope_table, scope_row = self._decode("ResolutionScope", scope)
+            declaring_type = None
+            if scope_table == "TypeRef" and scope_row:
+                declaring_type = self._type_reference(scope_row)
+            type_reference = TypeReference(self, self._string(namespace) or None, self._string(name), declaring_type,
+                                           scope_table, scope_row)
+            if scope_table == "Module" or (scope_table == "ModuleRef" and not scope_row):
+                # References to types in the same module
+                type_reference = self._find_definition(type_reference.FullName) or type_reference
+            self._type_references[row_number] = type_reference
+        return type_reference
+
+    def _type_def_or_ref(self, value, context):
+        table, row_number = self._decode("TypeDefOrRef", value)
+        return self._type_from_table(table, row_number, context)
+
+    def _type_from_table(self, table, row_number, context):
+        if not row_number:
+            return None
+        if table == "TypeDef":
+            return self._type_definition(row_number)
+        if table == "TypeRef":
+            return self._type_reference(row_number)
+        signature = self._blob(self._row("TypeSpec", row_number)[0])
+        return self._read_type(signature, 0, context)[0]
+
+    def _find_definition(self, full_name):
+        if self._types_by_name is None:
+            self._types_by_name = {x.FullName: x for x in self.GetTypes(include_module=True)}
+        return self._types_by_name.get(full_name)
+
+    def _primitive(self, name):
+        key = "System." + name
+        primitive = self._type_specs.get(key)
+        if primitive is None:
+            primitive = self._find_definition(key)
+            if primitive is None:
+                # Primitive types are defined along with System.Object
+                core_reference = self._core_library()
+                primitive = TypeReference(self, "System", name, scope="AssemblyRef" if core_reference else None,
+                                          scope_row=core_reference)
+            self._type_specs[key] = primitive
+        return primitive
+
+    def _core_library(self):
+        """Gets the row of the referenced assembly defining System.Object, or 0 if there's none."""
+        if self._core_reference is None:
+            self._core_reference = 0
+            for _, (scope, name, namespace) in self._iter_rows("TypeRef"):
+                if self._string(name) == "Object" and self._string(namespace) == "System":
+                    scope_table, scope_row = self._decode("ResolutionScope", scope)
+                    if scope_table == "AssemblyRef":
+                        self._core_reference = scope_row
+                    break
+        return self._core_reference
+
+    def _referenced_assembly(self, name):
+        """Reads a referenced assembly from the same folder, or gets None if it isn't there."""
+        if name not in self._references:
+            path = os.path.join(os.path.dirname(os.path.abspath(self.Location)), name + ".dll")
+            try:
+                self._references[name] = Assembly(path)
+            except (OSError, MetadataError):
+                self._references[name] = None
+        return self._references[name]
+
+    def _defining_assembly_name(self, reference_row, full_name):
+        """Gets the full name of the assembly defining a type referenced from another assembly.
+
+        The referenced assembly is read from the same folder, where the runtime would find it too,
+        and type forwarders are followed to the assembly actually defining the type.
+        If the referenced assembly isn't there, the name of the reference is used.
+
+        :param int reference_row: The row of the referenced assembly in the AssemblyRef table.
+        :param str full_name: The full name of the type, or of its outermost declaring type if it's nested.
+        :rtype: str
+        """
+        major, minor, build, revision, flags, public_key, name, culture, _ = self._row("AssemblyRef", reference_row)
+        name = self._string(name)
+        assembly = self._referenced_assembly(name)
+        if assembly is not None:
+            if assembly._find_definition(full_name) is not None:
+                return assembly.FullName
+            forwarded = assembly._forwarded_types().get(full_name)
+            if forwarded is not None:
+                return assembly._defining_assembly_name(forwarded, full_name)
+        return _display_name(name, (major, minor, build, revision), self._string(culture), self._blob(public_key),
+                             flags & 0x1)
+
+    def _forwarded_types(self):
+        """Gets the types forwarded to other assemblies, with the row of their assembly in the AssemblyRef table."""
+        if self._exported_types is None:
+            self._exported_types = {}
+            for _, (_, _, name, namespace, implementation) in self._iter_rows("ExportedType"):
+                table, row_number = self._decode("Implementation", implementation)
+                if table == "AssemblyRef":
+                    namespace = self._string(namespace)
+                    name = self._string(name)
+                    self._exported_types["{0}.{1}".format(namespace, name) if namespace else name] = row_number
+        return self._exported_types
+
+    def _enclosing_type(self, row_number):
+        if self._enclosing is None:
+            self._enclosing = {}
+            self._nested = {}
+            for _, (nested, enclosing) in self._iter_rows("NestedClass"):
+                self._enclosing[nested] = enclosing
+                self._nested.setdefault(enclosing, []).append(nested)
+        enclosing = self._enclosing.get(row_number)
+        return None if enclosing is None else self._type_definition(enclosing)
+
+    def _nested_types(self, row_number):
+        self._enclosing_type(row_number)
+        return [self._type_definition(x) for x in self._nested.get(row_number, [])]
+
+    def _generic_parameters(self, table, row_number, owner):
+        if self._generic_parameter_names is None:
+            self._generic_parameter_names = {}
+            for _, (number, _flags, owner_index, name) in self._iter_rows("GenericParam"):
+                self._generic_parameter_names.setdefault(owner_index, []).append((number, name))
+        bits, tables = _CODED_INDEXES["TypeOrMethodDef"]
+        owner_index = (row_number << bits) | tables.index(table)
+        parameters = sorted(self._generic_parameter_names.get(owner_index, []))
+        return [GenericParameter(owner, self._string(name), number) for number, name in parameters]
+
+    def _read_type(self, signature, offset, context):
+        """Reads a type from a signature.
+
+        :param context: The type or method whose generic parameters are referenced by the signature.
+        :return: The type read and the offset after it.
+        """
+        element_type = signature[offset]
+        offset += 1
+        while element_type in (_CMOD_REQD, _CMOD_OPT, _PINNED, _SENTINEL):
+            if element_type in (_CMOD_REQD, _CMOD_OPT):
+                _, offset = _read_compressed(signature, offset)
+            element_type = signature[offset]
+            offset += 1
+        if element_type in _ELEMENT_TYPES:
+            return self._primitive(_ELEMENT_TYPES[element_type]), offset
+        if element_type in (_CLASS, _VALUETYPE):
+            value, offset = _read_compressed(signature, offset)
+            return self._type_def_or_ref(value, context), offset
+        if element_type == _SZARRAY:
+            inner, offset = self._read_type(signature, offset, context)
+            return ArrayType(inner), offset
+        if element_type == _ARRAY:
+            inner, offset = self._read_type(signature, offset, context)
+            rank, offset = _read_compressed(signature, offset)
+            sizes, offset = _read_compressed(signature, offset)
+            for _ in range(sizes):
+                _, offset = _read_compressed(signature, offset)
+            bounds, offset = _read_compressed(signature, offset)
+            for _ in range(bounds):
+                _, offset = _read_compressed(signature, offset)
+            return ArrayType(inner, rank), offset
+        if element_type == _BYREF:
+            inner, offset = self._read_type(signature, offset, context)
+            return ByRefType(inner), offset
+        if element_type == _PTR:
+            inner, offset = self._read_type(signature, offset, context)
+            return PointerType(inner), offset
+        if element_type == _GENERICINST:
+            offset += 1
+            value, offset = _read_compressed(signature, offset)
+            definition = self._type_def_or_ref(value, context)
+            count, offset = _read_compressed(signature, offset)
+            arguments = []
+            for _ in range(count):
+                argument, offset = self._read_type(signature, offset, context)
+                arguments.append(argument)
+            # A generic type instantiated with its own parameters is the generic type itself, like in reflection
+            if isinstance(definition, TypeDefinition) and arguments == definition.GetGenericArguments():
+                return definition, offset
+            return GenericInstanceType(definition, arguments), offset
+        if element_type in (_VAR, _MVAR):
+            number, offset = _read_compressed(signature, offset)
+            return self._generic_argument(element_type == _MVAR, number, context), offset
+        if element_type == _FNPTR:
+            _, _, offset = self._read_method_signature(signature, offset, context)
+            return self._primitive("IntPtr"), offset
+        raise MetadataError("Unknown element type {0:#x} in {1}".format(element_type, self.Location))
+
+    @staticmethod
+    def _generic_argument(method, number, context):
+        if method:
+            arguments = context.GetGenericArguments() if isinstance(context, MethodInfo) else []
+        else:
+            declaring_type = context.DeclaringType if isinstance(context, MethodInfo) else context
+            arguments = declaring_type.GetGenericArguments() if declaring_type is not None else []
+        if number < len(arguments):
+            return arguments[number]
+        return GenericParameter(context, "{0}{1}".format("!!" if method else "!", number), number)
+
+    def _read_method_signature(self, signature, offset, context):
+        """Reads a method signature.
+
+        :return: The return type, the list of parameter types and the offset after the signature.
+        """
+        calling_convention = signature[offset]
+        offset += 1
+        if calling_convention & 0x10:
+            _, offset = _read_compressed(signature, offset)
+        count, offset = _read_compressed(signature, offset)
+        return_type, offset = self._read_type(signature, offset, context)
+        parameter_types = []
+        for _ in range(count):
+            if signature[offset] == _SENTINEL:
+                offset += 1
+            parameter_type, offset = self._read_type(signature, offset, context)
+            parameter_types.append(parameter_type)
+        return return_type, parameter_types, offset
+
+    def _load_members(self, declaring_type):
+        row_number = declaring_type._row_number
+        members = {"constructors": [], "methods": [], "fields": [], "properties": [], "events": []}
+        methods = {}
+        for method_row in self._list("TypeDef", 5, row_number, "MethodDef", "MethodPtr"):
+            method = self._read_method(declaring_type, method_row)
+            methods[method_row] = method
+            members["constructors" if method.IsConstructor else "methods"].append(method)
+        for field_row in self._list("TypeDef", 4, row_number, "Field", "FieldPtr"):
+            attributes, name, signature = self._row("Field", field_row)
+            field_type = self._read_type(self._blob(signature), 1, declaring_type)[0]
+            members["fields"].append(FieldInfo(declaring_type, self._string(name), attributes, field_type))
+        semantics = self._method_semantics()
+        property_map = self._map_row("PropertyMap", row_number)
+        if property_map:
+            for property_row in self._list("PropertyMap", 1, property_map, "Property", "PropertyPtr"):
+                attributes, name, signature = self._row("Property", property_row)
+                signature = self._blob(signature)
+                count, offset = _read_compressed(signature, 1)
+                property_type, offset = self._read_type(signature, offset, declaring_type)
+                parameters = []
+                for position in range(count):
+                    parameter_type, offset = self._read_type(signature, offset, declaring_type)
+                    parameters.append(ParameterInfo(None, parameter_type, position))
+                accessors = semantics.get(("Property", property_row), {})
+                getter = methods.get(accessors.get(_GETTER))
+                setter = methods.get(accessors.get(_SETTER))
+                members["properties"].append(PropertyInfo(declaring_type, self._string(name), attributes,
+                                                          property_type, parameters, getter, setter))
+        event_map = self._map_row("EventMap", row_number)
+        if event_map:
+            for event_row in self._list("EventMap", 1, event_map, "Event", "EventPtr"):
+                attributes, name, event_type = self._row("Event", event_row)
+                handler_type = self._type_def_or_ref(event_type, declaring_type)
+                accessors = semantics.get(("Event", event_row), {})
+                add_method = methods.get(accessors.get(_ADD_ON))
+                members["events"].append(EventInfo(declaring_type, self._string(name), attributes, handler_type,
+                                                   add_method))
+        return members
+
+    def _read_method(self, declaring_type, row_number):
+        _, _, attributes, name, signature, _ = self._row("MethodDef", row_number)
+        method = MethodInfo(declaring_type, self._string(name), attributes, None, [])
+        method._generic_parameters = self._generic_parameters("MethodDef", row_number, method)
+        return_type, parameter_types, _ = self._read_method_signature(self._blob(signature), 0, method)
+        names = {}
+        for param_row in self._list("MethodDef", 5, row_number, "Param", "ParamPtr"):
+            _, sequence, param_name = self._row("Param", param_row)
+            names[sequence] = self._string(param_name)
+        method.ReturnType = return_type
+        method._parameters = [ParameterInfo(names.get(i + 1), x, i) for i, x in enumerate(parameter_types)]
+        return method
+
+    def _map_row(self, table, row_number):
+        """Gets the row of a PropertyMap or EventMap table owned by a type, or 0 if it has none."""
+        maps = self._maps.get(table)
+        if maps is None:
+            maps = {parent: map_row for map_row, (parent, _) in self._iter_rows(table)}
+            self._maps[table] = maps
+        return maps.get(row_number, 0)
+
+    def _method_semantics(self):
+        if self._semantics is None:
+            self._semantics = {}
+            for _, (semantic, method, association) in self._iter_rows("MethodSemantics"):
+                key = self._decode("HasSemantics", association)
+                self._semantics.setdefault(key, {})[semantic] = method
+        return self._semantics
+
+    @property
+    def FullName(self):
+        if self._full_name is None:
+            if not self._count("Assembly"):
+                self._full_name = self._string(self._row("Module", 1)[1])
+            else:
+                _, major, minor, build, revision, _, public_key, name, culture = self._row("Assembly", 1)
+                self._full_name = _display_name(self._string(name), (major, minor, build, revision),
+                                                self._string(culture), self._blob(public_key), True)
+        return self._full_name
+
+    def GetTypes(self, include_module=False):
+        """Gets all the types defined in the assembly.
+
+        :param bool include_module: Whether to include the special '<Module>' type.
+        :rtype: list[TypeDefinition]
+        """
+        start = 1 if include_module else 2
+        return [self._type_definition(x) for x in range(start, self._count("TypeDef") + 1)]
+
+    def GetType(self, name):
+        """Gets a type defined in the assembly by its full name, where nested types are separated by '+'.
+
+        :rtype: TypeDefinition
+        """
+        return self._find_definition(name)
+
+    def GetReferencedType(self, name):
+        """Gets a type by its full name, either defined in or referenced by the assembly.
+
+        This is the equivalent of System.Type.GetType for types outside the assembly,
+        as far as the assembly's metadata knows about them.
+        Array types are supported by their '[]' suffix.
+
+        :param str name: The full name of the type, e.g. 'System.String'.
+        :return: The type, or None if the assembly doesn't know about it.
+        :rtype: Type
+        """
+        if name.endswith("[]"):
+            element_type = self.GetReferencedType(name[:-2])
+            return None if element_type is None else ArrayType(element_type)
+        found = self._find_definition(name)
+        if found is not None:
+            return found
+        for row_number in range(1, self._count("TypeRef") + 1):
+            reference = self._type_reference(row_number)
+            if reference.FullName == name:
+                return reference
+        namespace, _, short_name = name.rpartition(".")
+        if namespace == "System" and short_name in _ELEMENT_TYPES.values():
+            return self._primitive(short_name)
+        return None
+
+
+def load(path):
+    """Reads the metadata of a .NET assembly.
+
+    :param str path: The path to the assembly's dll file.
+    :rtype: Assembly
+    :raises MetadataError: if the file is not a .NET assembly.
+    """
+    return Assembly(path)
@@ -1,27 +1,45 @@
+import atexit
 import collections
+import contextlib
+import hashlib
+import html
 import json
 import logging
+import mmap
 import os
+import pickle
+import posixpath
+import queue
 import re
+import sqlite3
+import struct
+import sys
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from xml.etree import ElementTree
 
 import click
-# noinspection PyUnresolvedReferences,PyPackageRequirements
-import clr
-import requests
-import yaml
 
-from System.Reflection import Assembly, MemberInfo
-from System.IO import FileInfo
-from System import Type
-
-class_pattern = re.compile(r"(?P<namespace>\w.+)\.(?P<name>\w.+)")
-field_property_pattern = re.compile(r"(?P<namespace>\w.+)\.(?P<class>\w.+)\.(?P<name>[\w#].*)")
-method_pattern = re.compile(r"(?P<namespace>\w.+)\.(?P<class>\w.+)\.(?P<name>[\w#]+.\(.*\))")
-parameters_pattern = re.compile(r"(\(.*\))")
-
-see_pattern = re.compile(r'<see\s+cref="(\w):([^"]+)"\s+/>')
-c_pattern = re.compile(r'<c>([^<]+)</c>')
+import dotnetmetadata
+
+# The tokens of documentation IDs: names, and the characters separating them, see split_doc_id
+doc_id_token_pattern = re.compile(r"[^.,(){}\[\]]+|.")
+# The number of type parameters in the names of generic types, e.g. List`1
+generic_arity_pattern = re.compile(r"`\d+")
+
+whitespace_pattern = re.compile(r'\s+')
+markdown_link_pattern = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+# Code spans in markdown, whose backticks aren't shown, e.g. in the generic parameters of headers
+code_span_pattern = re.compile(r"(?<!\\)(`+)(.+?)(?<!`)\1(?!`)")
+# Code blocks written by render_documentation, see get_table_cell
+code_block_pattern = re.compile(r"```\w*\n(.*?)\n```", re.DOTALL)
+# Characters removed from headers to get their anchors, see get_anchor
+anchor_strip_pattern = re.compile(r"[^\w\s-]")
+anchor_separator_pattern = re.compile(r"[-\s]+")
+# The targets of markdown links, see LinkChecker
+link_target_pattern = re.compile(r"\]\(([^)\s]*)\)")
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.WARNING)
@@ -30,85 +48,1400 @@ consoleHandler.setFormatter(logging.Formatter('%(levelname)-7s: %(message)s'))
 log.addHandler(consoleHandler)
 
 output_dir = ""
+# Where generated files are written, see get_output
+output_sink = None
+# Extensions of the archives that can be used as output, with their tar compression
+archive_extensions = {".zip": None, ".tar": "", ".tar.gz": "gz", ".tgz": "gz", ".tar.bz2": "bz2", ".tar.xz": "xz"}
+
+# How assemblies are read: "pythonnet" loads them in the CLR and uses reflection,
+# "metadata" reads their metadata tables directly, without a .NET runtime
+backend = "pythonnet"
+
+xref_url = "https://xref.docs.microsoft.com/query"
+xref_cache = None
+xref_session = None
+xref_connections = 8
+offline = False
+# Links of a local xrefmap, looked up before the cache and the xref service, see XrefIndex
+xref_index = None
+
+# The resolver of a worker process in parallel builds
+worker_resolver = None
+# Pages are generated in a pipeline, see build_documentation. Number of pages resolved or generated ahead of the
+# following stage, and number of pages whose external links are resolved together
+pipeline_size = 64
+pipeline_chunk_size = 16
+
+# Records timings and counters of the build when profiling, see Profiler
+profiler = None
+
+# Maximum total size of the pages kept in memory by the preview server, in characters, see serve
+preview_cache_size = 64 * 1024 * 1024
+
+# Whether the documentation hierarchy is written into hierarchy.json, for debugging purposes
+hierarchy_dump = False
+# Whether the search entries of the pages are written, for the mkdocs hook in markdowndotnet_search.py.
+# mkdocs ignores files starting with a dot, so the file isn't published with the pages
+search_index = False
+search_index_path = ".markdowndotnet-search.json"
+
+# Changing this version invalidates existing build manifests, so every page is generated again
+manifest_version = 2
+# Part of each page's hash, see get_page_hash. Changing this version whenever the markdown generated from the same
+# documentation changes makes following builds generate every page again
+renderer_version = 3
+# Changing this version invalidates compiled documentation models, see compile_model
+model_version = 1
+
+type_aliases = {
+    "System.String": "string",
+    "System.SByte": "sbyte",
+    "System.Byte": "byte",
+    "System.Int16": "short",
+    "System.UInt16": "ushort",
+    "System.Int32": "int",
+    "System.UInt32": "uint",
+    "System.Int64": "long",
+    "System.UInt64": "ulong",
+    "System.Char": "char",
+    "System.Single": "float",
+    "System.Double": "double",
+    "System.Boolean": "bool",
+    "System.Decimal": "decimal",
+    "System.Void": "void"
+}
+
+
+def split_doc_id(doc_id, parts=3):
+    """Splits a documentation ID into its names and the types of its parameters, in a single pass
+
+    Names are separated by the dots outside of the parameters, the last ones being the type's and the member's names.
+    Parameters are separated by the commas outside of braces and brackets, so generic arguments and array bounds
+    are kept together, e.g. ``Add(System.Collections.Generic.List{System.Int32},System.Int32[0:,0:])``.
+    Anything after the parameters, like the return type of conversion operators
+    (e.g. ``op_Implicit(System.Int32)~System.Decimal``), is part of the member's name.
+
+    :param str doc_id: The ID, without its member type prefix (e.g. ``M:``).
+    :param int parts: The number of names to split the ID into, 2 for types (namespace and name),
+        3 for members (namespace, type and name), 1 for a member's name alone.
+    :return: A tuple containing the names, the last one including the parameters, and the list of parameter types,
+             or None if the ID doesn't contain enough names.
+    :rtype: tuple
+    """
+    if "{" not in doc_id and "[" not in doc_id:
+        # Without braces or brackets every separator is at the top level, so string methods give the same result
+        start = doc_id.find("(")
+        if start == -1:
+            names = doc_id.rsplit(".", parts-1) if parts > 1 else [doc_id]
+            parameters = []
+        else:
+            names = doc_id[:start].rsplit(".", parts-1) if parts > 1 else [doc_id[:start]]
+            names[-1] += doc_id[start:]
+            end = doc_id.find(")", start)
+            parameters = doc_id[start+1:end].split(",") if end > start + 1 else []
+        if len(names) < parts or not all(names):
+            return None
+        return tuple(names) + (parameters,)
+    dots = []
+    parameters = []
+    depth = 0
+    # The position where the current parameter starts, None until the parameters are found
+    start = None
+    for m in doc_id_token_pattern.finditer(doc_id):
+        token = m.group()
+        if token == ".":
+            if start is None and depth == 0:
+                dots.append(m.start())
+        elif token == ",":
+            if start is not None and depth == 0:
+                parameters.append(doc_id[start:m.start()])
+                start = m.end()
+        elif token == "(" and start is None and depth == 0:
+            start = m.end()
+        elif token == ")" and start is not None and depth == 0:
+            if parameters or m.start() > start:
+                parameters.append(doc_id[start:m.start()])
+            break
+        elif token == "{" or token == "[" or token == "(":
+            depth += 1
+        elif token == "}" or token == "]" or token == ")":
+            depth -= 1
+    if len(dots) < parts - 1:
+        return None
+    names = []
+    previous = 0
+    for dot in dots[len(dots)-parts+1:]:
+        names.append(doc_id[previous:dot])
+        previous = dot + 1
+    names.append(doc_id[previous:])
+    if not all(names):
+        return None
+    return tuple(names) + (parameters,)
 
 
 def get_params(func):
     """
     Gets a list of parameter types (as strings)
 
-    :param func: The method's full name, with parenthesis
+    :param func: The method's name, with parenthesis
     :return: containing the type of each parameter in order.
     :rtype: list[str]
     """
-    m = parameters_pattern.search(func)
-    if not m:
-        # If there are no parenthesis in name, method has no parameters
-        return []
+    return split_doc_id(func, 1)[1]
+
+
+# The kinds of members used in documentation IDs, by reflection member type
+member_kinds = {"Constructor": "C", "Method": "M", "Field": "F", "Property": "P", "Event": "E"}
+
+
+def get_doc_name(cs_type):
+    """Gets the name of a type as written in the member IDs of XML documentation files
+
+    Nested types are separated by dots, generic types have their arguments in braces,
+    generic parameters are shown by position, e.g. `0 for types and ``0 for methods.
+
+    :param Type cs_type: The C# type.
+    :rtype: str
+    """
+    if cs_type.HasElementType:
+        if cs_type.IsByRef:
+            suffix = "@"
+        elif cs_type.IsPointer:
+            suffix = "*"
+        else:
+            rank = cs_type.GetArrayRank()
+            suffix = "[]" if rank == 1 else "[{}]".format(",".join(["0:"] * rank))
+        return get_doc_name(cs_type.GetElementType()) + suffix
+    if cs_type.IsGenericParameter:
+        prefix = "`" if cs_type.DeclaringMethod is None else "``"
+        return prefix + str(cs_type.GenericParameterPosition)
+    if cs_type.IsGenericType:
+        name = generic_arity_pattern.sub("", cs_type.GetGenericTypeDefinition().FullName).replace("+", ".")
+        return "{}{{{}}}".format(name, ",".join(get_doc_name(x) for x in cs_type.GetGenericArguments()))
+    return (cs_type.FullName or cs_type.Name).replace("+", ".")
+
+
+def get_doc_id(member, kind):
+    """Gets a member's name as written in XML documentation files, after the name of its type
+
+    Constructors are named '.ctor', as in the documentation hierarchy (see :func:`iter_documentation`).
+
+    :param MemberInfo member: The C# member.
+    :param str kind: The kind of member: 'C', 'M', 'F', 'P' or 'E'.
+    :return: The member's name, including its parameters if it has any.
+    :rtype: str
+    """
+    name = member.Name
+    if kind != "C":
+        # Explicit interface implementations
+        name = name.replace(".", "#")
+    if kind == "M" and member.IsGenericMethod:
+        name += "``{}".format(len(member.GetGenericArguments()))
+    if kind == "C" or kind == "M":
+        parameters = member.GetParameters()
+    elif kind == "P":
+        parameters = member.GetIndexParameters()
     else:
-        return m.group(1).replace("(", "").replace(")", "").split(",")
+        parameters = []
+    if len(parameters):
+        name += "({})".format(",".join(get_doc_name(x.ParameterType) for x in parameters))
+    if kind == "M" and member.Name in ("op_Implicit", "op_Explicit"):
+        name += "~" + get_doc_name(member.ReturnType)
+    return name
 
 
-def get_type(local_assembly, type_name):
-    """Gets the type's class via reflection
+class TypeResolver:
+    """Resolves type names and links for one or more assemblies
 
-    The type is looked for in the local assembly first,
-    if not found, it will be looked in the system assembly.
+    The assemblies' types are indexed once by their documentation name (where nested types are separated by a dot),
+    along with the path of the markdown file generated for each of them.
+    Types of every assembly are local, so links between assemblies documented together are relative links.
+    Type lookups and relative links are memoized, so they are only computed once per run.
+    The public members of each type are fetched with a single reflection call, and indexed by their documentation ID.
 
-    :param Assembly local_assembly:  Assembly object to look for.
-    :param str type_name: The full name of the type.
-    :return: A C# Type object.
-    :rtype: Type
+    :param Assembly assemblies: The local C# Assembly objects.
     """
-    local_type = local_assembly.GetType(type_name)
-    if local_type is None:
-        return Type.GetType(type_name)
-    return local_type
+    def __init__(self, *assemblies):
+        self.assemblies = assemblies
+        self.types = {}
+        self.paths = {}
+        self.links = {}
+        self.external_types = {}
+        self.signatures = {}
+        self.member_indexes = {}
+        with profile_phase("index_types"):
+            for assembly in assemblies:
+                for cs_type in assembly.GetTypes():
+                    full_name = cs_type.FullName
+                    if full_name is None:
+                        continue
+                    name = full_name.replace("+", ".")
+                    self.types[name] = cs_type
+                    self.paths[full_name] = os.path.join(output_dir, name.replace(".", "/") + ".md")
+        if isinstance(assemblies[0], (dotnetmetadata.Assembly, XmlAssembly, ModelAssembly)):
+            self.binding_flags = dotnetmetadata.BindingFlags
+            self.find_type = self.find_referenced_type
+        else:
+            # noinspection PyUnresolvedReferences
+            from System import Type
+            # noinspection PyUnresolvedReferences
+            from System.Reflection import BindingFlags
+            self.binding_flags = BindingFlags
+            self.find_type = Type.GetType
+
+    def get_type(self, type_name):
+        """Gets the type's class via reflection
+
+        The type is looked for in the local assembly first,
+        if not found, it will be looked in the system assembly,
+        or among the assembly's references when reading its metadata.
+
+        :param str type_name: The full name of the type.
+        :return: A C# Type object.
+        :rtype: Type
+        """
+        local_type = self.types.get(type_name)
+        if local_type is not None:
+            return local_type
+        if type_name not in self.external_types:
+            count("type_lookups")
+            self.external_types[type_name] = self.find_type(type_name)
+        return self.external_types[type_name]
+
+    def find_referenced_type(self, type_name):
+        """Looks for a type among the types referenced by the assemblies, when reading their metadata
+
+        :param str type_name: The full name of the type.
+        :rtype: dotnetmetadata.Type
+        """
+        for assembly in self.assemblies:
+            cs_type = assembly.GetReferencedType(type_name)
+            if cs_type is not None:
+                return cs_type
+        return None
+
+    def get_signature(self, cs_type):
+        """Gets a string representation of a type's base type, attributes and declared members
+
+        :param Type cs_type: The C# Type object.
+        :return: A list of strings describing the type.
+        :rtype: list[str]
+        """
+        full_name = cs_type.FullName
+        if full_name not in self.signatures:
+            binding_flags = self.binding_flags
+            flags = binding_flags.Public | binding_flags.NonPublic | binding_flags.Instance | binding_flags.Static | \
+                binding_flags.DeclaredOnly
+            signature = [str(cs_type.BaseType), str(cs_type.Attributes)]
+            count("member_lookups")
+            signature.extend(sorted(str(x) for x in cs_type.GetMembers(flags)))
+            self.signatures[full_name] = signature
+        return self.signatures[full_name]
+
+    def get_members(self, cs_type):
+        """Gets the public members of a type, indexed by kind and name as written in XML documentation files
+
+        :param Type cs_type: The C# Type object.
+        :return: A dictionary of members, with ``(kind, name)`` tuples as keys, see :func:`get_doc_id`.
+        :rtype: dict[tuple[str, str], MemberInfo]
+        """
+        full_name = cs_type.FullName
+        if full_name not in self.member_indexes:
+            binding_flags = self.binding_flags
+            # Documentation IDs always refer to the type declaring the member
+            flags = binding_flags.Public | binding_flags.Instance | binding_flags.Static | binding_flags.DeclaredOnly
+            count("member_lookups")
+            index = {}
+            for member in cs_type.GetMembers(flags):
+                kind = member_kinds.get(str(member.MemberType))
+                if kind is not None:
+                    index[(kind, get_doc_id(member, kind))] = member
+            self.member_indexes[full_name] = index
+        return self.member_indexes[full_name]
+
+    def get_member(self, cs_type, kind, name):
+        """Gets a public member of a type by its name in the documentation hierarchy
+
+        :param Type cs_type: The C# Type object.
+        :param str kind: The kind of member: 'C', 'M', 'F', 'P' or 'E'.
+        :param str name: The name of the member, including its parameters' types for methods and constructors.
+        :return: The member, or None if the type has no such member.
+        :rtype: MemberInfo
+        """
+        return self.get_members(cs_type).get((kind, name))
+
+    def is_local(self, cs_type):
+        """Checks if a type belongs to the local assembly
+
+        :param Type cs_type: The C# Type object.
+        :rtype: bool
+        """
+        return cs_type.FullName in self.paths
+
+    def get_link(self, *, type_name=None, cs_type=None, current_file=None, anchor=None):
+        """Gets a link in markdown format for the type
+
+        If type_name is supplied, cs_type will be obtained from it.
+        If the type is in the local assembly, a relative link to type's markdown file will be generated
+        Otherwise, a link to docs.microsoft will be returned
+
+        :param str type_name: The full name of the type.
+        :param Type cs_type: The C# Type object.
+        :param str current_file: The path of the file where the type is being referenced from.
+        :param str anchor: The name of the member to link to, if any.
+        :return: A markdown syntax link to the type's documentation.
+        :rtype: str
+        :raises ValueError: if both type_name and cs_type are None.
+        """
+        if not type_name and not cs_type:
+            raise ValueError("Both type_name and cs_type can't be None")
+        if type_name is not None:
+            cs_type = self.get_type(type_name)
+        if cs_type is None:
+            log.warning("Couldn't find type: %s", type_name)
+            return type_name
+        suffix = ""
+        if cs_type.IsArray:
+            cs_type = cs_type.GetElementType()
+            suffix = "[]"
+        full_name = cs_type.FullName
+        if full_name is None:
+            # Generic parameters have no documentation of their own
+            return cs_type.Name + suffix
+        # Type belongs to the assembly, so link will be relative
+        if full_name in self.paths:
+            current_path = os.path.dirname(current_file) + "/"
+            key = (current_path, full_name, anchor)
+            if key not in self.links:
+                relative_path = os.path.relpath(self.paths[full_name], current_path)
+                if anchor is not None:
+                    name = anchor
+                    relative_path += "#"+get_anchor(anchor)
+                else:
+                    name = cs_type.Name
+                self.links[key] = "[{0}]({1})".format(name, relative_path)
+            return self.links[key] + suffix
+        else:
+            link = get_external_link(full_name)
+            if link is None:
+                return full_name
+            return "[{0}]({1}){2}".format(link[0], link[1], suffix)
 
 
-def get_link(local_assembly, *, type_name=None, cs_type=None, current_file=None, anchor=None):
-    """Gets a link in markdown format for the type
+class XmlUnknownType(dotnetmetadata.Type):
+    """A type that can't be known from the XML documentation alone, such as a property's type"""
+    Name = "?"
+    FullName = None
 
-    If type_name is supplied, cs_type will be obtained from it.
-    If the type is in the local assembly, a relative link to type's markdown file will be generated
-    Otherwise, a link to docs.microsoft will be returned
 
-    :param Assembly local_assembly: The local C# Assembly object.
-    :param str type_name: The full name of the type.
-    :param Type cs_type: The C# Type object.
-    :param str current_file: The path of the file where the type is being referenced from.
-    :return: A markdown syntax link to the type's documentation.
-    :rtype: str
-    :raises ValueError: if both type_name and cs_type are None.
-    """
-    if not type_name and not cs_type:
-        raise ValueError("Both type_name and cs_type can't be None")
-    if type_name is not None:
-        cs_type = get_type(local_assembly, type_name)
-    if cs_type is None:
-        log.warning("Couldn't find type: {}", type_name)
-        return type_name
-    suffix = ""
-    if cs_type.IsArray:
-        cs_type = cs_type.GetElementType()
-        suffix = "[]"
-    # Type belongs to the assembly, so link will be relative
-    if cs_type.Assembly.FullName == local_assembly.FullName:
-        current_path = os.path.dirname(current_file) + "/"
-        target_file = os.path.join(output_dir, str(cs_type).replace('.', '/') + ".md")
-        relative_path = os.path.relpath(target_file, current_path)
-        if anchor is not None:
-            name = anchor
-            relative_path += "#"+anchor.lower()
+class XmlType(dotnetmetadata.Type):
+    """A type of a :class:`XmlAssembly`, whose members are the ones found in its documentation
+
+    :param XmlAssembly assembly: The assembly containing the type.
+    :param TypeDoc type_doc: The type's documentation.
+    """
+    def __init__(self, assembly, type_doc):
+        self.Assembly = assembly
+        self.Namespace = type_doc.namespace
+        self.Name = type_doc.name
+        self.type_doc = type_doc
+        self.members = None
+        documentation = type_doc.documentation
+        # Only delegates document parameters and return values, nested types are rendered as delegates
+        self.IsNested = "param" in documentation or "returns" in documentation
+
+    def get_members(self, member_type):
+        if self.members is None:
+            self.members = {"C": [], "M": [], "F": [], "P": [], "E": []}
+            for member_doc in self.type_doc.children.values():
+                member = self.Assembly.create_member(self, member_doc.name, member_doc.type, member_doc.documentation)
+                self.members[member_doc.type].append(member)
+        return self.members[member_type]
+
+    def GetConstructors(self, flags=None):
+        return list(self.get_members("C"))
+
+    def GetMethod(self, name, types=None):
+        if name == "Invoke" and self.IsNested:
+            return self.Assembly.create_method(self, name, [], self.type_doc.documentation)
+        return next((x for x in self.get_members("M") if x.Name == name and
+                     (types is None or [p.ParameterType for p in x.GetParameters()] == types)), None)
+
+    def GetMethods(self, flags=None):
+        return list(self.get_members("M"))
+
+    def GetFields(self, flags=None):
+        return list(self.get_members("F"))
+
+    def GetProperties(self, flags=None):
+        return list(self.get_members("P"))
+
+    def GetEvents(self, flags=None):
+        return list(self.get_members("E"))
+
+    def GetMembers(self, flags=None):
+        return self.GetConstructors() + self.GetMethods() + self.GetFields() + self.GetProperties() + self.GetEvents()
+
+
+class XmlAssembly:
+    """Stands in for an assembly when only the XML documentation is available
+
+    Used to preview pages without loading the dll. Types and their members are built from the documentation hierarchy:
+    parameter types are taken from the members' names and parameter names from their 'param' tags.
+    Whatever is not in the XML file, like base types or the types of properties and return values, is shown as '?'.
+
+    :param dict[str, Namespace] hierarchy: The documentation hierarchy, as returned by :func:`parse_documentation`.
+    """
+    def __init__(self, hierarchy):
+        self.referenced_types = {}
+        self.unknown_type = XmlUnknownType()
+        self.void_type = dotnetmetadata.TypeReference(self, "System", "Void")
+        self.types = collections.OrderedDict()
+        for namespace in hierarchy.values():
+            for type_doc in namespace.types.values():
+                cs_type = XmlType(self, type_doc)
+                self.types[cs_type.FullName] = cs_type
+
+    def GetTypes(self):
+        return list(self.types.values())
+
+    def GetReferencedType(self, name):
+        """Gets a type by the name used for it in the documentation
+
+        Types outside the documentation are only known by their name.
+
+        :param str name: The full name of the type.
+        :rtype: dotnetmetadata.Type
+        """
+        if name in self.types:
+            return self.types[name]
+        if name not in self.referenced_types:
+            if name.endswith("[]"):
+                cs_type = dotnetmetadata.ArrayType(self.GetReferencedType(name[:-2]))
+            elif name.endswith("@"):
+                # Parameters passed by reference
+                cs_type = dotnetmetadata.ByRefType(self.GetReferencedType(name[:-1]))
+            else:
+                namespace, _, short_name = name.rpartition(".")
+                cs_type = dotnetmetadata.TypeReference(self, namespace or None, short_name)
+            self.referenced_types[name] = cs_type
+        return self.referenced_types[name]
+
+    def create_method(self, declaring_type, name, param_types, documentation, return_type=None):
+        """Creates a method, or a delegate's 'Invoke' method, from its documentation
+
+        :param XmlType declaring_type: The type containing the method.
+        :param str name: The name of the method, without parameters.
+        :param list[str] param_types: The full names of the parameters' types, unknown for delegates.
+        :param dict documentation: The method's documentation.
+        :param dotnetmetadata.Type return_type: The return type, when it's known from the method's name.
+        :rtype: dotnetmetadata.MethodInfo
+        """
+        if return_type is None:
+            return_type = self.unknown_type if "returns" in documentation else self.void_type
+        return dotnetmetadata.MethodInfo(declaring_type, name, dotnetmetadata.MethodAttributes.Public, return_type,
+                                         self.create_parameters(param_types, documentation))
+
+    def create_parameters(self, param_types, documentation):
+        """Creates the parameters of a method or an indexer from their types and their 'param' tags
+
+        :param list[str] param_types: The full names of the parameters' types, unknown for delegates.
+        :param dict documentation: The member's documentation.
+        :rtype: list[dotnetmetadata.ParameterInfo]
+        """
+        param_names = list(documentation.get("param", {}))
+        count = max(len(param_names), len(param_types))
+        parameters = []
+        for i in range(count):
+            param_name = param_names[i] if i < len(param_names) else "?"
+            param_type = self.GetReferencedType(param_types[i]) if i < len(param_types) else self.unknown_type
+            parameters.append(dotnetmetadata.ParameterInfo(param_name, param_type, i))
+        return parameters
+
+    def create_member(self, declaring_type, name, member_type, documentation):
+        """Creates a member of a type from its documentation
+
+        :param XmlType declaring_type: The type containing the member.
+        :param str name: The name of the member, as found in the hierarchy.
+        :param str member_type: The kind of member: 'C', 'M', 'F', 'P' or 'E'.
+        :param dict documentation: The member's documentation.
+        :rtype: dotnetmetadata.MemberInfo
+        """
+        public = dotnetmetadata.MethodAttributes.Public
+        if member_type == "F":
+            return dotnetmetadata.FieldInfo(declaring_type, name, public, self.unknown_type)
+        if member_type == "P":
+            # Indexers have their parameters in their names, e.g. Item(System.Int32)
+            parameters = self.create_parameters(get_params(name), documentation)
+            name = name.split("(")[0]
+            getter = dotnetmetadata.MethodInfo(declaring_type, "get_" + name, public, self.unknown_type, [])
+            return dotnetmetadata.PropertyInfo(declaring_type, name, public, self.unknown_type, parameters, getter,
+                                               None)
+        if member_type == "E":
+            add_method = dotnetmetadata.MethodInfo(declaring_type, "add_" + name, public, self.void_type, [])
+            return dotnetmetadata.EventInfo(declaring_type, name, public, self.unknown_type, add_method)
+        method_name = ".ctor" if member_type == "C" else name.split("(")[0]
+        # Conversion operators have their return type after their parameters,
+        # e.g. op_Implicit(System.Int32)~System.Decimal
+        return_type = self.GetReferencedType(name.partition("~")[2]) if "~" in name else None
+        return self.create_method(declaring_type, method_name, get_params(name), documentation, return_type)
+
+
+class ModelType(dotnetmetadata.Type):
+    """A type of a :class:`ModelAssembly`, as it was reflected when the model was compiled
+
+    Only documented types have a base type and members, other types are only known by their names.
+
+    :param ModelAssembly assembly: The assembly containing the type.
+    :param tuple record: The type's name, namespace, full name, string representation, whether it's an array,
+        the index of its element type, and whether it's an enum or a nested type, see :func:`compile_model`.
+    """
+    FullName = None
+
+    def __init__(self, assembly, record):
+        self.Assembly = assembly
+        self.Name, self.Namespace, self.FullName, self.text, self.IsArray, _, self.IsEnum, self.IsNested = record
+        self.HasElementType = self.IsArray
+        self.element_type = None
+        self.members = []
+        self.invoke = None
+
+    def __str__(self):
+        return self.text
+
+    def GetElementType(self):
+        return self.element_type
+
+    def GetConstructors(self, flags=None):
+        return [x for x in self.members if x.MemberType == "Constructor"]
+
+    def GetMethod(self, name, types=None):
+        if name == "Invoke":
+            return self.invoke
+        return next((x for x in self.GetMethods() if x.Name == name), None)
+
+    def GetMethods(self, flags=None):
+        return [x for x in self.members if x.MemberType == "Method"]
+
+    def GetFields(self, flags=None):
+        return [x for x in self.members if x.MemberType == "Field"]
+
+    def GetProperties(self, flags=None):
+        return [x for x in self.members if x.MemberType == "Property"]
+
+    def GetEvents(self, flags=None):
+        return [x for x in self.members if x.MemberType == "Event"]
+
+    def GetMembers(self, flags=None):
+        return list(self.members)
+
+
+class ModelAssembly:
+    """Stands in for the assemblies a documentation model was compiled from
+
+    Types and members are built from what was reflected when the model was compiled, see :func:`compile_model`,
+    so no assembly is loaded. Only the types that were looked up by name while compiling it can be found.
+
+    :param dict model: The compiled model.
+    """
+    def __init__(self, model):
+        self.all_types = [ModelType(self, record) for record in model["types"]]
+        for cs_type, record in zip(self.all_types, model["types"]):
+            cs_type.element_type = self.get(record[5])
+        self.referenced_types = model["referenced"]
+        self.signatures = {}
+        self.member_indexes = {}
+        for type_id, (base_id, signature, members, invoke) in model["documented"].items():
+            cs_type = self.all_types[type_id]
+            cs_type.BaseType = self.get(base_id)
+            index = {}
+            for doc_id, member_record in members:
+                member = self.create_member(cs_type, member_record)
+                cs_type.members.append(member)
+                index[(member_record[0], doc_id)] = member
+            if invoke is not None:
+                cs_type.invoke = self.create_member(cs_type, invoke)
+            self.signatures[cs_type.FullName] = signature
+            self.member_indexes[cs_type.FullName] = index
+        self.types = [self.all_types[x] for x in model["local"]]
+
+    def get(self, type_id):
+        """Gets a type by its index in the model
+
+        :param int type_id: The index of the type, or None.
+        :rtype: ModelType
+        """
+        return None if type_id is None else self.all_types[type_id]
+
+    def GetTypes(self):
+        return list(self.types)
+
+    def GetReferencedType(self, name):
+        """Gets a type by the name it was looked up with when compiling the model
+
+        :param str name: The full name of the type.
+        :return: The type, or None if it wasn't found when compiling the model.
+        :rtype: ModelType
+        """
+        return self.get(self.referenced_types.get(name))
+
+    def create_member(self, declaring_type, record):
+        """Creates a member of a type from its record in the model
+
+        :param ModelType declaring_type: The type containing the member.
+        :param tuple record: The member's kind, followed by its properties, see :func:`compile_model`.
+        :rtype: dotnetmetadata.MemberInfo
+        """
+        kind, name = record[:2]
+        if kind == "F":
+            return dotnetmetadata.FieldInfo(declaring_type, name, record[2], self.get(record[3]))
+        if kind == "P":
+            _, _, type_id, parameters, getter, setter = record
+            property_type = self.get(type_id)
+            if getter is not None:
+                getter = dotnetmetadata.MethodInfo(declaring_type, "get_" + name, getter, property_type, [])
+            if setter is not None:
+                setter = dotnetmetadata.MethodInfo(declaring_type, "set_" + name, setter, None, [])
+            return dotnetmetadata.PropertyInfo(declaring_type, name, 0, property_type,
+                                               self.create_parameters(parameters), getter, setter)
+        if kind == "E":
+            _, _, handler_id, add_method = record
+            if add_method is not None:
+                add_method = dotnetmetadata.MethodInfo(declaring_type, "add_" + name, add_method, None, [])
+            return dotnetmetadata.EventInfo(declaring_type, name, 0, self.get(handler_id), add_method)
+        _, _, attributes, return_id, parameters = record
+        return dotnetmetadata.MethodInfo(declaring_type, name, attributes, self.get(return_id),
+                                         self.create_parameters(parameters))
+
+    def create_parameters(self, parameters):
+        """Creates the parameters of a method or indexer
+
+        :param list[tuple[str, int]] parameters: The name and type index of each parameter.
+        :rtype: list[dotnetmetadata.ParameterInfo]
+        """
+        return [dotnetmetadata.ParameterInfo(name, self.get(type_id), i)
+                for i, (name, type_id) in enumerate(parameters)]
+
+
+class XrefCache:
+    """Persistent cache for external documentation links, stored in a SQLite database.
+
+    Entries are keyed by the type's full name and are considered fresh for ``ttl`` seconds.
+    Types without a documentation reference are cached too, so they are not looked up again.
+    The cache can be used from several threads.
+
+    :param str path: The path to the database file.
+    :param int ttl: Number of seconds an entry is considered fresh.
+    """
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.connection.execute("CREATE TABLE IF NOT EXISTS xref "
+                                "(uid TEXT PRIMARY KEY, name TEXT, href TEXT, updated REAL)")
+        self.entries = {}
+
+    def get(self, uid, include_expired=False):
+        """Gets a cached documentation link
+
+        :param str uid: The full name of the type.
+        :param bool include_expired: Whether to return entries older than the cache's ttl.
+        :return: A tuple containing the name and url of the type's documentation, ``(None, None)`` if the type is
+                 known to have no documentation, or None if the type is not cached.
+        :rtype: tuple[str, str]
+        """
+        if uid in self.entries:
+            return self.entries[uid]
+        with self.lock:
+            row = self.connection.execute("SELECT name, href, updated FROM xref WHERE uid = ?", (uid,)).fetchone()
+        if row is None:
+            return None
+        name, href, updated = row
+        if not include_expired and time.time() - updated > self.ttl:
+            return None
+        self.entries[uid] = (name, href)
+        return name, href
+
+    def set(self, uid, name, href, persist=True):
+        """Stores a documentation link
+
+        :param str uid: The full name of the type.
+        :param str name: The name of the type in the documentation, or None if not found.
+        :param str href: The url to the type's documentation, or None if not found.
+        :param bool persist: Whether to save the entry to the database, or only keep it for the current run.
+        """
+        self.entries[uid] = (name, href)
+        if not persist:
+            return
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO xref (uid, name, href, updated) VALUES (?, ?, ?, ?)",
+                                    (uid, name, href, time.time()))
+
+    def save(self):
+        """Saves pending changes to the database."""
+        with self.lock:
+            self.connection.commit()
+
+    def close(self):
+        """Saves pending changes and closes the database."""
+        self.save()
+        self.connection.close()
+
+
+class XrefIndex:
+    """Read-only index of documentation links, compiled from a DocFX xrefmap
+
+    The index is a file with the entries sorted by uid, which is memory-mapped and binary searched,
+    so opening it takes the same time regardless of its size, and only the pages read by lookups are loaded.
+
+    The file starts with a header containing :attr:`magic` and the number of entries, followed by the offset of each
+    entry. Entries are the uid, name and url, encoded in UTF-8 and terminated by a null character.
+
+    :param str path: The path to the compiled index.
+    :raises ValueError: if the file is not a compiled index.
+    """
+    magic = b"MDNXREF1"
+    header = struct.Struct("<8sI")
+    offset = struct.Struct("<I")
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size = self.header.unpack_from(self.data)
+        if magic != self.magic:
+            self.data.close()
+            raise ValueError("{} is not a compiled xref index".format(path))
+
+    def read(self, position):
+        """Reads a null-terminated value
+
+        :param int position: The position of the value in the file.
+        :return: The value, and the position of the following one.
+        :rtype: tuple[bytes, int]
+        """
+        end = self.data.find(b"\0", position)
+        return self.data[position:end], end + 1
+
+    def get(self, uid):
+        """Gets the documentation link of a type
+
+        :param str uid: The full name of the type.
+        :return: A tuple containing the name and url of the type's documentation, or None if not found.
+        :rtype: tuple[str, str]
+        """
+        key = uid.encode("utf-8")
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            position, = self.offset.unpack_from(self.data, self.header.size + self.offset.size * middle)
+            entry_uid, position = self.read(position)
+            if entry_uid < key:
+                low = middle + 1
+            elif entry_uid > key:
+                high = middle
+            else:
+                name, position = self.read(position)
+                href, _ = self.read(position)
+                return name.decode("utf-8"), href.decode("utf-8")
+        return None
+
+    def close(self):
+        """Closes the index."""
+        self.data.close()
+
+    @classmethod
+    def compile(cls, xrefmap_path, path):
+        """Compiles a DocFX xrefmap into an index
+
+        Relative urls are joined to the xrefmap's ``baseUrl``. References without an url are skipped.
+
+        :param str xrefmap_path: The path to the xrefmap, a YAML file with a list of ``references``.
+        :param str path: The path where the index is written.
+        :return: The number of entries in the index.
+        :rtype: int
+        """
+        from urllib.parse import urljoin
+        base_url = ""
+        references = []
+        for key, value in iter_xrefmap(xrefmap_path):
+            if key == "baseUrl":
+                base_url = value or ""
+            else:
+                references.append(value)
+        entries = {}
+        for reference in references:
+            if not reference.get("uid") or not reference.get("href"):
+                continue
+            uid = reference["uid"].encode("utf-8")
+            if uid not in entries:
+                name = (reference.get("name") or reference["uid"].rsplit(".", 1)[-1]).encode("utf-8")
+                href = urljoin(base_url, reference["href"]).encode("utf-8")
+                entries[uid] = b"\0".join([uid, name, href]) + b"\0"
+        position = cls.header.size + cls.offset.size * len(entries)
+        offsets = []
+        records = []
+        for uid in sorted(entries):
+            offsets.append(cls.offset.pack(position))
+            records.append(entries[uid])
+            position += len(entries[uid])
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(cls.header.pack(cls.magic, len(entries)))
+            f.write(b"".join(offsets))
+            f.write(b"".join(records))
+        os.replace(temp_path, path)
+        return len(entries)
+
+
+def iter_xrefmap(path):
+    """Iterates the contents of a DocFX xrefmap as they are read
+
+    The file's YAML events are read directly, which is several times faster than loading the whole document,
+    since xrefmaps may contain hundreds of thousands of references. Values that are not strings are skipped.
+
+    :param str path: The path to the xrefmap.
+    :return: A generator of tuples containing the top level key and its value, a string for ``baseUrl``,
+             or a dictionary for each element of ``references``.
+    :rtype: collections.Iterator[tuple[str, str | dict[str, str]]]
+    :raises click.BadParameter: if the xrefmap is not valid.
+    """
+    import yaml
+    # The open collections, each one a list with whether it's a mapping, the key whose value is expected next,
+    # and its own key in the parent mapping
+    stack = []
+    reference = None
+    with open(path, encoding="utf-8") as f:
+        try:
+            for event in yaml.parse(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+                if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                    is_mapping = isinstance(event, yaml.MappingStartEvent)
+                    if not stack and not is_mapping:
+                        raise click.BadParameter("The xrefmap must be a mapping with a list of references")
+                    key = None
+                    if stack and stack[-1][0]:
+                        key, stack[-1][1] = stack[-1][1], None
+                    stack.append([is_mapping, None, key])
+                    if len(stack) == 3 and is_mapping and stack[1][2] == "references":
+                        reference = {}
+                elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                    if len(stack) == 3 and reference is not None:
+                        yield "references", reference
+                        reference = None
+                    stack.pop()
+                elif isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)) and stack and stack[-1][0]:
+                    value = getattr(event, "value", None)
+                    if stack[-1][1] is None:
+                        stack[-1][1] = value
+                        continue
+                    key, stack[-1][1] = stack[-1][1], None
+                    if len(stack) == 1 and key == "baseUrl":
+                        yield key, value
+                    elif len(stack) == 3 and reference is not None:
+                        reference[key] = value
+        except yaml.YAMLError as e:
+            raise click.BadParameter("Invalid xrefmap {}: {}".format(path, e))
+
+
+def load_xref_index(path, cache_path):
+    """Opens a compiled xref index, compiling it first if given a xrefmap
+
+    A xrefmap is compiled into a file in the folder of the link cache, since the xrefmap's own folder may be
+    read-only. The file is named after the cache and a hash of the xrefmap's path, e.g.
+    ``.xref_cache.0123456789ab.idx``, so different xrefmaps don't share it, and is compiled again only if the
+    xrefmap is newer.
+
+    :param str path: The path to a DocFX xrefmap or to a compiled index.
+    :param str cache_path: The path to the link cache, see :class:`XrefCache`.
+    :return: The index.
+    :rtype: XrefIndex
+    """
+    with open(path, "rb") as f:
+        compiled = f.read(len(XrefIndex.magic)) == XrefIndex.magic
+    if compiled:
+        return XrefIndex(path)
+    key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:12]
+    index_path = "{}.{}.idx".format(os.path.splitext(os.path.abspath(cache_path))[0], key)
+    if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(path):
+        log.info("Compiling xrefmap %s", path)
+        size = XrefIndex.compile(path, index_path)
+        log.info("Compiled %d references into %s", size, index_path)
+    return XrefIndex(index_path)
+
+
+class Profiler:
+    """Records the time taken by each phase of a build and by each page, along with counters of expensive operations
+
+    Phases run more than once, like in watch mode, add up their times.
+    Phases running at the same time, like the stages of the pages' pipeline, are measured separately,
+    so the sum of their times may exceed the total.
+
+    Counters are:
+
+    - ``type_lookups``: types looked up via reflection, or among the assembly's references.
+    - ``member_lookups``: reflection calls getting a type's members.
+    - ``xref_index_hits``: external links found in the local xref index.
+    - ``xref_cache_hits`` and ``xref_cache_misses``: external links found, or not, in the cache.
+    - ``xref_requests``: external links requested to the xref service.
+    - ``links_checked`` and ``dangling_links``: internal links checked after a build, and those whose target is missing.
+    - ``bytes_written``: size of the generated files, encoded as UTF-8.
+    """
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = collections.OrderedDict()
+        self.types = {}
+        self.counters = collections.Counter()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Gets the page times and counters recorded so far, and clears them
+
+        Used by worker processes to send their measures to the main process.
+
+        :return: A tuple containing the time of each page and the counters.
+        :rtype: tuple[dict[str, float], dict[str, int]]
+        """
+        measures = self.types, dict(self.counters)
+        self.types = {}
+        self.counters = collections.Counter()
+        return measures
+
+    def merge(self, measures):
+        """Adds the measures taken by a worker process
+
+        :param tuple measures: The measures, as returned by :meth:`take`.
+        """
+        types, counters = measures
+        for name, seconds in types.items():
+            self.types[name] = self.types.get(name, 0) + seconds
+        with self.lock:
+            self.counters.update(counters)
+
+    def report(self):
+        """Gets the recorded measures, with pages sorted from slowest to fastest
+
+        :rtype: collections.OrderedDict
+        """
+        report = collections.OrderedDict()
+        report["total"] = time.perf_counter() - self.start
+        report["phases"] = self.phases
+        report["counters"] = collections.OrderedDict(sorted(self.counters.items()))
+        report["types"] = collections.OrderedDict(sorted(self.types.items(), key=lambda x: x[1], reverse=True))
+        return report
+
+    def save(self, path):
+        """Writes the report into a JSON file
+
+        :param str path: The path of the file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=1)
+
+
+@contextlib.contextmanager
+def profile_phase(name):
+    """Measures the time of a phase of the build, when profiling
+
+    :param str name: The name of the phase.
+    """
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.phases[name] = profiler.phases.get(name, 0) + time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def profile_type(filename):
+    """Measures the time taken to generate a type's page, when profiling
+
+    :param str filename: The path of the type's page, relative to the output.
+    """
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.types[filename] = profiler.types.get(filename, 0) + time.perf_counter() - start
+
+
+def count(name, amount=1):
+    """Increases one of the profiler's counters, when profiling
+
+    :param str name: The name of the counter.
+    :param int amount: The amount to add.
+    """
+    if profiler is not None:
+        with profiler.lock:
+            profiler.counters[name] += amount
+
+
+class FileSystemOutput:
+    """Writes the generated files into a folder
+
+    Each file is written at once into a temporary file, which then replaces the previous file,
+    so a file is never seen partially written.
+
+    :param str path: The folder where files are written.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def get_path(self, filename):
+        return os.path.join(self.path, filename)
+
+    def read(self, filename):
+        """Reads a file written by a previous build
+
+        :param str filename: The path of the file, relative to the output.
+        :return: The file's contents, or None if it doesn't exist.
+        :rtype: str
+        """
+        try:
+            with open(self.get_path(filename), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def exists(self, filename):
+        return os.path.exists(self.get_path(filename))
+
+    def write(self, filename, content):
+        """Writes a file, creating its folders if needed
+
+        :param str filename: The path of the file, relative to the output.
+        :param str content: The file's contents.
+        """
+        file_path = self.get_path(filename)
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content.encode("utf-8"))
+        os.replace(temp_path, file_path)
+
+    def remove(self, filename):
+        """Deletes a file, along with its folders if they are left empty
+
+        :param str filename: The path of the file, relative to the output.
+        """
+        file_path = self.get_path(filename)
+        log.debug("Removing %s", file_path)
+        try:
+            os.remove(file_path)
+            os.removedirs(os.path.dirname(file_path))
+        except OSError:
+            pass
+
+    def close(self):
+        pass
+
+
+class ArchiveOutput:
+    """Writes the generated files into a new zip or tar archive
+
+    The kind of archive depends on the file's extension, see :data:`archive_extensions`.
+    The archive is always created from scratch, so there's no previous build to read, and every page is generated.
+
+    :param str path: The path of the archive.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.names = set()
+        if path.endswith(".zip"):
+            import zipfile
+            self.archive = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
         else:
-            name = cs_type.Name
-        return "[{0}]({1}){2}".format(name, relative_path, suffix)
-    else:
-        r = requests.get('https://xref.docs.microsoft.com/query', params={"uid": cs_type.FullName})
-        data = json.loads(r.text)
-        if len(data) < 0:
-            log.warning("Couldn't find documentation reference for {0}.".format(cs_type.FullName))
-            return cs_type.FullName
-        return "[{0}]({1}){2}".format(data[0]['name'], data[0]['href'], suffix)
+            import tarfile
+            compression = next((v for k, v in archive_extensions.items() if path.endswith(k)), "")
+            self.archive = tarfile.open(path, "w:" + compression)
+
+    def read(self, filename):
+        return None
+
+    def exists(self, filename):
+        return filename in self.names
+
+    def write(self, filename, content):
+        name = filename.replace(os.sep, "/")
+        data = content.encode("utf-8")
+        self.names.add(filename)
+        if hasattr(self.archive, "writestr"):
+            self.archive.writestr(name, data)
+        else:
+            import io
+            import tarfile
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = time.time()
+            self.archive.addfile(info, io.BytesIO(data))
+
+    def remove(self, filename):
+        pass
+
+    def close(self):
+        self.archive.close()
+
+
+class MemoryOutput:
+    """Keeps the generated files in a dictionary, to use the generator from tests or other programs"""
+    def __init__(self):
+        self.files = collections.OrderedDict()
+
+    def read(self, filename):
+        return self.files.get(filename)
+
+    def exists(self, filename):
+        return filename in self.files
+
+    def write(self, filename, content):
+        self.files[filename] = content
+
+    def remove(self, filename):
+        self.files.pop(filename, None)
+
+    def close(self):
+        pass
+
+
+def create_output(path):
+    """Creates the output where generated files are written to
+
+    :param str path: The path of an archive, if it has one of :data:`archive_extensions`, or of a folder.
+    :rtype: FileSystemOutput or ArchiveOutput
+    """
+    if path.endswith(tuple(archive_extensions)):
+        return ArchiveOutput(path)
+    return FileSystemOutput(path)
+
+
+def get_output():
+    """Gets the output files are written to, which is the output folder unless set otherwise
+
+    :rtype: FileSystemOutput or ArchiveOutput or MemoryOutput
+    """
+    global output_sink
+    if output_sink is None:
+        output_sink = FileSystemOutput(output_dir)
+    return output_sink
+
+
+def create_session(connections):
+    """Creates a HTTP session for xref requests
+
+    The session keeps up to ``connections`` connections alive and retries failed requests.
+
+    :param int connections: The maximum number of concurrent connections.
+    :return: The configured session.
+    :rtype: requests.Session
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=connections, pool_maxsize=connections, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def request_external_link(full_name):
+    """Requests the documentation link for a type to the xref service
+
+    :param str full_name: The full name of the type.
+    :return: A tuple containing the name and url of the type's documentation, or ``(None, None)`` if not found.
+    :rtype: tuple[str, str]
+    :raises requests.RequestException: if the request failed.
+    """
+    global xref_session
+    if xref_session is None:
+        xref_session = create_session(xref_connections)
+    r = xref_session.get(xref_url, params={"uid": full_name})
+    r.raise_for_status()
+    data = json.loads(r.text)
+    if not data:
+        log.warning("Couldn't find documentation reference for {0}.".format(full_name))
+        return None, None
+    return data[0]['name'], data[0]['href']
+
+
+def get_external_link(full_name):
+    """Gets the documentation link for a type outside the local assembly
+
+    The link is looked for in the local xref index and in the cache first, if not found,
+    it is requested to the xref service. In offline mode, only cached links are used, regardless of their age.
+
+    :param str full_name: The full name of the type.
+    :return: A tuple containing the name and url of the type's documentation, or None if not found.
+    :rtype: tuple[str, str]
+    """
+    if xref_index is not None:
+        link = xref_index.get(full_name)
+        if link is not None:
+            count("xref_index_hits")
+            return link
+    if xref_cache is not None:
+        link = xref_cache.get(full_name, include_expired=offline)
+        if link is not None:
+            count("xref_cache_hits")
+            return None if link[1] is None else link
+    count("xref_cache_misses")
+    if offline:
+        log.debug("No cached documentation reference for %s.", full_name)
+        return None
+    import requests
+    count("xref_requests")
+    try:
+        link = request_external_link(full_name)
+    except requests.RequestException as e:
+        log.warning("Couldn't request documentation reference for {0}: {1}".format(full_name, e))
+        if xref_cache is not None:
+            xref_cache.set(full_name, None, None, persist=False)
+        return None
+    if xref_cache is not None:
+        xref_cache.set(full_name, *link)
+    return None if link[1] is None else link
+
+
+def get_link_map(full_names):
+    """Gets the documentation links that were resolved for several types, without looking them up again
+
+    Links must have been resolved first, see :func:`resolve_external_links`.
+
+    :param collections.Iterable[str] full_names: The full names of the types.
+    :return: The name and url of each type's documentation, or None if it has none.
+    :rtype: dict[str, tuple[str, str]]
+    """
+    links = {}
+    for full_name in full_names:
+        link = xref_index.get(full_name) if xref_index is not None else None
+        if link is None and xref_cache is not None:
+            link = xref_cache.get(full_name, include_expired=offline)
+        links[full_name] = None if link is None or link[1] is None else link
+    return links
+
+
+def resolve_external_links(full_names):
+    """Requests the documentation links of several types concurrently and stores them in the cache
+
+    Types in the local xref index or already cached are skipped. In offline mode, nothing is requested,
+    cached links are only loaded, regardless of their age.
+
+    :param collections.Iterable[str] full_names: The full names of the types to resolve.
+    """
+    full_names = set(full_names)
+    if xref_index is not None:
+        full_names.difference_update({x for x in full_names if xref_index.get(x) is not None})
+    if offline:
+        if xref_cache is not None:
+            for full_name in full_names:
+                xref_cache.get(full_name, include_expired=True)
+        return
+    pending = sorted(x for x in full_names if xref_cache is None or xref_cache.get(x) is None)
+    count("xref_requests", len(pending))
+    if not pending:
+        return
+    log.info("Resolving %d external links", len(pending))
+    import requests
+
+    def resolve(full_name):
+        try:
+            return full_name, request_external_link(full_name)
+        except requests.RequestException as e:
+            log.warning("Couldn't request documentation reference for {0}: {1}".format(full_name, e))
+            return full_name, None
+
+    with ThreadPoolExecutor(max_workers=xref_connections) as executor:
+        for full_name, link in executor.map(resolve, pending):
+            if xref_cache is None:
+                continue
+            if link is None:
+                xref_cache.set(full_name, None, None, persist=False)
+            else:
+                xref_cache.set(full_name, *link)
+
+
+def collect_crefs(documentation, crefs):
+    """Adds the names of the types referenced in the 'see' tags of some documentation to a set
+
+    References to properties, fields and events add the type containing them.
+
+    :param dict documentation: The documentation, by tag, as returned by :func:`iter_documentation`.
+    :param set[str] crefs: The set where the full names of the types are added.
+    """
+    for value in documentation.values():
+        if isinstance(value, dict):
+            collect_crefs(value, crefs)
+            continue
+        for reference in value:
+            if isinstance(reference, str):
+                continue
+            member_type, full_name = reference
+            if member_type == "T":
+                crefs.add(full_name)
+            elif member_type in ("P", "F", "E"):
+                parts = split_doc_id(full_name)
+                if parts is not None:
+                    crefs.add(parts[0]+"."+parts[1])
+
+
+def collect_references(resolver, type_docs):
+    """Gets the full names of all the types referenced by the documented types
+
+    This includes base types, the types of public members' signatures and types referenced in 'see' tags.
+
+    :param TypeResolver resolver: The resolver of the local assembly.
+    :param collections.Iterable[TypeDoc] type_docs: The documentation of the types.
+    :return: The names of the local types, as in :attr:`TypeResolver.types`, and the full names of the external types.
+    :rtype: tuple[set[str], set[str]]
+    """
+    binding_flags = resolver.binding_flags
+    flags = binding_flags.Public | binding_flags.Instance | binding_flags.Static | binding_flags.DeclaredOnly
+    types = []
+    crefs = set()
+    for type_doc in type_docs:
+        collect_crefs(type_doc.documentation, crefs)
+        for member_doc in type_doc.children.values():
+            collect_crefs(member_doc.documentation, crefs)
+        member_type = resolver.types.get(type_doc.full_name)
+        if member_type is None:
+            continue
+        types.append(member_type.BaseType)
+        count("member_lookups", 5)
+        for constructor in member_type.GetConstructors(flags):
+            types.extend(x.ParameterType for x in constructor.GetParameters())
+        for method in member_type.GetMethods(flags):
+            types.append(method.ReturnType)
+            types.extend(x.ParameterType for x in method.GetParameters())
+        types.extend(x.FieldType for x in member_type.GetFields(flags))
+        types.extend(x.PropertyType for x in member_type.GetProperties(flags))
+        types.extend(x.EventHandlerType for x in member_type.GetEvents(flags))
+
+    local = set()
+    external = set()
+    for cs_type in types:
+        if cs_type is None:
+            continue
+        if cs_type.IsArray:
+            cs_type = cs_type.GetElementType()
+        if cs_type.FullName is None:
+            continue
+        if resolver.is_local(cs_type):
+            local.add(cs_type.FullName.replace("+", "."))
+        else:
+            external.add(cs_type.FullName)
+    for full_name in crefs:
+        if full_name in resolver.types:
+            local.add(full_name)
+        else:
+            external.add(full_name)
+    return local, external
 
 
 def build_table(headers, rows):
@@ -119,76 +1452,138 @@ def build_table(headers, rows):
     :return: The table in markdown syntax
     :rtype: str
     """
-    output = "\n| {0} |\n".format(' | '.join(headers))
-    output += "| {0} |\n".format(' | '.join(['---']*len(headers)))
-    for row in rows:
-        output += "| {0} |\n".format(' | '.join(row))
-    return output+'\n'
+    lines = ["", "| {0} |".format(' | '.join(headers)), "| {0} |".format(' | '.join(['---']*len(headers)))]
+    lines.extend("| {0} |".format(' | '.join(get_table_cell(x) for x in row)) for row in rows)
+    lines.append("\n")
+    return "\n".join(lines)
+
+
+def get_table_cell(text):
+    """Converts markdown into a form that fits in a table cell, where a line break would end the row
+
+    Code blocks are written as one inline code span per line, and line breaks are replaced by ``<br>`` tags.
+
+    :param str text: The markdown text.
+    :rtype: str
+    """
+    if "\n" not in text:
+        return text
+
+    def inline_code(match):
+        lines = [x for x in match.group(1).split("\n") if x.strip()]
+        return "<br>".join(("`` {0} ``" if "`" in x else "`{0}`").format(x) for x in lines)
+
+    return code_block_pattern.sub(inline_code, text).replace("\n", "<br>")
+
+
+def get_anchor(title):
+    """Gets the anchor of a header in the generated html, the same way mkdocs does
+
+    :param str title: The header's text.
+    :rtype: str
+    """
+    title = anchor_strip_pattern.sub("", title).strip().lower()
+    return anchor_separator_pattern.sub("-", title)
+
+
+def get_unique_anchor(title, anchors):
+    """Gets the anchor of a header, with a numbered suffix if a previous header has the same one, like mkdocs does
+
+    :param str title: The header's text.
+    :param collections.Container[str] anchors: The anchors of the previous headers in the page.
+    :rtype: str
+    """
+    anchor = unique_anchor = get_anchor(title)
+    suffix = 0
+    while unique_anchor in anchors:
+        suffix += 1
+        unique_anchor = "{}_{}".format(anchor, suffix)
+    return unique_anchor
+
+
+def get_member_title(member_type, kind, name, member):
+    """Gets the header of a member in its type's page
+
+    :param Type member_type: The C# type containing the member.
+    :param str kind: The kind of member: 'C', 'M', 'F', 'P' or 'E'.
+    :param str name: The name of the member in the documentation hierarchy.
+    :param MemberInfo member: The C# member.
+    :rtype: str
+    """
+    if kind == "C":
+        return "{0}({1})".format(member_type.Name, ",".join([str(x.ParameterType) for x in member.GetParameters()]))
+    if kind == "M" and "(" not in name:
+        # If method doesn't have parameters, we add empty parenthesis to the name
+        return name + "()"
+    return name
+
+
+def get_plain_text(content):
+    """Converts the contents of a XML tag into plain text, without markdown or links
+
+    :param content: The contents of the xml tag, as returned by :func:`render_documentation`
+    :rtype: str
+    """
+    if not content:
+        return ""
+    if not isinstance(content, str):
+        # References are replaced by the name of the type or member
+        content = "".join(x if isinstance(x, str) else x[1].split("(")[0].rpartition(".")[2] for x in content)
+    content = markdown_link_pattern.sub(r"\1", content).replace("`", "").replace("**", "")
+    return whitespace_pattern.sub(" ", html.unescape(content)).strip()
 
 
 def get_type_name(cs_type):
     """Gets a C# type's short name (without namespace)
 
-    The types are first looked up in an aliases dictionary.
+    The types are first looked up in the aliases dictionary.
     If an alias is found, the alias is returned, otherwise, the name is returned.
 
     :param Type cs_type: The C# type
     :return: The name or alias of the Type
     :rtype: str
     """
-    aliases = {
-        "System.String": "string",
-        "System.SByte": "sbyte",
-        "System.Byte": "byte",
-        "System.Int16": "short",
-        "System.UInt16": "ushort",
-        "System.Int32": "int",
-        "System.UInt32": "uint",
-        "System.Int64": "long",
-        "System.UInt64": "ulong",
-        "System.Char": "char",
-        "System.Single": "float",
-        "System.Double": "double",
-        "System.Boolean": "bool",
-        "System.Decimal": "decimal",
-        "System.Void": "void"
-    }
-    return aliases.get(cs_type.FullName, cs_type.Name)
+    return type_aliases.get(cs_type.FullName, cs_type.Name)
 
 
-def parse_content(assembly, content, current_file):
-    """ Parses the content of a XML tag, converting inner XML tags into markdown format.
+def parse_content(resolver, content, current_file):
+    """ Converts the content of a XML tag into markdown, resolving references into links.
 
-    'see' tags are converted into links
-    'c' tags are converted into inline code
+    The content's text is already in markdown format (see :func:`render_documentation`),
+    references to types, fields, properties and events are converted into links,
+    other references are converted into inline code.
 
-    :param assembly: The string's assembly's context
-    :param content: The contents of the xml tag
+    :param resolver: The resolver of the string's assembly
+    :param content: The contents of the xml tag, as returned by :func:`render_documentation`
     :param current_file: The current file location
     :return: The string with markdown format
     """
-    def parse_see_tag(m):
-        member_type = m.group(1)
-        full_name = m.group(2)
+    if not content:
+        return ""
+    if isinstance(content, str):
+        return content
+    output = []
+    for segment in content:
+        if isinstance(segment, str):
+            output.append(segment)
+            continue
+        member_type, full_name = segment
         if member_type == "T":
-            return get_link(assembly, type_name=full_name, current_file=current_file)
-        if member_type == "P" or member_type == "F" or member_type == "E":
-            m = field_property_pattern.search(full_name)
-            namespace = m.group("namespace")
-            in_class = m.group("class")
-            name = m.group("name")
-            return get_link(assembly, type_name=namespace+"."+in_class, current_file=current_file, anchor=name)
+            output.append(resolver.get_link(type_name=full_name, current_file=current_file))
+            continue
+        parts = split_doc_id(full_name) if member_type == "P" or member_type == "F" or member_type == "E" else None
+        if parts is not None:
+            namespace, in_class, name, _ = parts
+            output.append(resolver.get_link(type_name=namespace+"."+in_class, current_file=current_file, anchor=name))
         else:
-            return "`{0}`".format(m.group(2))
-
-    content = see_pattern.sub(lambda match: parse_see_tag(match), content)
-    content = c_pattern.sub("`\g<1>`", content)
-    return content
+            output.append("`{0}`".format(full_name))
+    return "".join(output)
 
 
-def parse_constructor(member_type: Type, name, documentation, file_path):
+def parse_constructor(resolver, member_type, name, documentation, file_path):
     """Generates markdown content for an object's constructor
 
+    :param TypeResolver resolver: The resolver of the member's assembly.
     :param Type member_type: The C# type of the member containing the constructor
     :param str name: The name of the field
     :param dict[str, Any] documentation: A dictionary containing the XML documentation.
@@ -196,144 +1591,140 @@ def parse_constructor(member_type: Type, name, documentation, file_path):
     :return: A string containing the constructor's formatted documentation
     :rtype: str
     """
-    assembly = member_type.Assembly
-    # Get a list of the parameter types
-    params = get_params(name)
-    # Get the actual C# types of parameters
-    param_types = [get_type(assembly, x) for x in params]
-    constructor = member_type.GetConstructor(param_types)
+    constructor = resolver.get_member(member_type, "C", name)
     if constructor is None:
-        log.warning("Constructor '{0}' not found in assembly.", name.replace('.', '#'))
+        log.warning("Constructor '{0}' not found in assembly.".format(name.replace('.', '#')))
         return ""
 
     parameters = constructor.GetParameters()
     # Get a string list containing the parameter's type and name.
     params_declaration = ", ".join(["{0} {1}".format(get_type_name(x.ParameterType), x.Name) for x in parameters])
     # Show a level 3 header with the method's name
-    content = '### {0}({1})\n'.format(member_type.Name, ",".join([str(x.ParameterType) for x in parameters]))
+    content = ['### {0}\n'.format(get_member_title(member_type, "C", name, constructor))]
     # Show the constructor's summary if available
     if "summary" in documentation:
-        content += "{}  \n".format(parse_content(assembly, documentation['summary'], file_path))
+        content.append("{}  \n".format(parse_content(resolver, documentation['summary'], file_path)))
     # Show the constructor's declaration
     declaration = "**Declaration**\n" \
                   "```csharp\n" \
                   "public {}({});\n" \
                   "```\n".format(member_type.Name, params_declaration)
-    content += declaration
+    content.append(declaration)
     # Show the constructor's remarks if available
     if "remarks" in documentation:
-        content += "**Remarks**  \n"
-        content += "{}  \n".format(parse_content(assembly, documentation['remarks'], file_path))
+        content.append("**Remarks**  \n")
+        content.append("{}  \n".format(parse_content(resolver, documentation['remarks'], file_path)))
     # If the constructor has parameters, show a table with their type, name and description
     if len(parameters) > 0 and "param" in documentation:
-        content += "**Parameters**\n"
+        content.append("**Parameters**\n")
         param_documentation = documentation.get('param', collections.OrderedDict())
         headers = ["Type", "Name", "Description"]
         rows = []
         for param in parameters:
-            description = parse_content(assembly, param_documentation.get(param.Name, ""), file_path)
-            param_link = get_link(assembly, cs_type=param.ParameterType, current_file=file_path)
+            description = parse_content(resolver, param_documentation.get(param.Name, ""), file_path)
+            param_link = resolver.get_link(cs_type=param.ParameterType, current_file=file_path)
             rows.append([param_link, param.Name, description])
-        content += build_table(headers, rows)
-    return content
+        content.append(build_table(headers, rows))
+    return "".join(content)
 
 
-def parse_field(member_type, name, documentation, file_path):
+def parse_field(resolver, member_type, name, documentation, file_path):
     """Generates markdown content for an object's field
 
+    :param TypeResolver resolver: The resolver of the member's assembly.
     :param Type member_type: The C# type of the member containing the field
     :param str name: The name of the field
     :param Dict documentation: A dictionary containing the XML documentation.
     :param file_path: The file path of the markdown file containing the member.
     :return: A string containing the field's formatted documentation
     """
-    assembly = member_type.Assembly
-    field = member_type.GetField(name)
+    field = resolver.get_member(member_type, "F", name)
     if field is None:
         log.warning("Field '{}' not found in assembly.".format(name))
         return ""
 
     field_type = field.FieldType
-    type_link = get_link(assembly, cs_type=field_type, current_file=file_path)
+    type_link = resolver.get_link(cs_type=field_type, current_file=file_path)
     # Show a level 3 header with the field's name
-    content = '### {}\n'.format(name)
+    content = ['### {}\n'.format(name)]
     # Show the field's summary if available
     if "summary" in documentation:
-        content += "{}  \n".format(parse_content(assembly, documentation['summary'], file_path))
+        content.append("{}  \n".format(parse_content(resolver, documentation['summary'], file_path)))
     # Show the field's declaration
     declaration = "**Declaration**\n" \
                   "```csharp\n" \
                   "public {0} {1};\n" \
                   "```\n".format(get_type_name(field_type), name)
-    content += declaration
+    content.append(declaration)
     # Show the field's remarks if available
     if "remarks" in documentation:
-        content += "**Remarks**  \n"
-        content += "{}  \n".format(parse_content(assembly, documentation['remarks'], file_path))
+        content.append("**Remarks**  \n")
+        content.append("{}  \n".format(parse_content(resolver, documentation['remarks'], file_path)))
     # Show a table containing the field's type and value
-    content += "**Field Value**\n"
-    field_value = parse_content(assembly, documentation.get("value", ""), file_path)
+    content.append("**Field Value**\n")
+    field_value = parse_content(resolver, documentation.get("value", ""), file_path)
     table = build_table(["Type", "Description"], [[type_link, field_value]])
-    content += table
-    return content
+    content.append(table)
+    return "".join(content)
 
 
-def parse_property(member_type, name, documentation, file_path):
+def parse_property(resolver, member_type, name, documentation, file_path):
     """Generates markdown content for an object's property
 
+    :param TypeResolver resolver: The resolver of the member's assembly.
     :param Type member_type: The C# type of the member containing the field
     :param str name: The name of the field
     :param Dict documentation: A dictionary containing the XML documentation.
     :param file_path: The file path of the markdown file containing the member.
     :return: A string containing the property's formatted documentation
     """
-    assembly = member_type.Assembly
-    cs_property = member_type.GetProperty(name)
+    cs_property = resolver.get_member(member_type, "P", name)
     if cs_property is None:
         log.warning("Property '{}' not found in assembly.".format(name))
         return ""
 
     property_type = cs_property.PropertyType
-    type_link = get_link(assembly, cs_type=property_type, current_file=file_path)
+    type_link = resolver.get_link(cs_type=property_type, current_file=file_path)
     getter = "" if cs_property.GetGetMethod(False) is None else "get; "
     setter = "" if cs_property.GetSetMethod(False) is None else "set; "
     # Show a level 3 header with the property's name
-    content = "### {}\n".format(name)
+    content = ["### {}\n".format(name)]
     # Show the field's summary if available
     if "summary" in documentation:
-        content += "{}  \n".format(parse_content(assembly, documentation['summary'], file_path))
+        content.append("{}  \n".format(parse_content(resolver, documentation['summary'], file_path)))
     # Show the property's declaration
     declaration = "**Declaration**\n" \
                   "```csharp\n" \
                   "public {0} {1} {{{2}{3}}}\n" \
                   "```\n".format(get_type_name(property_type), name, getter, setter)
-    content += declaration
+    content.append(declaration)
     # Show the property's remarks if available
     if "remarks" in documentation:
-        content += "**Remarks**  \n"
-        content += "{}  \n".format(parse_content(assembly, documentation['remarks'], file_path))
+        content.append("**Remarks**  \n")
+        content.append("{}  \n".format(parse_content(resolver, documentation['remarks'], file_path)))
     # Show a table containing the property's type and value
-    content += "**Property Value**\n"
-    property_value = parse_content(assembly, documentation.get("value", ""), file_path)
+    content.append("**Property Value**\n")
+    property_value = parse_content(resolver, documentation.get("value", ""), file_path)
     table = build_table(["Type", "Description"], [[type_link, property_value]])
-    content += table
-    return content
+    content.append(table)
+    return "".join(content)
 
 
-def parse_delegate(delegate, documentation, file_path):
+def parse_delegate(resolver, delegate, documentation, file_path):
     """Generates markdown content for an object's method
 
+    :param TypeResolver resolver: The resolver of the delegate's assembly.
     :param Type delegate: The C# type of the member containing the method
     :param Dict documentation: A dictionary containing the XML documentation.
     :param file_path: The file path of the markdown file containing the member.
     :return: A string containing the delegate's formatted documentation
     """
-    assembly = delegate.Assembly
     name = delegate.Name
+    count("member_lookups")
     method = delegate.GetMethod('Invoke')
     # If method doesn't have parameters, we add empty parenthesis to the name
     if delegate is None or method is None:
-        log.warning("Delegate '{}' not found in assembly.").format(name)
+        log.warning("Delegate '{}' not found in assembly.".format(name))
         return ""
 
     return_type = method.ReturnType
@@ -341,55 +1732,49 @@ def parse_delegate(delegate, documentation, file_path):
     # Get a string list containing the parameter's type and name.
     params_declaration = " ,".join(["{} {}".format(get_type_name(x.ParameterType), x.Name) for x in parameters])
     # Show the method's declaration
-    content = "**\nDeclaration**\n" \
-              "```csharp\n" \
-              "public delegate {} {}({})\n" \
-              "```\n".format(get_type_name(return_type), name, params_declaration)
+    content = ["**\nDeclaration**\n"
+               "```csharp\n"
+               "public delegate {} {}({})\n"
+               "```\n".format(get_type_name(return_type), name, params_declaration)]
     # Show the method's remarks if available
     if "remarks" in documentation:
-        content += "**Remarks**  \n"
-        content += "{}  \n".format(parse_content(assembly, documentation['remarks'], file_path))
+        content.append("**Remarks**  \n")
+        content.append("{}  \n".format(parse_content(resolver, documentation['remarks'], file_path)))
     # If method has parameters, show a table with their type, name and description
     if len(parameters) > 0 and "param" in documentation:
-        content += "**Parameters**\n"
+        content.append("**Parameters**\n")
         param_documentation = documentation.get('param', collections.OrderedDict())
         headers = ["Type", "Name", "Description"]
         rows = []
         for param in parameters:
-            description = parse_content(assembly, param_documentation.get(param.Name, ""), file_path)
-            param_link = get_link(assembly, cs_type=param.ParameterType, current_file=file_path)
+            description = parse_content(resolver, param_documentation.get(param.Name, ""), file_path)
+            param_link = resolver.get_link(cs_type=param.ParameterType, current_file=file_path)
             rows.append([param_link, param.Name, description])
-        content += build_table(headers, rows)
+        content.append(build_table(headers, rows))
     # Show table with the returned value, type and description, unless the type is Void.
     if return_type.Name != "Void":
-        content += "**Returns**\n"
-        description = parse_content(assembly, documentation.get("returns", ""), file_path)
-        type_link = get_link(assembly, cs_type=method.ReturnType, current_file=file_path)
+        content.append("**Returns**\n")
+        description = parse_content(resolver, documentation.get("returns", ""), file_path)
+        type_link = resolver.get_link(cs_type=method.ReturnType, current_file=file_path)
         table = build_table(["Type", "Description"], [[type_link, description]])
-        content += table
-    return content
+        content.append(table)
+    return "".join(content)
 
 
-def parse_method(member_type, name, documentation, file_path):
+def parse_method(resolver, member_type, name, documentation, file_path):
     """Generates markdown content for an object's method
 
+    :param TypeResolver resolver: The resolver of the member's assembly.
     :param Type member_type: The C# type of the member containing the method
     :param str name: The name of the field
     :param Dict documentation: A dictionary containing the XML documentation.
     :param file_path: The file path of the markdown file containing the member.
     :return: A string containing the method's formatted documentation
     """
-    assembly = member_type.Assembly
     # Remove any parenthesis from the name if found
     method_name = name.split("(")[0]
-    # Get a list of the parameter types
-    params = get_params(name)
-    # Get the actual C# types of parameters
-    param_types = [get_type(assembly, x) for x in params]
-    method = member_type.GetMethod(method_name, param_types)
-    # If method doesn't have parameters, we add empty parenthesis to the name
-    if len(params) == 0:
-        name += "()"
+    method = resolver.get_member(member_type, "M", name)
+    name = get_member_title(member_type, "M", name, method)
     if method is None:
         log.warning("Method '{}' not found in assembly.".format(name))
         return ""
@@ -408,51 +1793,51 @@ def parse_method(member_type, name, documentation, file_path):
     # Get a string list containing the parameter's type and name.
     params_declaration = " ,".join(["{} {}".format(get_type_name(x.ParameterType), x.Name) for x in parameters])
     # Show a level 3 header with the method's name
-    content = "### {}\n".format(name)
+    content = ["### {}\n".format(name)]
     # Show the method's summary if available
     if "summary" in documentation:
-        content += "{}  \n".format(parse_content(assembly, documentation['summary'], file_path))
+        content.append("{}  \n".format(parse_content(resolver, documentation['summary'], file_path)))
     # Show the method's declaration
-    content += "**Declaration**\n" \
-               "```csharp\n" \
-               "{0} {1} {2}({3})\n" \
-               "```\n".format(method_modifiers, get_type_name(return_type), method_name, params_declaration)
+    content.append("**Declaration**\n"
+                   "```csharp\n"
+                   "{0} {1} {2}({3})\n"
+                   "```\n".format(method_modifiers, get_type_name(return_type), method_name, params_declaration))
     # Show the method's remarks if available
     if "remarks" in documentation:
-        content += "**Remarks**  \n"
-        content += "{}  \n".format(parse_content(assembly, documentation['remarks'], file_path))
+        content.append("**Remarks**  \n")
+        content.append("{}  \n".format(parse_content(resolver, documentation['remarks'], file_path)))
     # If method has parameters, show a table with their type, name and description
     if len(parameters) > 0 and "param" in documentation:
-        content += "**Parameters**\n"
+        content.append("**Parameters**\n")
         param_documentation = documentation.get('param', collections.OrderedDict())
         headers = ["Type", "Name", "Description"]
         rows = []
         for param in parameters:
-            description = parse_content(assembly, param_documentation.get(param.Name, ""), file_path)
-            param_link = get_link(assembly, cs_type=param.ParameterType, current_file=file_path)
+            description = parse_content(resolver, param_documentation.get(param.Name, ""), file_path)
+            param_link = resolver.get_link(cs_type=param.ParameterType, current_file=file_path)
             rows.append([param_link, param.Name, description])
-        content += build_table(headers, rows)
+        content.append(build_table(headers, rows))
     # Show table with the returned value, type and description, unless the type is Void.
     if return_type.Name != "Void":
-        content += "**Returns**\n"
-        description = parse_content(assembly, documentation.get("returns", ""), file_path)
-        type_link = get_link(assembly, cs_type=method.ReturnType, current_file=file_path)
+        content.append("**Returns**\n")
+        description = parse_content(resolver, documentation.get("returns", ""), file_path)
+        type_link = resolver.get_link(cs_type=method.ReturnType, current_file=file_path)
         table = build_table(["Type", "Description"], [[type_link, description]])
-        content += table
-    return content
+        content.append(table)
+    return "".join(content)
 
 
-def parse_event(member_type, name, documentation, file_path):
+def parse_event(resolver, member_type, name, documentation, file_path):
     """Generates markdown content for an object's method
 
+    :param TypeResolver resolver: The resolver of the member's assembly.
     :param Type member_type: The C# type of the member containing the event
     :param str name: The name of the event
     :param Dict documentation: A dictionary containing the XML documentation.
     :param file_path: The file path of the markdown file containing the member.
     :return: A string containing the event's formatted documentation
     """
-    assembly = member_type.Assembly
-    event = member_type.GetEvent(name)
+    event = resolver.get_member(member_type, "E", name)
     # If method doesn't have parameters, we add empty parenthesis to the name
     if event is None:
         log.warning("Event '{}' not found in assembly.".format(name))
@@ -460,204 +1845,1660 @@ def parse_event(member_type, name, documentation, file_path):
 
     handler_type = event.EventHandlerType
     # Show a level 3 header with the method's name
-    content = '### {}\n'.format(name)
+    content = ['### {}\n'.format(name)]
     # Show the method's summary if available
     if "summary" in documentation:
-        content += "{}  \n".format(parse_content(assembly, documentation['summary'], file_path))
+        content.append("{}  \n".format(parse_content(resolver, documentation['summary'], file_path)))
     # Show the method's declaration
-    content += "**Declaration**\n" \
-               "```csharp\n" \
-               "public event {} {}\n" \
-               "```\n".format(get_type_name(handler_type), event.Name)
+    content.append("**Declaration**\n"
+                   "```csharp\n"
+                   "public event {} {}\n"
+                   "```\n".format(get_type_name(handler_type), event.Name))
     # Show the method's remarks if available
     if "remarks" in documentation:
-        content += "**Remarks**  \n"
-        content += "{}  \n".format(parse_content(assembly, documentation['remarks'], file_path))
+        content.append("**Remarks**  \n")
+        content.append("{}  \n".format(parse_content(resolver, documentation['remarks'], file_path)))
     # Show table with the handler type and description, unless the type is Void.
     if handler_type.Name != "Void":
-        content += "**Event Handler**  \n"
-        content += get_link(assembly, cs_type=handler_type, current_file=file_path)
+        content.append("**Event Handler**  \n")
+        content.append(resolver.get_link(cs_type=handler_type, current_file=file_path))
+    return "".join(content)
+
+
+def render_documentation(element):
+    """Converts the contents of a XML documentation tag into markdown
+
+    The element tree is walked once, converting text and inner tags ('c', 'code', 'para', 'paramref',
+    'typeparamref', 'list' and 'see') into markdown directly.
+    Since the links of 'see' tags depend on the file they are shown in, they are kept as ``(member_type, full_name)``
+    tuples, to be resolved by :func:`parse_content`.
+
+    :param ElementTree.Element element: The documentation tag, e.g. 'summary'.
+    :return: The markdown text, or a list of markdown strings and references if the content has references.
+    :rtype: str or list
+    """
+    content = []
+    # Whether the last thing written was a paragraph break, so leading whitespace is dropped
+    after_break = False
+
+    def write(text):
+        nonlocal after_break
+        after_break = False
+        if content and isinstance(content[-1], str):
+            content[-1] += text
+        else:
+            content.append(text)
+
+    def write_reference(member_type, full_name):
+        nonlocal after_break
+        after_break = False
+        content.append((member_type, full_name))
+
+    def write_break():
+        nonlocal after_break
+        if content and isinstance(content[-1], str):
+            content[-1] = content[-1].rstrip()
+        write("\n\n")
+        after_break = True
+
+    def write_text(text):
+        if not text:
+            return
+        text = whitespace_pattern.sub(" ", text)
+        if after_break:
+            text = text.lstrip()
+            if not text:
+                return
+        write(html.escape(text, quote=False))
+
+    def write_children(parent):
+        write_text(parent.text)
+        for child in parent:
+            write_element(child)
+            write_text(child.tail)
+
+    def write_element(child):
+        tag = child.tag
+        if tag == "see" or tag == "seealso":
+            cref = child.get("cref")
+            if cref is not None:
+                member_type, _, full_name = cref.rpartition(":")
+                write_reference(member_type, full_name)
+            elif child.get("langword") is not None:
+                write("`{0}`".format(child.get("langword")))
+            elif child.get("href") is not None:
+                text = whitespace_pattern.sub(" ", "".join(child.itertext())).strip()
+                write("[{0}]({1})".format(text or child.get("href"), child.get("href")))
+            else:
+                write_children(child)
+        elif tag == "c":
+            write("`{0}`".format(whitespace_pattern.sub(" ", "".join(child.itertext())).strip()))
+        elif tag == "code":
+            code = "".join(child.itertext())
+            if "\n" not in code:
+                write("`{0}`".format(code.strip()))
+                return
+            code = textwrap.dedent(code.strip("\n")).rstrip()
+            write_break()
+            write("```csharp\n{0}\n```".format(code))
+            write_break()
+        elif tag == "paramref" or tag == "typeparamref":
+            write("`{0}`".format(child.get("name")))
+        elif tag == "para":
+            write_break()
+            write_children(child)
+            write_break()
+        elif tag == "list":
+            write_list(child)
+        elif tag == "b":
+            write("**")
+            write_children(child)
+            write("**")
+        elif tag == "i":
+            write("*")
+            write_children(child)
+            write("*")
+        else:
+            write_children(child)
+
+    def write_list(element):
+        list_type = element.get("type", "bullet")
+        write_break()
+        number = 1
+        for item in element:
+            if item.tag not in ("item", "listheader"):
+                continue
+            term = item.find("term")
+            description = item.find("description")
+            if list_type == "table":
+                write("| ")
+                if term is not None:
+                    write_children(term)
+                    write(" | ")
+                write_children(item if description is None else description)
+                write(" |\n")
+                if item.tag == "listheader":
+                    write("| {0} |\n".format(" | ".join(["---"] * (2 if term is not None else 1))))
+                continue
+            if item.tag == "listheader":
+                continue
+            if list_type == "number":
+                write("{0}. ".format(number))
+                number += 1
+            else:
+                write("- ")
+            if term is not None:
+                write("**")
+                write_children(term)
+                write("**")
+                if description is not None:
+                    write(" - ")
+            if description is not None:
+                write_children(description)
+            elif term is None:
+                write_children(item)
+            write("\n")
+        write_break()
+
+    write_children(element)
+    # Remove leading and trailing whitespace
+    if content and isinstance(content[0], str):
+        content[0] = content[0].lstrip()
+    if content and isinstance(content[-1], str):
+        content[-1] = content[-1].rstrip()
+    content = [x for x in content if x != ""]
+    if not content:
+        return ""
+    if len(content) == 1 and isinstance(content[0], str):
+        return content[0]
     return content
 
 
-def parse_documentation(path):
-    log.info("Parsing documentation")
-    tree = ElementTree.parse(path)
-    hierarchy = collections.OrderedDict()
-    root = tree.getroot()
-    # Explore the XML file to get a structured hierarchy for the project
-    for member_item in root.find('members'):
-        member_type, full_name = member_item.attrib['name'].split(":")
-        documentation = collections.OrderedDict()
+class MemberDoc:
+    """The documentation of a type's member
+
+    :param str name: The name of the member, including its parameters' types for methods and constructors.
+    :param str member_type: The kind of member: 'C', 'M', 'F', 'P' or 'E'.
+    :param dict documentation: The member's documentation, by tag, as returned by :func:`iter_documentation`.
+    """
+    __slots__ = ("name", "type", "documentation")
+
+    def __init__(self, name, member_type, documentation):
+        self.name = sys.intern(name)
+        self.type = member_type
+        self.documentation = documentation
+
+    def as_dict(self):
+        return {"documentation": self.documentation, "type": self.type}
+
+
+class TypeDoc:
+    """The documentation of a type and its members
+
+    :param str namespace: The namespace of the type.
+    :param str name: The name of the type, where nested types are separated by a dot.
+    :param dict documentation: The type's documentation, by tag, as returned by :func:`iter_documentation`.
+    """
+    __slots__ = ("namespace", "name", "documentation", "children")
+    type = "T"
+
+    def __init__(self, namespace, name, documentation):
+        self.namespace = sys.intern(namespace)
+        self.name = sys.intern(name)
+        self.documentation = documentation
+        self.children = collections.OrderedDict()
+
+    @property
+    def full_name(self):
+        return "{}.{}".format(self.namespace, self.name)
+
+    def as_dict(self):
+        children = collections.OrderedDict((name, member.as_dict()) for name, member in self.children.items())
+        return {"children": children, "documentation": self.documentation, "type": self.type}
+
+
+class Namespace:
+    """A namespace and the documentation of its types
+
+    :param str name: The name of the namespace.
+    """
+    __slots__ = ("name", "types")
+
+    def __init__(self, name):
+        self.name = sys.intern(name)
+        self.types = collections.OrderedDict()
+
+    def as_dict(self):
+        return collections.OrderedDict((name, cs_type.as_dict()) for name, cs_type in self.types.items())
+
+
+def iter_documentation(path):
+    """Iterates the members of a XML documentation file as they are read
+
+    The file is parsed incrementally and each member element is discarded once it has been read,
+    so memory usage stays the same regardless of the file's size.
+
+    :param str path: The path to the XML documentation file.
+    :return: A generator of tuples containing the member's type (T, C, F, P, M or E), namespace, containing class
+             (None for types), name and documentation.
+    :rtype: collections.Iterator[tuple[str, str, str, str, dict]]
+    """
+    members = None
+    for event, member_item in ElementTree.iterparse(path, events=("start", "end")):
+        if event == "start":
+            if member_item.tag == "members":
+                members = member_item
+            continue
+        if member_item.tag != "member" or members is None:
+            continue
+        member_type, full_name = member_item.attrib['name'].split(":", 1)
+        documentation = {}
         for child in member_item:
-            pattern = r"<(?:\w+:)?%(tag)s(?:[^>]*)>(.*)</(?:\w+:)?%(tag)s" % {"tag": child.tag}
-            try:
-                content = re.findall(pattern, ElementTree.tostring(child).decode('utf-8'), re.DOTALL)[0].strip()
-            except IndexError:
-                content = ""
-            if child.tag == "param":
-                if child.tag not in documentation:
-                    documentation[child.tag] = collections.OrderedDict()
-                documentation[child.tag][child.get("name")] = content
+            content = render_documentation(child)
+            tag = sys.intern(child.tag)
+            if tag == "param":
+                if tag not in documentation:
+                    documentation[tag] = collections.OrderedDict()
+                documentation[tag][sys.intern(child.get("name"))] = content
             else:
-                documentation[child.tag] = content
+                documentation[tag] = content
+        # The element is no longer needed, so it's removed from the tree to free memory
+        members.clear()
         if member_type == "T":
-            m = class_pattern.search(full_name)
-            if m:
-                namespace = m.group("namespace")
-                name = m.group("name")
-                in_class = None
-                log.debug("Type found: %s", name)
-            else:
+            parts = split_doc_id(full_name, 2)
+            if parts is None:
                 continue
+            namespace, name, _ = parts
+            in_class = None
+            log.debug("Type found: %s", name)
         else:
-            m = method_pattern.search(full_name)
-            if not m:
-                m = field_property_pattern.search(full_name)
-                if not m:
-                    continue
-            namespace = m.group("namespace")
-            in_class = m.group("class")
-            name = m.group("name")
+            parts = split_doc_id(full_name)
+            if parts is None:
+                continue
+            namespace, in_class, name, _ = parts
             log.debug("Member found: %s", name)
-            if "#ctor" in name:
-                name = name.replace("#ctor", '.ctor')
+            if name.startswith("#ctor"):
+                name = ".ctor" + name[len("#ctor"):]
                 member_type = 'C'
+        yield member_type, namespace, in_class, name, documentation
 
-        if namespace not in hierarchy:
-            hierarchy[namespace] = collections.OrderedDict()
-        if member_type == "T":
-            if name not in hierarchy[namespace]:
-                hierarchy[namespace][name] = {"children": collections.OrderedDict(), "documentation": documentation, 'type': member_type}
-        else:
-            hierarchy[namespace][in_class]["children"][name] = {"documentation": documentation, 'type': member_type}
 
-    os.makedirs(output_dir, exist_ok=True)
+def parse_documentation(path, dump=True):
+    """Parses a XML documentation file into a hierarchy of namespaces, types and members
+
+    :param str path: The path to the XML documentation file.
+    :param bool dump: Whether to write the hierarchy into ``hierarchy.json`` if enabled by :data:`hierarchy_dump`.
+    :return: The documentation hierarchy, a dictionary of namespaces by name, sorted by name.
+    :rtype: collections.OrderedDict[str, Namespace]
+    """
+    log.info("Parsing documentation")
+    hierarchy = collections.OrderedDict()
+    with profile_phase("parse_documentation"):
+        # Explore the XML file to get a structured hierarchy for the project
+        for member_type, namespace, in_class, name, documentation in iter_documentation(path):
+            if namespace not in hierarchy:
+                hierarchy[namespace] = Namespace(namespace)
+            types = hierarchy[namespace].types
+            if member_type == "T":
+                if name not in types:
+                    types[name] = TypeDoc(namespace, name, documentation)
+            else:
+                types[in_class].children[name] = MemberDoc(name, member_type, documentation)
 
-    hierarchy = collections.OrderedDict(sorted(hierarchy.items()))
+        hierarchy = collections.OrderedDict(sorted(hierarchy.items()))
 
-    # Generate a json file, for debugging purposes
-    with open(os.path.join(output_dir, "hierarchy.json"), 'w') as outfile:
-        json.dump(hierarchy, outfile, indent=4)
-        log.debug("Generated hierarchy file on: %s", outfile.name)
+    if dump and hierarchy_dump:
+        dump_hierarchy(hierarchy)
 
     return hierarchy
 
 
-def build_documentation(dll_path, hierarchy):
-    log.info("Building documentation")
-    dll_file = FileInfo(dll_path)
-    assembly = Assembly.LoadFile(dll_file.FullName)
-    # Iterate through all namespaces
-    # Each namespace is a folder, each class is a file
-    # Also builds a YAML index
-    index = []
-    for namespace, members in hierarchy.items():
-        index_files = []
-        for member, content in members.items():
-            filename = "{}.md".format((namespace+'/'+member).replace('.','/'))
-            file_path = os.path.join(output_dir, filename)
-            # Ensure intermediary directories exist
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, "w") as file:
-                log.debug("Building %s", file.name)
-                index_files.append({member: filename})
-                member_type = assembly.GetType("{}.{}".format(namespace, member))
-                object_type = "Class"
-                if member_type is None:
-                    member_type = assembly.GetType("{}+{}".format(namespace, member))
-                    object_type = "Delegate"
-                if member_type.IsEnum:
-                    object_type = "Enum"
-                # Check if member inherits other members:
-                base_type = member_type.BaseType
-                if base_type is not None:
-                    file.write("**Inherits**  \n{}\n".format(get_link(assembly, cs_type=base_type, current_file=file_path)))
-                file.write("# {} {}\n".format(object_type, member))
-                file.write("{}\n".format(parse_content(assembly, content.get('documentation',collections.OrderedDict()).get('summary'), current_file=file_path)))
-                _temp = collections.OrderedDict()
-                # Enums are represented differently
-                if object_type == "Enum":
-                    rows = []
-                    for field, subcontent in content["children"].items():
-                        documentation = subcontent["documentation"]
-                        rows.append([field, documentation.get("summary", "")])
-                    enum_table = build_table(["Field", "Description"], rows)
-                    file.write(enum_table)
-                    continue
-                if object_type == "Delegate":
-                    file.write(parse_delegate(member_type, content.get('documentation', collections.OrderedDict()), file_path))
+def dump_hierarchy(hierarchy):
+    """Writes the documentation hierarchy into a compact json file, for debugging purposes
+
+    :param dict[str, Namespace] hierarchy: The documentation hierarchy.
+    """
+    data = collections.OrderedDict((name, namespace.as_dict()) for name, namespace in hierarchy.items())
+    get_output().write("hierarchy.json", json.dumps(data, separators=(",", ":")))
+    log.debug("Generated hierarchy file")
+
+
+def merge_hierarchies(hierarchies):
+    """Merges the documentation hierarchies of several assemblies into one
+
+    Namespaces found in more than one assembly contain the types of all of them.
+
+    :param list[dict] hierarchies: The hierarchies to merge, as returned by :func:`parse_documentation`.
+    :return: The merged hierarchy, with namespaces sorted by name.
+    :rtype: collections.OrderedDict[str, Namespace]
+    """
+    merged = collections.OrderedDict()
+    for hierarchy in hierarchies:
+        for name, namespace in hierarchy.items():
+            if name not in merged:
+                merged[name] = Namespace(name)
+            merged[name].types.update(namespace.types)
+    return collections.OrderedDict(sorted(merged.items()))
+
+
+def load_batch(path):
+    """Reads a batch manifest, listing the assemblies to document together
+
+    The manifest is a YAML (or JSON) list, where each entry is either the path of a dll file,
+    whose XML documentation file is next to it with the same name, or a mapping with the ``dll`` and ``xml`` paths.
+    Relative paths are relative to the manifest's folder.
+
+    :param str path: The path of the manifest.
+    :return: A list of tuples with the dll and XML paths of each assembly.
+    :rtype: list[tuple[str, str]]
+    :raises click.BadParameter: if the manifest is not valid.
+    """
+    import yaml
+    with open(path) as f:
+        entries = yaml.safe_load(f)
+    if not isinstance(entries, list) or not entries:
+        raise click.BadParameter("The batch manifest must be a non-empty list of assemblies")
+    base_dir = os.path.dirname(os.path.abspath(path))
+    assemblies = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"dll": entry}
+        if not isinstance(entry, dict) or "dll" not in entry:
+            raise click.BadParameter("Invalid entry in batch manifest: {}".format(entry))
+        dll_path = os.path.join(base_dir, entry["dll"])
+        xml_path = os.path.join(base_dir, entry.get("xml") or os.path.splitext(entry["dll"])[0] + ".xml")
+        for file_path in (dll_path, xml_path):
+            if not os.path.isfile(file_path):
+                raise click.BadParameter("File in batch manifest doesn't exist: {}".format(file_path))
+        assemblies.append((dll_path, xml_path))
+    return assemblies
+
+
+def build_batch(assemblies, jobs=1, force=False, only=(), namespaces=(), dependents=False):
+    """Generates the documentation of several assemblies together
+
+    All the assemblies are loaded at once, so types of any of them are linked locally,
+    and their documentation is merged into a single index. External links are only resolved once for the batch.
+
+    :param list[tuple[str, str]] assemblies: The dll and XML paths of each assembly, as returned by :func:`load_batch`.
+    :param int jobs: The number of processes used to generate pages.
+    :param bool force: Whether to generate every page, ignoring the previous build's manifest.
+    :param collections.Iterable[str] only: Full names of the only types to generate.
+    :param collections.Iterable[str] namespaces: Namespaces of the only types to generate.
+    :param bool dependents: Whether to generate the pages linking to the selected types too.
+    """
+    dll_paths = [dll_path for dll_path, _ in assemblies]
+    resolver, hierarchy = load_documentation(dll_paths, [xml_path for _, xml_path in assemblies])
+    build_documentation(dll_paths, hierarchy, jobs, force, resolver=resolver, only=only, namespaces=namespaces,
+                        dependents=dependents)
+
+
+def load_assembly(dll_path, reload=False):
+    """Loads an assembly from a dll file
+
+    With the "metadata" backend, the assembly's metadata is read from the file instead,
+    and the .NET runtime is never loaded.
+
+    :param str dll_path: The path to the dll file.
+    :param bool reload: Whether to load the file's current contents, even if it was loaded before.
+    :return: The loaded C# Assembly object.
+    :rtype: Assembly
+    """
+    with profile_phase("load_assembly"):
+        if backend == "metadata":
+            return dotnetmetadata.load(dll_path)
+        # noinspection PyUnresolvedReferences,PyPackageRequirements
+        import clr
+        # noinspection PyUnresolvedReferences
+        from System.IO import File, FileInfo
+        # noinspection PyUnresolvedReferences
+        from System.Reflection import Assembly
+        dll_file = FileInfo(dll_path)
+        if reload:
+            # LoadFile returns the assembly already loaded from the same path, so it's loaded from its bytes instead
+            return Assembly.Load(File.ReadAllBytes(dll_file.FullName))
+        return Assembly.LoadFile(dll_file.FullName)
+
+
+def load_documentation(dll_paths, xml_paths):
+    """Loads assemblies and parses their XML documentation files at the same time
+
+    The XML files are parsed in a background thread while the assemblies are loaded.
+    The documentation of several assemblies is merged into a single hierarchy.
+
+    :param list[str] dll_paths: The paths to the dll files.
+    :param list[str] xml_paths: The paths to the XML documentation files.
+    :return: The resolver of the assemblies and the documentation hierarchy.
+    :rtype: tuple[TypeResolver, collections.OrderedDict[str, Namespace]]
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        hierarchies = executor.submit(lambda: [parse_documentation(x, dump=False) for x in xml_paths])
+        resolver = TypeResolver(*[load_assembly(x) for x in dll_paths])
+        hierarchies = hierarchies.result()
+    hierarchy = hierarchies[0] if len(hierarchies) == 1 else merge_hierarchies(hierarchies)
+    if hierarchy_dump:
+        dump_hierarchy(hierarchy)
+    return resolver, hierarchy
+
+
+def get_file_hash(path):
+    """Gets a hash of a file's contents
+
+    :param str path: The path to the file.
+    :return: The hexadecimal digest of the hash.
+    :rtype: str
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_model_sources(dll_path, xml_path):
+    """Identifies the files a documentation model is compiled from
+
+    Since reflection is different with each backend, the backend is included too.
+
+    :param str dll_path: The path to the dll file.
+    :param str xml_path: The path to the XML documentation file.
+    :return: The backend, and the hashes of the dll and the XML files.
+    :rtype: list[str]
+    """
+    return [backend, get_file_hash(dll_path), get_file_hash(xml_path)]
+
+
+def get_member_attributes(member):
+    """Gets the modifiers of a reflected member, as :class:`dotnetmetadata.MethodAttributes` flags
+
+    :param MemberInfo member: The C# member, or None.
+    :return: The flags, or None if there's no member.
+    :rtype: int
+    """
+    if member is None:
+        return None
+    attributes = 0
+    for name in ("Public", "Private", "Static", "Final", "Virtual", "Abstract"):
+        if getattr(member, "Is" + name, False):
+            attributes |= dotnetmetadata.MethodAttributes[name]
+    return int(attributes)
+
+
+def compile_model(resolver, hierarchy, sources):
+    """Compiles the documentation of an assembly into a model its pages can be generated from without it
+
+    Along with the documentation hierarchy, the model has everything pages take from reflection:
+    the documented types' base types, signatures and public members, with their modifiers, parameters and types,
+    and the types referenced by name in the documentation. The external links of the referenced types are resolved
+    and kept too. Types are stored once, in a list, and referenced by their index.
+    The model is made of built-in types only, so it doesn't depend on the classes of this module.
+
+    :param TypeResolver resolver: The resolver of the assembly.
+    :param dict[str, Namespace] hierarchy: The documentation hierarchy, as returned by :func:`parse_documentation`.
+    :param list[str] sources: The files the model is compiled from, as returned by :func:`get_model_sources`.
+    :return: The model.
+    :rtype: dict
+    """
+    types = []
+    type_ids = {}
+
+    def add_type(cs_type):
+        if cs_type is None:
+            return None
+        key = (cs_type.FullName, cs_type.Name, str(cs_type))
+        if key not in type_ids:
+            type_ids[key] = len(types)
+            types.append(None)
+            element_type = add_type(cs_type.GetElementType()) if cs_type.IsArray else None
+            types[type_ids[key]] = (cs_type.Name, cs_type.Namespace, cs_type.FullName, str(cs_type),
+                                    bool(cs_type.IsArray), element_type, bool(cs_type.IsEnum), bool(cs_type.IsNested))
+        return type_ids[key]
+
+    def add_parameters(parameters):
+        return [(x.Name, add_type(x.ParameterType)) for x in parameters]
+
+    def add_member(kind, member):
+        if kind == "F":
+            return kind, member.Name, get_member_attributes(member), add_type(member.FieldType)
+        if kind == "P":
+            return (kind, member.Name, add_type(member.PropertyType), add_parameters(member.GetIndexParameters()),
+                    get_member_attributes(member.GetGetMethod(False)),
+                    get_member_attributes(member.GetSetMethod(False)))
+        if kind == "E":
+            return (kind, member.Name, add_type(member.EventHandlerType),
+                    get_member_attributes(member.GetAddMethod(False)))
+        # Constructors have no return type
+        return (kind, member.Name, get_member_attributes(member), add_type(getattr(member, "ReturnType", None)),
+                add_parameters(member.GetParameters()))
+
+    with profile_phase("compile_model"):
+        local = [add_type(x) for x in resolver.types.values()]
+        documented = {}
+        crefs = set()
+        for namespace in hierarchy.values():
+            for type_doc in namespace.types.values():
+                collect_crefs(type_doc.documentation, crefs)
+                for member_doc in type_doc.children.values():
+                    collect_crefs(member_doc.documentation, crefs)
+                cs_type = resolver.types.get(type_doc.full_name)
+                if cs_type is None:
                     continue
-                for name, subcontent in content['children'].items():
-                    if "documentation" not in subcontent:
+                members = [(doc_id, add_member(kind, member))
+                           for (kind, doc_id), member in resolver.get_members(cs_type).items()]
+                invoke = cs_type.GetMethod("Invoke") if cs_type.IsNested else None
+                documented[add_type(cs_type)] = (add_type(cs_type.BaseType), resolver.get_signature(cs_type), members,
+                                                 None if invoke is None else add_member("M", invoke))
+        referenced = {x: add_type(resolver.get_type(x)) for x in sorted(crefs) if x not in resolver.types}
+        external = sorted({x[2] for x in types if x[2] is not None and not x[4] and x[2] not in resolver.paths})
+    resolve_external_links(external)
+    links = {}
+    for full_name in external:
+        link = get_external_link(full_name)
+        if link is not None:
+            links[full_name] = link
+    hierarchy_data = [(namespace.name, [(type_doc.name, type_doc.documentation,
+                                         [(x.name, x.type, x.documentation) for x in type_doc.children.values()])
+                                        for type_doc in namespace.types.values()])
+                      for namespace in hierarchy.values()]
+    return {"version": model_version, "sources": sources, "hierarchy": hierarchy_data, "types": types, "local": local,
+            "documented": documented, "referenced": referenced, "links": links}
+
+
+class ModelUnpickler(pickle.Unpickler):
+    """Reads compiled models, which only contain built-in types, without running code from anywhere else"""
+    def find_class(self, module, name):
+        if module == "collections" and name == "OrderedDict":
+            return collections.OrderedDict
+        raise pickle.UnpicklingError("{}.{} can't be in a model".format(module, name))
+
+
+def save_model(path, model):
+    """Saves a compiled documentation model into a file
+
+    :param str path: The path of the file.
+    :param dict model: The model, as returned by :func:`compile_model`.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def read_model(path):
+    """Reads a compiled documentation model from a file
+
+    :param str path: The path of the file.
+    :return: The model, or None if the file doesn't exist, is not a model, or is a model of another version.
+    :rtype: dict
+    """
+    try:
+        with open(path, "rb") as f:
+            model = ModelUnpickler(f).load()
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+    if not isinstance(model, dict) or model.get("version") != model_version:
+        return None
+    return model
+
+
+def load_model(model):
+    """Loads the documentation of an assembly from a compiled model, without the assembly or its XML file
+
+    The external links in the model are added to the links cache.
+
+    :param dict model: The model, as returned by :func:`compile_model`.
+    :return: The resolver of the model's types and the documentation hierarchy.
+    :rtype: tuple[TypeResolver, collections.OrderedDict[str, Namespace]]
+    """
+    with profile_phase("load_model"):
+        hierarchy = collections.OrderedDict()
+        for namespace_name, type_records in model["hierarchy"]:
+            namespace = hierarchy[namespace_name] = Namespace(namespace_name)
+            for type_name, documentation, member_records in type_records:
+                type_doc = namespace.types[type_name] = TypeDoc(namespace_name, type_name, documentation)
+                for name, member_type, member_documentation in member_records:
+                    type_doc.children[name] = MemberDoc(name, member_type, member_documentation)
+        assembly = ModelAssembly(model)
+    resolver = TypeResolver(assembly)
+    # Signatures and members were reflected when compiling the model
+    resolver.signatures.update(assembly.signatures)
+    resolver.member_indexes.update(assembly.member_indexes)
+    if xref_cache is not None:
+        xref_cache.entries.update(model["links"])
+    if hierarchy_dump:
+        dump_hierarchy(hierarchy)
+    return resolver, hierarchy
+
+
+def load_compiled_documentation(dll_path, xml_path, model_path):
+    """Loads the documentation of an assembly from a compiled model, if it was compiled from the same files
+
+    Otherwise, the assembly is loaded and its XML file is parsed as usual, and the model is compiled and saved,
+    so following builds of the same files don't have to.
+
+    :param str dll_path: The path to the dll file.
+    :param str xml_path: The path to the XML documentation file.
+    :param str model_path: The path of the compiled model.
+    :return: The resolver, the documentation hierarchy, and whether they were loaded from the model.
+    :rtype: tuple[TypeResolver, collections.OrderedDict[str, Namespace], bool]
+    """
+    sources = get_model_sources(dll_path, xml_path)
+    model = read_model(model_path)
+    if model is not None and model["sources"] == sources:
+        log.info("Loading the compiled model")
+        resolver, hierarchy = load_model(model)
+        return resolver, hierarchy, True
+    resolver, hierarchy = load_documentation([dll_path], [xml_path])
+    save_model(model_path, compile_model(resolver, hierarchy, sources))
+    log.info("Saved the compiled model")
+    return resolver, hierarchy, False
+
+
+def get_filename(namespace, member):
+    """Gets the path of a type's markdown file
+
+    :param str namespace: The namespace of the type.
+    :param str member: The name of the type.
+    :return: The path of the file, relative to the output directory.
+    :rtype: str
+    """
+    return "{}.md".format((namespace+'/'+member).replace('.','/'))
+
+
+def get_page_hash(signature, type_doc, links):
+    """Gets a hash of everything a type's page is generated from
+
+    This includes the type's documentation, its reflected signature, the external links it uses,
+    and the version of the renderer.
+
+    :param list[str] signature: The type's signature, as returned by :meth:`TypeResolver.get_signature`.
+    :param TypeDoc type_doc: The type's documentation.
+    :param dict links: The external links used by the page, as returned by :func:`get_link_map`.
+    :return: The hexadecimal digest of the hash.
+    :rtype: str
+    """
+    data = json.dumps([renderer_version, type_doc.as_dict(), signature, links], sort_keys=True)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def load_manifest():
+    """Loads the build manifest of the previous build in the output
+
+    :return: The manifest's contents, or an empty dictionary if there is no valid manifest.
+    :rtype: dict
+    """
+    try:
+        manifest = json.loads(get_output().read("manifest.json") or "")
+    except ValueError:
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != manifest_version:
+        return {}
+    return manifest
+
+
+# The sections of a type's page by the kind of member they contain, in order, with the function rendering each member
+member_sections = collections.OrderedDict([
+    ("C", ("Constructors", parse_constructor)),
+    ("F", ("Fields", parse_field)),
+    ("P", ("Properties", parse_property)),
+    ("M", ("Methods", parse_method)),
+    ("E", ("Events", parse_event)),
+])
+
+
+def build_page(resolver, type_doc):
+    """Generates the markdown content of a type's page
+
+    :param TypeResolver resolver: The resolver of the type's assembly.
+    :param TypeDoc type_doc: The type's documentation.
+    :return: The content of the page.
+    :rtype: str
+    """
+    file_path = os.path.join(output_dir, get_filename(type_doc.namespace, type_doc.name))
+    log.debug("Building %s", file_path)
+    page = []
+    member_type = resolver.types[type_doc.full_name]
+    object_type = "Class"
+    if member_type.IsNested:
+        object_type = "Delegate"
+    if member_type.IsEnum:
+        object_type = "Enum"
+    # Check if member inherits other members:
+    base_type = member_type.BaseType
+    if base_type is not None:
+        page.append("**Inherits**  \n{}\n".format(resolver.get_link(cs_type=base_type, current_file=file_path)))
+    page.append("# {} {}\n".format(object_type, type_doc.name))
+    page.append("{}\n".format(parse_content(resolver, type_doc.documentation.get('summary'), current_file=file_path)))
+    # Enums are represented differently
+    if object_type == "Enum":
+        rows = []
+        for member_doc in type_doc.children.values():
+            rows.append([member_doc.name,
+                         parse_content(resolver, member_doc.documentation.get("summary", ""), file_path)])
+        enum_table = build_table(["Field", "Description"], rows)
+        page.append(enum_table)
+        return "".join(page)
+    if object_type == "Delegate":
+        page.append(parse_delegate(resolver, member_type, type_doc.documentation, file_path))
+        return "".join(page)
+    sections = {x: [] for x in member_sections}
+    for member_doc in type_doc.children.values():
+        if member_doc.type not in member_sections:
+            continue
+        parse_member = member_sections[member_doc.type][1]
+        sections[member_doc.type].append(parse_member(resolver, member_type, member_doc.name, member_doc.documentation,
+                                                      file_path))
+    for kind, (title, _) in member_sections.items():
+        if sections[kind]:
+            page.append("## {}\n----\n".format(title))
+            page.append("\n".join(sections[kind]))
+    return "".join(page)
+
+
+def get_search_entries(resolver, type_doc):
+    """Gets the search entries of a type's page
+
+    The page has an entry with the type's summary, and every member shown in the page has an entry with its summary,
+    linking to its header. Anchors are those of the headers written by :func:`build_page`.
+
+    :param TypeResolver resolver: The resolver of the type's assembly.
+    :param TypeDoc type_doc: The type's documentation.
+    :return: The text of the page's entry, and the title, anchor and text of each member's entry.
+    :rtype: dict
+    """
+    entries = {"text": get_plain_text(type_doc.documentation.get("summary")), "sections": []}
+    member_type = resolver.types[type_doc.full_name]
+    # Enum fields and delegates don't have headers of their own
+    if member_type.IsEnum or member_type.IsNested:
+        return entries
+    anchors = {get_anchor("Class " + type_doc.name)}
+    for kind, (section_title, _) in member_sections.items():
+        member_docs = [x for x in type_doc.children.values() if x.type == kind]
+        if member_docs:
+            anchors.add(get_unique_anchor(section_title, anchors))
+        for member_doc in member_docs:
+            member = resolver.get_member(member_type, kind, member_doc.name)
+            if member is None:
+                continue
+            title = get_member_title(member_type, kind, member_doc.name, member)
+            anchor = get_unique_anchor(title, anchors)
+            anchors.add(anchor)
+            entries["sections"].append({"title": code_span_pattern.sub(lambda x: x.group(2).strip(), title),
+                                        "anchor": anchor,
+                                        "text": get_plain_text(member_doc.documentation.get("summary"))})
+    return entries
+
+
+def update_search_index(resolver, hierarchy, pages, previous):
+    """Gets the search entries of every page, for the mkdocs hook in markdowndotnet_search.py
+
+    The entries of each page are saved with its hash in the manifest, so they're only built again if the page changed.
+    Entries of pages that are no longer in the output are dropped.
+
+    :param TypeResolver resolver: The resolver of the types' assemblies.
+    :param dict[str, Namespace] hierarchy: The documentation hierarchy, as returned by :func:`parse_documentation`.
+    :param dict[str, str] pages: The hash of every page in the output, by its path, as saved in the manifest.
+    :param str previous: The contents of the previous search entries file, if any.
+    :return: The contents of the search entries file.
+    :rtype: dict
+    """
+    try:
+        previous_entries = json.loads(previous or "").get("pages")
+    except (ValueError, AttributeError):
+        previous_entries = None
+    if not isinstance(previous_entries, dict):
+        previous_entries = {}
+    entries = collections.OrderedDict()
+    for namespace in hierarchy.values():
+        for type_doc in namespace.types.values():
+            filename = get_filename(namespace.name, type_doc.name)
+            if filename not in pages:
+                continue
+            page_entries = previous_entries.get(filename)
+            if not isinstance(page_entries, dict) or page_entries.get("hash") != pages[filename]:
+                page_entries = get_search_entries(resolver, type_doc)
+                page_entries["hash"] = pages[filename]
+            entries[filename] = page_entries
+    # Selective builds keep the pages of types that are no longer documented
+    for filename in pages:
+        if filename not in entries and filename in previous_entries:
+            entries[filename] = previous_entries[filename]
+    return {"pages": entries}
+
+
+def init_worker(dll_paths, settings):
+    """Prepares a worker process for a parallel build
+
+    The worker's settings are copied from the main process and its assemblies are loaded only once.
+
+    :param list[str] dll_paths: The paths to the dll files.
+    :param dict settings: The main process' settings, as returned by :func:`get_settings`.
+    """
+    global worker_resolver, xref_cache, xref_index, profiler
+    apply_settings(settings)
+    if settings["profile"]:
+        profiler = Profiler()
+    if settings["xref_index"] is not None:
+        xref_index = XrefIndex(settings["xref_index"])
+        atexit.register(xref_index.close)
+    # Links are resolved by the main process and sent with each page, so workers keep their cache in memory only
+    xref_cache = XrefCache(":memory:", 0)
+    worker_resolver = TypeResolver(*[load_assembly(x) for x in dll_paths])
+
+
+def build_page_worker(task):
+    """Generates the markdown content of a type's page in a worker process
+
+    Pages are returned to the main process, which writes them to the output.
+
+    :param tuple[TypeDoc, dict] task: The documentation of the type, and the external links it uses,
+        as returned by :func:`resolve_pages`.
+    :return: The path of the page, relative to the output, its content, and the measures taken while generating it
+             (see :meth:`Profiler.take`), or None if not profiling.
+    :rtype: tuple[str, str, tuple]
+    """
+    type_doc, links = task
+    xref_cache.entries.update(links)
+    filename = get_filename(type_doc.namespace, type_doc.name)
+    with profile_type(filename):
+        page = build_page(worker_resolver, type_doc)
+    return filename, page, profiler.take() if profiler is not None else None
+
+
+def resolve_pages(resolver, type_docs):
+    """Resolves the external links used by the pages of several types
+
+    :param TypeResolver resolver: The resolver of the types' assemblies.
+    :param list[TypeDoc] type_docs: The documentation of the types.
+    :return: A list of tuples containing each type's documentation, the cached external links its page uses,
+             so they can be sent to worker processes, and the other local types and the external types it references,
+             sorted by name.
+    :rtype: list[tuple[TypeDoc, dict[str, tuple[str, str]], list[str], list[str]]]
+    """
+    with profile_phase("resolve_external_links"):
+        references = [collect_references(resolver, [type_doc]) for type_doc in type_docs]
+        resolve_external_links(set().union(*[external for _, external in references]))
+        entries = xref_cache.entries if xref_cache is not None else {}
+        return [(type_doc, {x: entries[x] for x in external if x in entries}, sorted(local - {type_doc.full_name}),
+                 sorted(external))
+                for type_doc, (local, external) in zip(type_docs, references)]
+
+
+def iter_stage(function, items, size):
+    """Applies a function to each item in a background thread, yielding the results in order
+
+    At most ``size`` results are kept waiting to be consumed, so a stage doesn't get too far ahead of the next one.
+    Exceptions are raised in place of the result they interrupted. The thread stops if the results stop being consumed.
+
+    :param function: The function applied to each item.
+    :param collections.Iterable items: The items.
+    :param int size: The maximum number of results waiting to be consumed.
+    :return: A generator of the results.
+    """
+    results = queue.Queue(size)
+    stopped = threading.Event()
+    done = object()
+
+    def put(value):
+        while not stopped.is_set():
+            try:
+                results.put(value, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def produce():
+        try:
+            for item in items:
+                if stopped.is_set():
+                    return
+                put((function(item), None))
+        except BaseException as e:
+            put((None, e))
+        put(done)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            value = results.get()
+            if value is done:
+                return
+            result, error = value
+            if error is not None:
+                raise error
+            yield result
+    finally:
+        stopped.set()
+        thread.join()
+
+
+@contextlib.contextmanager
+def background_writer(write, size):
+    """Writes files in a background thread
+
+    Yields a function taking the same arguments as ``write``, which queues the file to be written.
+    At most ``size`` files are kept waiting, so the files are not all held in memory if writing is slower.
+    Errors while writing are raised by the following call, or when exiting.
+
+    :param write: The function writing a file.
+    :param int size: The maximum number of files waiting to be written.
+    """
+    pending = queue.Queue(size)
+    errors = []
+
+    def consume():
+        while True:
+            args = pending.get()
+            if args is None:
+                return
+            # After an error, remaining files are discarded, so the producer is never blocked
+            if errors:
+                continue
+            try:
+                write(*args)
+            except BaseException as e:
+                errors.append(e)
+
+    def put(*args):
+        if errors:
+            raise errors[0]
+        pending.put(args)
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    try:
+        yield put
+    finally:
+        pending.put(None)
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def get_settings():
+    """Gets the current settings, so they can be passed to worker processes
+
+    :rtype: dict
+    """
+    return {"output_dir": output_dir, "offline": offline, "xref_url": xref_url,
+            "xref_connections": xref_connections, "backend": backend, "log_level": log.level,
+            "profile": profiler is not None, "xref_index": xref_index.path if xref_index is not None else None}
+
+
+def apply_settings(settings):
+    """Applies settings obtained from :func:`get_settings`
+
+    :param dict settings: The settings to apply.
+    """
+    global output_dir, offline, xref_url, xref_connections, backend
+    output_dir = settings["output_dir"]
+    offline = settings["offline"]
+    xref_url = settings["xref_url"]
+    xref_connections = settings["xref_connections"]
+    backend = settings["backend"]
+    log.setLevel(settings["log_level"])
+
+
+def select_types(hierarchy, names=(), namespaces=()):
+    """Gets the documentation of the types selected by name or by namespace
+
+    :param dict[str, Namespace] hierarchy: The documentation hierarchy, as returned by :func:`parse_documentation`.
+    :param collections.Iterable[str] names: Full names of types, with nested types separated by dots.
+    :param collections.Iterable[str] namespaces: Namespaces whose types are selected, including those of the
+        namespaces and types nested in them.
+    :return: The documentation of the selected types, in the order of the hierarchy.
+    :rtype: list[TypeDoc]
+    :raises click.BadParameter: if a type or namespace is not in the documentation.
+    """
+    names = set(names)
+    namespaces = set(namespaces)
+    selected = []
+    found = set()
+    for namespace in hierarchy.values():
+        parents = [x for x in namespaces if namespace.name == x or namespace.name.startswith(x + ".")]
+        found.update(parents)
+        for type_doc in namespace.types.values():
+            if parents or type_doc.full_name in names:
+                selected.append(type_doc)
+                found.add(type_doc.full_name)
+    missing = sorted(names.union(namespaces).difference(found))
+    if missing:
+        raise click.BadParameter("Not found in the documentation: {}".format(", ".join(missing)))
+    return selected
+
+
+class LinkChecker:
+    """Checks that the relative links of generated pages lead to existing pages and headers
+
+    Each page is scanned once as it's generated, keeping the titles of its headers and its links, along with the member
+    they're shown in. Once every page is generated, the relative links are checked with set lookups, each distinct
+    target only once per folder. The anchors of a page, the same ones mkdocs generates, are only computed if it's
+    linked with one. Pages that weren't generated in the build are read from the output when linked.
+    """
+    def __init__(self):
+        self.titles = {}
+        self.anchors = {}
+        self.links = []
+
+    @staticmethod
+    def scan(content, source=None):
+        """Gets the titles of a page's headers, and its links by the member containing them
+
+        :param str content: The page's content.
+        :param str source: The full name of the page's type, None when only its titles are needed.
+        :return: The titles of the page's headers, and the full name of each member with the targets of its links.
+        :rtype: tuple[list[str], list[tuple[str, list[str]]]]
+        """
+        titles = []
+        links = []
+        member = source
+        # Splitting the page by its headers is much faster than looking for headers and links with a single pattern
+        for i, section in enumerate(("\n" + content).split("\n#")):
+            if i > 0:
+                end = section.find("\n")
+                line = section if end < 0 else section[:end]
+                title = line.lstrip("#")
+                if title.startswith(" "):
+                    title = title[1:]
+                    titles.append(title)
+                    # Members are level 3 headers, pages read from the output only need their titles
+                    if source is not None and len(line) - len(title) == 3:
+                        member = source + "." + title
+            targets = link_target_pattern.findall(section)
+            if targets:
+                links.append((member, targets))
+        return titles, links
+
+    def add_page(self, filename, content):
+        """Collects the headers and links of a generated page
+
+        :param str filename: The path of the page, relative to the output.
+        :param str content: The page's content.
+        """
+        self.titles[filename], links = self.scan(content, filename[:-len(".md")].replace("/", "."))
+        self.links.append((filename, links))
+
+    def get_anchors(self, filename, output):
+        """Gets the anchors of a page's headers
+
+        Duplicated anchors get a numbered suffix, like mkdocs does.
+
+        :param str filename: The path of the page, relative to the output.
+        :param output: The output of the pages, see :func:`get_output`.
+        :rtype: set[str]
+        """
+        if filename not in self.anchors:
+            titles = self.titles.get(filename)
+            if titles is None:
+                titles = self.scan(output.read(filename) or "")[0]
+            anchors = set()
+            for title in titles:
+                anchors.add(get_unique_anchor(title, anchors))
+            self.anchors[filename] = anchors
+        return self.anchors[filename]
+
+    def is_valid(self, filename, target, pages, output):
+        """Checks if a link leads to an existing page and header
+
+        Links with a scheme, like those to external documentation, are always valid.
+
+        :param str filename: The path of the page containing the link, relative to the output.
+        :param str target: The link's target.
+        :param collections.Container[str] pages: The paths of every page in the output, relative to it.
+        :param output: The output of the pages, see :func:`get_output`.
+        :rtype: bool
+        """
+        if ":" in target:
+            return True
+        path, _, anchor = target.partition("#")
+        page = posixpath.normpath(posixpath.join(posixpath.dirname(filename), path)) if path else filename
+        return page in pages and (not anchor or anchor in self.get_anchors(page, output))
+
+    def check(self, pages, output):
+        """Finds the links leading to pages or headers that don't exist
+
+        :param collections.Container[str] pages: The paths of every page in the output, relative to it.
+        :param output: The output of the pages, see :func:`get_output`.
+        :return: The dangling links, with the full name of the member they're shown in, and their target.
+        :rtype: list[tuple[str, str]]
+        """
+        dangling = []
+        checked = 0
+        valid = {}
+        for filename, links in self.links:
+            folder = posixpath.dirname(filename)
+            for member, targets in links:
+                checked += len(targets)
+                for target in targets:
+                    # Links are the same from every page in a folder, unless they're within the page
+                    key = (folder, target) if target[:1] != "#" else (filename, target)
+                    if key not in valid:
+                        valid[key] = self.is_valid(filename, target, pages, output)
+                    if not valid[key]:
+                        dangling.append((member, target))
+        count("links_checked", checked)
+        count("dangling_links", len(dangling))
+        return dangling
+
+
+def build_documentation(dll_path, hierarchy, jobs=1, force=False, resolver=None, only=(), namespaces=(),
+                        dependents=False):
+    """Generates the markdown files of every type in the hierarchy, and the YAML index
+
+    A manifest with a hash of each type's documentation and signature is saved along with the index,
+    so following builds only generate the pages of types that changed, and remove those of types that no longer exist.
+    If the assembly's set of types changes, every page is generated again, since links may have changed.
+
+    Pages go through a pipeline: the external links of the following pages are resolved in a background thread
+    while pages are generated, and generated pages are written in another one, so the first pages are written
+    without waiting for every link, and only a bounded number of pages are held in memory.
+    With more than one job, pages are generated by a pool of worker processes, each one loading the assembly.
+    The output is the same regardless of the number of jobs.
+    When profiling, the time taken by each page and the workers' counters are added to the main process' profiler.
+    The relative links of the generated pages are checked, and those leading to missing pages or headers are reported,
+    see :class:`LinkChecker`.
+    If enabled, the search entries of the pages are written too, see :func:`update_search_index`.
+
+    The build can be limited to some types or namespaces, in which case only their pages are generated, along with
+    the pages linking to them if ``dependents`` is set. Only those types are reflected and have their links resolved.
+    The index, the manifest and the search entries keep the entries of the other pages, and no page is removed.
+    The local types each page links to are saved in the manifest, so the pages linking to a type are found
+    without reflecting every type.
+
+    :param dll_path: The path to the dll file, a list of paths when documenting several assemblies together,
+        or None if the resolver was built from the XML file alone.
+    :param dict[str, Namespace] hierarchy: The documentation hierarchy, as returned by :func:`parse_documentation`.
+    :param int jobs: The number of processes used to generate pages.
+    :param bool force: Whether to generate every page, ignoring the previous build's manifest.
+    :param TypeResolver resolver: The resolver of the already loaded assembly, if any.
+    :param collections.Iterable[str] only: Full names of the only types to generate, see :func:`select_types`.
+    :param collections.Iterable[str] namespaces: Namespaces of the only types to generate.
+    :param bool dependents: Whether to generate the pages linking to the selected types too.
+    """
+    log.info("Building documentation")
+    output = get_output()
+
+    def write(filename, content):
+        output.write(filename, content)
+        if profiler is not None:
+            count("bytes_written", len(content.encode("utf-8")))
+
+    if resolver is None:
+        resolver = TypeResolver(load_assembly(dll_path))
+    selective = bool(only or namespaces)
+    with profile_phase("find_changes"):
+        # The other pages are kept in a selective build, so the manifest is still needed
+        manifest = {} if force and not selective else load_manifest()
+        types_hash = hashlib.sha1("\n".join(sorted(resolver.types)).encode("utf-8")).hexdigest()
+        previous_pages = manifest.get("pages", {}) if manifest.get("types") == types_hash else {}
+        previous_references = manifest.get("references", {}) if manifest.get("types") == types_hash else {}
+        previous_externals = manifest.get("externals", {}) if manifest.get("types") == types_hash else {}
+        if selective:
+            selection = select_types(hierarchy, only, namespaces)
+            selected = {get_filename(x.namespace, x.name) for x in selection}
+            selected_names = {x.full_name for x in selection}
+        # Each namespace is a folder, each class is a file
+        pages = collections.OrderedDict()
+        references = {}
+        externals = {}
+        candidates = []
+        for namespace in hierarchy.values():
+            for type_doc in namespace.types.values():
+                filename = get_filename(namespace.name, type_doc.name)
+                if selective and filename not in selected:
+                    linked_types = previous_references.get(filename)
+                    if dependents and linked_types is None:
+                        # Manifests of older builds don't have the types linked by each page
+                        linked_types = collect_references(resolver, [type_doc])[0]
+                    if not dependents or selected_names.isdisjoint(linked_types):
+                        if filename in previous_pages:
+                            pages[filename] = previous_pages[filename]
+                        if filename in previous_references:
+                            references[filename] = previous_references[filename]
+                        if filename in previous_externals:
+                            externals[filename] = previous_externals[filename]
                         continue
-                    documentation = subcontent["documentation"]
-                    if subcontent["type"] == "C":
-                        if "constructors" not in _temp:
-                            _temp['constructors'] = []
-                        _temp["constructors"].append(parse_constructor(member_type, name, documentation, file_path))
-
-                    if subcontent["type"] == "F":
-                        if "fields" not in _temp:
-                            _temp["fields"] = []
-                        _temp["fields"].append(parse_field(member_type, name, documentation, file_path))
-
-                    if subcontent["type"] == "P":
-                        if "properties" not in _temp:
-                            _temp["properties"] = []
-                        _temp["properties"].append(parse_property(member_type, name, documentation, file_path))
-
-                    if subcontent["type"] == "M":
-                        if "methods" not in _temp:
-                            _temp["methods"] = []
-                        _temp["methods"].append(parse_method(member_type, name, documentation, file_path))
-
-                    if subcontent["type"] == "E":
-                        if "events" not in _temp:
-                            _temp["events"] = []
-                        _temp["events"].append(parse_event(member_type, name, documentation, file_path))
-
-                if "constructors" in _temp:
-                    file.write("## Constructors\n----\n")
-                    file.write("\n".join(_temp["constructors"]))
-
-                if "fields" in _temp:
-                    file.write("## Fields\n----\n")
-                    file.write("\n".join(_temp["fields"]))
-
-                if "properties" in _temp:
-                    file.write("## Properties\n----\n")
-                    file.write("\n".join(_temp["properties"]))
-
-                if "methods" in _temp:
-                    file.write("## Methods\n----\n")
-                    file.write("\n".join(_temp["methods"]))
-
-                if "events" in _temp:
-                    file.write("## Events\n----\n")
-                    file.write("\n".join(_temp["events"]))
-        index.append({namespace: index_files})
-
-    with open(os.path.join(output_dir, "index.yml"), 'w') as yamlfile:
-        yaml.dump(index, yamlfile, default_flow_style=False)
-        log.info("Generated index file: %s", yamlfile.name)
+                pages[filename] = None
+                candidates.append((filename, type_doc))
+        # Pages change if the external links they used resolve differently, e.g. after an offline build
+        resolve_external_links(set().union(*[previous_externals.get(x, []) for x, _ in candidates]))
+        tasks = []
+        for filename, type_doc in candidates:
+            signature = resolver.get_signature(resolver.types[type_doc.full_name])
+            pages[filename] = get_page_hash(signature, type_doc, get_link_map(previous_externals.get(filename, [])))
+            if selective or previous_pages.get(filename) != pages[filename] or not output.exists(filename):
+                tasks.append(type_doc)
+            else:
+                if filename in previous_references:
+                    references[filename] = previous_references[filename]
+                if filename in previous_externals:
+                    externals[filename] = previous_externals[filename]
+        if selective:
+            # Pages of the previous build are kept, without a hash if the types changed since, so the next full build
+            # generates them again, or removes them if their types no longer exist
+            for filename in manifest.get("pages", {}):
+                pages.setdefault(filename, previous_pages.get(filename))
+        removed = [] if selective else [x for x in manifest.get("pages", {}) if x not in pages]
+        for filename in removed:
+            output.remove(filename)
+    log.info("Generating %d of %d pages", len(tasks), len(pages))
+
+    def record_references(resolved_tasks):
+        for type_doc, links, linked_types, external_types in resolved_tasks:
+            filename = get_filename(type_doc.namespace, type_doc.name)
+            references[filename] = linked_types
+            externals[filename] = external_types
+            signature = resolver.get_signature(resolver.types[type_doc.full_name])
+            pages[filename] = get_page_hash(signature, type_doc, get_link_map(external_types))
+            yield type_doc, links
+
+    # External links are resolved in chunks in a background thread, so the first pages are generated while the
+    # following ones are resolved, and the pages are written while the next ones are generated
+    chunks = [tasks[i:i+pipeline_chunk_size] for i in range(0, len(tasks), pipeline_chunk_size)]
+    link_checker = LinkChecker()
+    resolved = record_references(task for chunk in iter_stage(lambda x: resolve_pages(resolver, x), chunks,
+                                                               pipeline_size) for task in chunk)
+    with profile_phase("build_pages"), background_writer(write, pipeline_size) as put:
+        # Without a dll, workers would have nothing to load, so pages are always generated here
+        if jobs > 1 and len(tasks) > 1 and dll_path is not None:
+            import multiprocessing
+            # The CLR can't be forked, so workers are always spawned
+            context = multiprocessing.get_context("spawn")
+            dll_paths = [dll_path] if isinstance(dll_path, str) else dll_path
+            pool = context.Pool(jobs, initializer=init_worker, initargs=(dll_paths, get_settings()))
+            try:
+                chunksize = max(1, min(pipeline_chunk_size, len(tasks) // (jobs * 4)))
+                for filename, page, measures in pool.imap(build_page_worker, resolved, chunksize=chunksize):
+                    link_checker.add_page(filename, page)
+                    put(filename, page)
+                    if measures is not None:
+                        profiler.merge(measures)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for type_doc, _ in resolved:
+                filename = get_filename(type_doc.namespace, type_doc.name)
+                with profile_type(filename):
+                    page = build_page(resolver, type_doc)
+                link_checker.add_page(filename, page)
+                put(filename, page)
+    with profile_phase("check_links"):
+        dangling = link_checker.check(pages, output)
+        for member, target in dangling:
+            log.warning("Dangling link in %s: %s", member, target)
+        if dangling:
+            log.warning("Found %d dangling links", len(dangling))
+    with profile_phase("write_index"):
+        import yaml
+        if selective:
+            # Only the generated pages are added to the previous index
+            included = {get_filename(x.namespace, x.name) for x in tasks}
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            for entry in yaml.load(output.read("index.yml") or "", Loader=loader) or []:
+                for namespace_pages in entry.values():
+                    included.update(filename for page in namespace_pages for filename in page.values())
+        # Build a YAML index, in the same order as the hierarchy
+        index = []
+        for name, namespace in hierarchy.items():
+            entries = [{member: get_filename(name, member)} for member in namespace.types]
+            if selective:
+                entries = [x for x in entries if next(iter(x.values())) in included]
+                if not entries:
+                    continue
+            index.append({name: entries})
+        index_content = yaml.dump(index, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), default_flow_style=False)
+        if output.read("index.yml") != index_content:
+            write("index.yml", index_content)
+            log.info("Generated index file")
+
+        write("manifest.json", json.dumps({"version": manifest_version, "types": types_hash, "pages": pages,
+                                           "references": references, "externals": externals}, indent=1))
+    if search_index:
+        with profile_phase("write_search_index"):
+            previous = output.read(search_index_path)
+            search_content = json.dumps(update_search_index(resolver, hierarchy, pages, previous),
+                                        separators=(",", ":"))
+            if search_content != previous:
+                write(search_index_path, search_content)
+                log.info("Generated search entries")
+
+
+def watch(dll_path, xml_path, force=False, interval=0.5):
+    """Builds the documentation, and builds it again every time the dll or the xml files change
+
+    The runtime and the assembly stay loaded between builds. The assembly is only reloaded if the dll changes,
+    and only pages of types whose documentation or signature changed are generated again.
+    Pages are generated in this process, which has the current assembly loaded, rather than by worker processes
+    that would load it again on every build.
+
+    :param str dll_path: The path to the dll file.
+    :param str xml_path: The path to the XML documentation file.
+    :param bool force: Whether to generate every page on the first build, ignoring the previous build's manifest.
+    :param float interval: Seconds between checks for changes.
+    """
+    def get_state(path):
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+
+    resolver = None
+    hierarchy = None
+    states = {}
+    click.echo("Watching {} and {} for changes, press Ctrl+C to stop".format(dll_path, xml_path))
+    try:
+        while True:
+            try:
+                dll_state, xml_state = get_state(dll_path), get_state(xml_path)
+            except OSError:
+                # Files are removed while the project is being built
+                dll_state = xml_state = None
+            if dll_state is not None and (dll_state, xml_state) != (states.get(dll_path), states.get(xml_path)):
+                start = time.time()
+                try:
+                    if resolver is None or dll_state != states.get(dll_path):
+                        resolver = TypeResolver(load_assembly(dll_path, reload=resolver is not None))
+                    if hierarchy is None or xml_state != states.get(xml_path):
+                        hierarchy = parse_documentation(xml_path)
+                    build_documentation(dll_path, hierarchy, force=force, resolver=resolver)
+                    force = False
+                    if xref_cache is not None:
+                        xref_cache.save()
+                except Exception as e:
+                    # Files may be read while they are still being written, they will be read again on the next change
+                    log.error("Couldn't build documentation: %s", e)
+                else:
+                    click.echo("Documentation built in {:.2f} seconds".format(time.time() - start))
+                states[dll_path], states[xml_path] = dll_state, xml_state
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+class PageCache:
+    """Cache of generated pages, bounded by their total size, discarding the least recently used first
+
+    :param int max_size: The maximum total size of the cached pages, in characters.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self.pages = collections.OrderedDict()
+
+    def get(self, key):
+        """Gets a cached page, marking it as the most recently used
+
+        :param key: The key of the page.
+        :return: The content of the page, or None if not cached.
+        :rtype: str
+        """
+        content = self.pages.get(key)
+        if content is not None:
+            self.pages.move_to_end(key)
+        return content
+
+    def set(self, key, content):
+        """Caches a page, discarding the least recently used ones if the cache is full
+
+        Pages larger than the cache are not cached.
+
+        :param key: The key of the page.
+        :param str content: The content of the page.
+        """
+        if key in self.pages:
+            self.size -= len(self.pages.pop(key))
+        if len(content) > self.max_size:
+            return
+        self.pages[key] = content
+        self.size += len(content)
+        while self.size > self.max_size:
+            _, discarded = self.pages.popitem(last=False)
+            self.size -= len(discarded)
+
+    def clear(self):
+        """Discards every cached page."""
+        self.pages.clear()
+        self.size = 0
+
+
+def render_html(title, content):
+    """Converts a generated page to HTML, to preview it in a browser
+
+    The `markdown <https://python-markdown.github.io/>`_ package is used if installed,
+    otherwise the page is shown as plain text.
+
+    :param str title: The title of the page.
+    :param str content: The markdown content of the page.
+    :rtype: str
+    """
+    try:
+        import markdown
+        body = markdown.markdown(content, extensions=["tables", "fenced_code"])
+    except ImportError:
+        body = "<pre>{}</pre>".format(html.escape(content))
+    return "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{}</title></head><body>\n{}\n</body></html>\n"\
+        .format(html.escape(title), body)
+
+
+def serve(dll_path, xml_path, host="localhost", port=8000):
+    """Serves a preview of the documentation, generating each page when it's requested
+
+    The assembly and the documentation are loaded once, and generated pages are kept in a :class:`PageCache`
+    of :data:`preview_cache_size`. When the dll or the xml files change, they are loaded again and the cache is cleared.
+    Pages are served as HTML (see :func:`render_html`), or as markdown by adding ``?raw`` to their url.
+    Nothing is written to the output.
+
+    :param str dll_path: The path to the dll file, or None to preview the XML file alone.
+    :param str xml_path: The path to the XML documentation file.
+    :param str host: The address the server listens on.
+    :param int port: The port the server listens on.
+    """
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from urllib.parse import unquote, urlsplit
+
+    def get_state(path):
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+
+    cache = PageCache(preview_cache_size)
+    resolver = None
+    # The documentation of each type by the filename of its page
+    pages = {}
+    states = {}
+
+    def refresh():
+        nonlocal resolver, pages, states
+        dll_state = get_state(dll_path) if dll_path is not None else None
+        xml_state = get_state(xml_path)
+        if (dll_state, xml_state) == (states.get(dll_path), states.get(xml_path)):
+            return
+        hierarchy = parse_documentation(xml_path)
+        if dll_path is None:
+            resolver = TypeResolver(XmlAssembly(hierarchy))
+        elif resolver is None or dll_state != states.get(dll_path):
+            resolver = TypeResolver(load_assembly(dll_path, reload=resolver is not None))
+        pages = collections.OrderedDict((get_filename(x.namespace, x.name), x)
+                                        for namespace in hierarchy.values() for x in namespace.types.values())
+        states = {dll_path: dll_state, xml_path: xml_state}
+        cache.clear()
+
+    def get_page(filename, raw):
+        content = cache.get((filename, raw))
+        if content is not None:
+            return content
+        if not raw:
+            page = get_page(filename, True)
+            if page is None:
+                return None
+            content = render_html(filename or "Index", page)
+        elif filename == "":
+            content = "".join("- [{}]({})\n".format(x.full_name, name) for name, x in pages.items())
+        elif filename in pages:
+            with profile_type(filename):
+                content = build_page(resolver, pages[filename])
+        else:
+            return None
+        cache.set((filename, raw), content)
+        return content
+
+    class PreviewHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            filename = unquote(url.path).lstrip("/")
+            raw = url.query == "raw"
+            try:
+                refresh()
+                content = get_page(filename, raw)
+            except Exception as e:
+                log.error("Couldn't generate %s: %s", filename, e)
+                self.send_error(500, str(e))
+                return
+            if content is None:
+                self.send_error(404)
+                return
+            data = content.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/markdown; charset=utf-8" if raw else "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, message_format, *args):
+            log.debug(message_format, *args)
+
+    refresh()
+    server = HTTPServer((host, port), PreviewHandler)
+    click.echo("Serving a preview on http://{}:{}/, press Ctrl+C to stop".format(host, server.server_port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
 
 @click.command()
 @click.argument('dll_path', type=click.Path(exists=True, dir_okay=False))
-@click.argument('xml_path', type=click.Path(exists=True, dir_okay=False))
+@click.argument('xml_path', type=click.Path(exists=True, dir_okay=False), required=False)
 @click.option('-v', '--verbose', is_flag=True, help="Enables verbose output")
 @click.option('-q', '--quiet', is_flag=True, help="Hides warnings")
-@click.option('-o', '--output', type=click.Path(exists=False, file_okay=False), default="output/", help="Folder where files will be generated in")
-def cli(dll_path, xml_path, verbose, quiet, output):
-    global output_dir
+@click.option('-o', '--output', type=click.Path(exists=False), default="output/", help="Folder where files will be generated in, or a .zip or .tar archive")
+@click.option('--cache', type=click.Path(dir_okay=False), default=".xref_cache.sqlite", help="File where external links are cached")
+@click.option('--cache-ttl', type=click.INT, default=30, help="Days before a cached external link is requested again")
+@click.option('--offline', 'offline_mode', is_flag=True, help="Only use cached external links, no requests are made")
+@click.option('--xref-url', 'url', default=xref_url, help="URL of the xref service used to look up external links")
+@click.option('--xref-connections', 'connections', type=click.IntRange(min=1), default=xref_connections, help="Maximum number of concurrent xref requests")
+@click.option('--xrefmap', 'xrefmap_path', type=click.Path(exists=True, dir_okay=False), help="A DocFX xrefmap.yml, or an index compiled from one, where external links are looked up before the cache and the xref service")
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=1, help="Number of processes used to generate pages")
+@click.option('-f', '--force', is_flag=True, help="Generates every page, even if it hasn't changed since the last build")
+@click.option('-w', '--watch', 'watch_mode', is_flag=True, help="Keeps running, building again every time the files change")
+@click.option('--serve', 'serve_port', type=click.IntRange(min=0, max=65535), help="Serves a preview of the documentation on this port, generating each page when it's requested")
+@click.option('--only', multiple=True, help="Only generates the page of this type, given by its full name, e.g. Namespace.Type. Can be used several times")
+@click.option('--namespace', 'namespaces', multiple=True, help="Only generates the pages of the types in this namespace, including nested namespaces. Can be used several times")
+@click.option('--dependents', is_flag=True, help="With --only or --namespace, also generates the pages linking to the selected types")
+@click.option('--backend', 'backend_name', type=click.Choice(["pythonnet", "metadata"]), default=backend, help="How the assembly is read: loaded with pythonnet, or by reading its metadata without a .NET runtime")
+@click.option('--xml-only', is_flag=True, help="Previews pages from the XML file alone, given as the only argument, without reading the dll")
+@click.option('--batch', is_flag=True, help="Documents several assemblies together, listed in a YAML manifest given as the only argument")
+@click.option('--model', 'model_path', type=click.Path(dir_okay=False), help="Saves the compiled documentation of the dll and XML files into this file, and generates the pages from it while they don't change")
+@click.option('--from-model', is_flag=True, help="Generates the pages from a model saved with --model, given as the only argument, without the dll, the XML file or the network")
+@click.option('--search-index', 'search', is_flag=True, help="Writes the search entries of the pages into .markdowndotnet-search.json, used by mkdocs through the markdowndotnet_search.py hook")
+@click.option('--dump-hierarchy', 'dump', is_flag=True, help="Saves the parsed documentation into hierarchy.json, for debugging purposes")
+@click.option('--profile', 'profile_path', type=click.Path(dir_okay=False), help="Saves a JSON report with the time taken by each phase and type, and counters of lookups, requests and bytes written")
+@click.option('--cprofile', 'cprofile_path', type=click.Path(dir_okay=False), help="Saves cProfile statistics of the main process, to be read with pstats")
+def cli(dll_path, xml_path, verbose, quiet, output, cache, cache_ttl, offline_mode, url, connections, xrefmap_path,
+        jobs, force, watch_mode, serve_port, only, namespaces, dependents, backend_name, xml_only, batch, model_path,
+        from_model, search, dump, profile_path, cprofile_path):
+    global output_dir, output_sink, xref_cache, xref_index, offline, xref_url, xref_connections, backend, profiler, \
+        hierarchy_dump, search_index
+    options = [name for name, enabled in (("--xml-only", xml_only), ("--batch", batch), ("--from-model", from_model))
+               if enabled]
+    if len(options) > 1:
+        raise click.UsageError("{} can't be used together".format(" and ".join(options)))
+    if options:
+        option = options[0]
+        if xml_path is not None:
+            raise click.UsageError("Only one file is expected with {}".format(option))
+        if watch_mode:
+            raise click.UsageError("--watch can't be used with {}".format(option))
+    if xml_only:
+        dll_path, xml_path = None, dll_path
+    elif batch:
+        assemblies = load_batch(dll_path)
+    elif from_model:
+        model = read_model(dll_path)
+        if model is None:
+            raise click.UsageError("{} is not a model saved with --model by this version".format(dll_path))
+    elif xml_path is None:
+        raise click.UsageError("Missing argument \"XML_PATH\"")
+    if watch_mode and output.endswith(tuple(archive_extensions)):
+        raise click.UsageError("--watch can only be used with an output folder")
+    if watch_mode and (only or namespaces):
+        raise click.UsageError("--watch can't be used with --only or --namespace")
+    if watch_mode and jobs > 1:
+        raise click.UsageError("--watch can't be used with --jobs, pages are generated in the watching process")
+    if dependents and not (only or namespaces):
+        raise click.UsageError("--dependents can only be used with --only or --namespace")
+    if serve_port is not None and (watch_mode or batch or from_model or only or namespaces):
+        raise click.UsageError("--serve can't be used with --watch, --batch, --from-model, --only or --namespace")
+    if model_path is not None and (options or watch_mode or serve_port is not None):
+        raise click.UsageError("--model can only be used when building from a dll and its XML file")
     output_dir = output
+    # The preview server doesn't write any file
+    output_sink = MemoryOutput() if serve_port is not None else create_output(output)
+    backend = backend_name
+    hierarchy_dump = dump
+    search_index = search
+    # Models have the external links they use
+    offline = offline_mode or from_model
+    xref_url = url
+    xref_connections = connections
     if verbose:
         log.setLevel(logging.DEBUG)
     if quiet:
         log.setLevel(logging.ERROR)
-    hierarchy = parse_documentation(xml_path)
-    build_documentation(dll_path, hierarchy)
+    if profile_path is not None:
+        profiler = Profiler()
+    if cprofile_path is not None:
+        import cProfile
+        c_profiler = cProfile.Profile()
+        c_profiler.enable()
+    if xrefmap_path is not None:
+        xref_index = load_xref_index(xrefmap_path, cache)
+    xref_cache = XrefCache(":memory:" if from_model else cache, cache_ttl*24*60*60)
+    try:
+        if watch_mode:
+            watch(dll_path, xml_path, force)
+        elif serve_port is not None:
+            serve(dll_path, xml_path, port=serve_port)
+        elif xml_only:
+            hierarchy = parse_documentation(xml_path)
+            build_documentation(None, hierarchy, force=force, resolver=TypeResolver(XmlAssembly(hierarchy)),
+                                only=only, namespaces=namespaces, dependents=dependents)
+        elif batch:
+            build_batch(assemblies, jobs, force, only, namespaces, dependents)
+        elif from_model:
+            resolver, hierarchy = load_model(model)
+            build_documentation(None, hierarchy, force=force, resolver=resolver, only=only, namespaces=namespaces,
+                                dependents=dependents)
+        elif model_path is not None:
+            resolver, hierarchy, compiled = load_compiled_documentation(dll_path, xml_path, model_path)
+            # Workers would have to load the assembly, so pages of a compiled model are generated here
+            build_documentation(None if compiled else dll_path, hierarchy, jobs, force, resolver=resolver, only=only,
+                                namespaces=namespaces, dependents=dependents)
+        else:
+            resolver, hierarchy = load_documentation([dll_path], [xml_path])
+            build_documentation(dll_path, hierarchy, jobs, force, resolver=resolver, only=only, namespaces=namespaces,
+                                dependents=dependents)
+    finally:
+        xref_cache.close()
+        if xref_index is not None:
+            xref_index.close()
+        output_sink.close()
+        if cprofile_path is not None:
+            c_profiler.disable()
+            c_profiler.dump_stats(cprofile_path)
+        if profiler is not None:
+            profiler.save(profile_path)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,84 @@
+"""mkdocs hook adding the pages generated by markdowndotnet to the search index from their prebuilt entries
+
+Pages generated with ``--search-index`` have their search entries written into ``.markdowndotnet-search.json``,
+from the documentation of their types and members. With this hook, mkdocs' search plugin takes those pages' entries
+from that file instead of parsing their html, other pages are indexed as usual.
+
+It's enabled in ``mkdocs.yml`` (mkdocs 1.4 or later), along with the search plugin::
+
+    plugins:
+      - search
+    hooks:
+      - markdowndotnet_search.py
+"""
+import json
+import logging
+import os
+
+from mkdocs.contrib.search.search_index import SearchIndex
+from mkdocs.plugins import event_priority
+
+log = logging.getLogger("mkdocs.hooks.markdowndotnet_search")
+
+# The file written by markdowndotnet, see markdowndotnet.update_search_index
+entries_filename = ".markdowndotnet-search.json"
+
+
+def load_entries(docs_dir):
+    """Loads the search entries of the generated pages in the documentation folder
+
+    Pages can be generated into any of its subfolders.
+
+    :param str docs_dir: The mkdocs documentation folder.
+    :return: The entries of each page, by its path relative to the documentation folder.
+    :rtype: dict[str, dict]
+    """
+    entries = {}
+    for folder, _, files in os.walk(docs_dir):
+        if entries_filename not in files:
+            continue
+        prefix = os.path.relpath(folder, docs_dir).replace(os.sep, "/")
+        prefix = "" if prefix == "." else prefix + "/"
+        try:
+            with open(os.path.join(folder, entries_filename), encoding="utf-8") as f:
+                pages = json.load(f)["pages"]
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("Couldn't read %s: %s", os.path.join(folder, entries_filename), e)
+            continue
+        for path, page_entries in pages.items():
+            entries[prefix + path] = page_entries
+    return entries
+
+
+class PrebuiltSearchIndex(SearchIndex):
+    """A search index adding pages with prebuilt entries from them, and the other pages by parsing their html
+
+    :param dict[str, dict] entries: The entries of each page, as returned by :func:`load_entries`.
+    :param config: The search plugin's configuration.
+    """
+    def __init__(self, entries, **config):
+        super().__init__(**config)
+        self.entries = entries
+
+    def add_entry_from_context(self, page):
+        path = getattr(page.file, "src_uri", None) or page.file.src_path.replace(os.sep, "/")
+        page_entries = self.entries.get(path)
+        if page_entries is None:
+            super().add_entry_from_context(page)
+            return
+        full = self.config["indexing"] == "full"
+        self._add_entry(title=page.title, text=page_entries["text"] if full else "", loc=page.url)
+        if self.config["indexing"] in ("full", "sections"):
+            for section in page_entries["sections"]:
+                self._add_entry(title=section["title"], text=section["text"] if full else "",
+                                loc=page.url + "#" + section["anchor"])
+
+
+# Runs after the search plugin creates its index for the build
+@event_priority(-50)
+def on_pre_build(config, **kwargs):
+    search = config.plugins.get("search")
+    if not isinstance(getattr(search, "search_index", None), SearchIndex):
+        log.warning("mkdocs' search plugin is not enabled, search entries of generated pages are not used")
+        return
+    search.search_index = PrebuiltSearchIndex(load_entries(config.docs_dir), **search.config)
@@ -2,8 +2,8 @@ import sys
 
 from setuptools import setup
 
-if sys.version_info < (3, 4):
-    sys.exit('Sorry, Python < 3.4 is not supported')
+if sys.version_info < (3, 6):
+    sys.exit('Sorry, Python < 3.6 is not supported')
 
 with open('requirements.txt') as f:
     requirements = f.read().splitlines()
@@ -19,8 +19,9 @@ setup(
     description='A Python markdown generator for C# libraries documentation.',
     long_description=readme,
     url='https://github.com/Galarzaa90/markdowndotnet',
-    py_modules=['markdowndotnet'],
+    py_modules=['markdowndotnet', 'dotnetmetadata', 'markdowndotnet_search'],
     install_requires=requirements,
+    python_requires='>=3.6',
     entry_points='''
         [console_scripts]
         markdowndotnet=markdowndotnet:cli
@@ -34,8 +35,6 @@ setup(
         'Operating System :: OS Independent',
         'Programming Language :: C#',
         'Programming Language :: Python :: 3 :: Only',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
         'Topic :: Documentation',
         'Topic :: Software Development :: Documentation',
@@ -0,0 +1,63 @@
+import pytest
+
+from markdowndotnet import get_params, split_doc_id
+
+
+@pytest.mark.parametrize("doc_id, expected", [
+    ("System.Collections.Generic.List`1", ("System.Collections.Generic", "List`1", [])),
+    ("System.Collections.Generic.Dictionary`2.KeyCollection",
+     ("System.Collections.Generic.Dictionary`2", "KeyCollection", [])),
+    ("Example", None),
+])
+def test_split_type_id(doc_id, expected):
+    assert split_doc_id(doc_id, 2) == expected
+
+
+@pytest.mark.parametrize("doc_id, expected", [
+    ("NS.Type.Method", ("NS", "Type", "Method", [])),
+    ("NS.Type.Method()", ("NS", "Type", "Method()", [])),
+    ("NS.Sub.Type.Method(System.String,System.Int32)",
+     ("NS.Sub", "Type", "Method(System.String,System.Int32)", ["System.String", "System.Int32"])),
+    # Generic methods and arguments, whose commas and dots don't separate anything
+    ("NS.Type.Method``1(``0,System.Collections.Generic.List{``0})",
+     ("NS", "Type", "Method``1(``0,System.Collections.Generic.List{``0})",
+      ["``0", "System.Collections.Generic.List{``0}"])),
+    ("NS.Type`1.Add(System.Collections.Generic.Dictionary{System.String,System.Int32[]},`0)",
+     ("NS", "Type`1", "Add(System.Collections.Generic.Dictionary{System.String,System.Int32[]},`0)",
+      ["System.Collections.Generic.Dictionary{System.String,System.Int32[]}", "`0"])),
+    # Explicit interface implementations, whose names have their dots replaced by '#'
+    ("NS.Type.System#IDisposable#Dispose", ("NS", "Type", "System#IDisposable#Dispose", [])),
+    ("NS.Type.System#Collections#Generic#IDictionary{System.String,System.Object}#Add(System.String,System.Object)",
+     ("NS", "Type",
+      "System#Collections#Generic#IDictionary{System.String,System.Object}#Add(System.String,System.Object)",
+      ["System.String", "System.Object"])),
+    # Conversion operators, with their return type after the parameters
+    ("NS.Type.op_Implicit(System.Int32)~System.Decimal",
+     ("NS", "Type", "op_Implicit(System.Int32)~System.Decimal", ["System.Int32"])),
+    ("NS.Type`1.op_Explicit(NS.Type{System.Int32})~System.Nullable{System.Int32}",
+     ("NS", "Type`1", "op_Explicit(NS.Type{System.Int32})~System.Nullable{System.Int32}",
+      ["NS.Type{System.Int32}"])),
+    # Parameters passed by reference, pointers and arrays
+    ("NS.Type.TryParse(System.String,System.Int32@)",
+     ("NS", "Type", "TryParse(System.String,System.Int32@)", ["System.String", "System.Int32@"])),
+    ("NS.Type.Read(System.Byte*,System.Int32)",
+     ("NS", "Type", "Read(System.Byte*,System.Int32)", ["System.Byte*", "System.Int32"])),
+    ("NS.Type.Set(System.Int32[0:,0:],System.Int32[],System.Char*@)",
+     ("NS", "Type", "Set(System.Int32[0:,0:],System.Int32[],System.Char*@)",
+      ["System.Int32[0:,0:]", "System.Int32[]", "System.Char*@"])),
+    ("Type.Method", None),
+    ("NS..Method", None),
+])
+def test_split_member_id(doc_id, expected):
+    assert split_doc_id(doc_id) == expected
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Method", []),
+    ("Method()", []),
+    ("Item(System.Int32)", ["System.Int32"]),
+    ("op_Implicit(System.Int32)~System.Decimal", ["System.Int32"]),
+    ("Method``2(System.Func{``0,``1},``0[]@)", ["System.Func{``0,``1}", "``0[]@"]),
+])
+def test_get_params(name, expected):
+    assert get_params(name) == expected
@@ -0,0 +1,100 @@
+import pytest
+
+from markdowndotnet import LinkChecker, MemoryOutput
+
+
+page_a = """\
+# Class A
+
+Uses [B](B.md) and [Other](../Other/C.md#class-c).
+
+## Methods
+
+### Run(int)
+
+Calls [Run](#runint), [Stop](#stop) and [Missing](Missing.md).
+
+### Run(int)
+
+An overload, see [the other one](#runint_1) and [the docs](https://docs.example.com/a#run).
+"""
+
+page_b = """\
+# Class B
+
+## Properties
+
+### Value
+
+Links to [A](A.md#runint), [A's second overload](A.md#runint_2) and [this page](B.md).
+"""
+
+# Generated by a previous build, only read from the output when linked
+page_c = """\
+# Class C
+
+### Dispose()
+
+Back to [B](../Lib/B.md#value).
+"""
+
+
+@pytest.fixture
+def output():
+    output = MemoryOutput()
+    output.write("Lib/A.md", page_a)
+    output.write("Lib/B.md", page_b)
+    output.write("Other/C.md", page_c)
+    return output
+
+
+@pytest.fixture
+def checker(output):
+    checker = LinkChecker()
+    checker.add_page("Lib/A.md", page_a)
+    checker.add_page("Lib/B.md", page_b)
+    return checker
+
+
+def test_scan():
+    titles, links = LinkChecker.scan(page_a, "Lib.A")
+    assert titles == ["Class A", "Methods", "Run(int)", "Run(int)"]
+    assert links == [("Lib.A", ["B.md", "../Other/C.md#class-c"]),
+                     ("Lib.A.Run(int)", ["#runint", "#stop", "Missing.md"]),
+                     ("Lib.A.Run(int)", ["#runint_1", "https://docs.example.com/a#run"])]
+
+
+def test_dangling_links(checker, output):
+    dangling = checker.check(set(output.files), output)
+    assert dangling == [("Lib.A.Run(int)", "#stop"),
+                        ("Lib.A.Run(int)", "Missing.md"),
+                        ("Lib.B.Value", "A.md#runint_2")]
+
+
+def test_duplicated_headers_get_numbered_anchors(checker, output):
+    assert checker.get_anchors("Lib/A.md", output) == {"class-a", "methods", "runint", "runint_1"}
+
+
+def test_pages_outside_the_build_are_read_from_the_output(checker, output):
+    assert checker.get_anchors("Other/C.md", output) == {"class-c", "dispose"}
+    # Pages that aren't in the output have no anchors
+    assert checker.get_anchors("Other/D.md", output) == set()
+
+
+def test_missing_pages(checker, output):
+    pages = set(output.files) - {"Other/C.md"}
+    assert ("Lib.A", "../Other/C.md#class-c") in checker.check(pages, output)
+
+
+@pytest.mark.parametrize("target, valid", [
+    ("B.md", True),
+    ("./B.md#value", True),
+    ("../Lib/B.md#properties", True),
+    ("B.md#missing", False),
+    ("../Other/C.md#dispose", True),
+    ("C.md", False),
+    ("#methods", True),
+    ("mailto:someone@example.com", True),
+])
+def test_is_valid(checker, output, target, valid):
+    assert checker.is_valid("Lib/A.md", target, set(output.files), output) == valid
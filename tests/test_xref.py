@@ -0,0 +1,278 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from urllib3.util.retry import Retry
+
+import markdowndotnet
+from markdowndotnet import XrefCache, XrefIndex, load_xref_index, resolve_external_links
+
+
+class XrefServer(ThreadingMixIn, HTTPServer):
+    """A stub of the xref service, answering each uid with the statuses queued for it, then with its reference"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), XrefHandler)
+        self.references = {}
+        self.failures = {}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}/query".format(self.server_address[1])
+
+
+class XrefHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        uid = parse_qs(urlparse(self.path).query)["uid"][0]
+        with self.server.lock:
+            self.server.requests.append(uid)
+            failures = self.server.failures.get(uid)
+            status = failures.pop(0) if failures else None
+        if status is None and uid not in self.server.references:
+            status = 404 if uid.startswith("Missing.") else None
+        if status is not None:
+            self.send_error(status)
+            return
+        reference = self.server.references.get(uid)
+        body = json.dumps([reference] if reference else []).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = XrefServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = XrefCache(str(tmp_path / "cache.sqlite"), 3600)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def xref(server, cache, monkeypatch):
+    """Points markdowndotnet at the stub, with a new session and without waiting between retries"""
+    monkeypatch.setattr(markdowndotnet, "xref_url", server.url)
+    monkeypatch.setattr(markdowndotnet, "xref_session", None)
+    monkeypatch.setattr(markdowndotnet, "xref_cache", cache)
+    monkeypatch.setattr(markdowndotnet, "xref_index", None)
+    monkeypatch.setattr(markdowndotnet, "offline", False)
+    monkeypatch.setattr(Retry, "get_backoff_time", lambda self: 0)
+    return server
+
+
+def reference(uid):
+    return {"name": uid.rsplit(".", 1)[-1], "href": "https://docs.example.com/" + uid.lower()}
+
+
+def test_resolve_caches_links(xref, cache, tmp_path):
+    xref.references["System.String"] = reference("System.String")
+    xref.references["System.Int32"] = reference("System.Int32")
+    resolve_external_links(["System.String", "System.Int32", "System.String", "Unknown.Type"])
+    assert sorted(xref.requests) == ["System.Int32", "System.String", "Unknown.Type"]
+    cache.save()
+    reopened = XrefCache(str(tmp_path / "cache.sqlite"), 3600)
+    try:
+        assert reopened.get("System.String") == ("String", "https://docs.example.com/system.string")
+        assert reopened.get("System.Int32") == ("Int32", "https://docs.example.com/system.int32")
+        # Types without documentation are cached too, so they aren't requested again
+        assert reopened.get("Unknown.Type") == (None, None)
+    finally:
+        reopened.close()
+
+
+def test_cached_links_are_not_requested(xref, cache):
+    cache.set("System.String", "String", "https://docs.example.com/system.string")
+    xref.references["System.Int32"] = reference("System.Int32")
+    resolve_external_links(["System.String", "System.Int32"])
+    assert xref.requests == ["System.Int32"]
+    resolve_external_links(["System.String", "System.Int32"])
+    assert xref.requests == ["System.Int32"]
+
+
+def test_expired_links_are_requested_again(xref, tmp_path, monkeypatch):
+    cache = XrefCache(str(tmp_path / "expired.sqlite"), -1)
+    monkeypatch.setattr(markdowndotnet, "xref_cache", cache)
+    try:
+        cache.set("System.String", "Old", "https://docs.example.com/old")
+        cache.entries.clear()
+        xref.references["System.String"] = reference("System.String")
+        resolve_external_links(["System.String"])
+        assert xref.requests == ["System.String"]
+        assert cache.get("System.String") == ("String", "https://docs.example.com/system.string")
+    finally:
+        cache.close()
+
+
+def test_server_errors_are_retried(xref, cache):
+    xref.references["System.String"] = reference("System.String")
+    xref.failures["System.String"] = [503, 502]
+    resolve_external_links(["System.String"])
+    assert xref.requests == ["System.String"] * 3
+    assert cache.get("System.String") == ("String", "https://docs.example.com/system.string")
+
+
+def test_failed_requests_are_not_persisted(xref, cache, caplog):
+    xref.failures["System.String"] = [500] * 10
+    resolve_external_links(["System.String", "Missing.Type"])
+    # 3 retries for server errors, client errors aren't retried
+    assert xref.requests.count("System.String") == 4
+    assert xref.requests.count("Missing.Type") == 1
+    assert "Couldn't request documentation reference for Missing.Type" in caplog.text
+    # Failures are kept for the current run only, so the next run requests them again
+    assert cache.get("System.String") == (None, None)
+    assert cache.get("Missing.Type") == (None, None)
+    cache.entries.clear()
+    assert cache.get("System.String") is None
+    assert cache.get("Missing.Type") is None
+
+
+def test_offline_only_loads_cached_links(xref, cache, monkeypatch):
+    monkeypatch.setattr(markdowndotnet, "offline", True)
+    cache.set("System.String", "String", "https://docs.example.com/system.string")
+    cache.entries.clear()
+    resolve_external_links(["System.String", "System.Int32"])
+    assert xref.requests == []
+    assert cache.entries == {"System.String": ("String", "https://docs.example.com/system.string")}
+
+
+def test_indexed_links_are_not_requested(xref, cache, tmp_path, monkeypatch):
+    xrefmap = tmp_path / "xrefmap.yml"
+    xrefmap.write_text("references:\n- uid: System.String\n  name: String\n  href: https://example.com/string\n",
+                       encoding="utf-8")
+    XrefIndex.compile(str(xrefmap), str(tmp_path / "xrefmap.idx"))
+    index = XrefIndex(str(tmp_path / "xrefmap.idx"))
+    monkeypatch.setattr(markdowndotnet, "xref_index", index)
+    try:
+        xref.references["System.Int32"] = reference("System.Int32")
+        resolve_external_links(["System.String", "System.Int32"])
+        assert xref.requests == ["System.Int32"]
+        assert cache.get("System.String") is None
+    finally:
+        index.close()
+
+
+xrefmap_content = """\
+### YamlMime:XRefMap
+sorted: true
+baseUrl: https://docs.example.com/api/
+references:
+- uid: System.String
+  name: String
+  href: system.string
+  fullName: System.String
+- uid: System.Collections.Generic.List`1
+  name: List<T>
+  href: https://other.example.com/list
+- uid: System.Int32
+  href: system.int32
+- uid: System.NoHref
+  name: NoHref
+- uid: System.String
+  name: Duplicate
+  href: duplicate
+- uid: Ünïcode.Type
+  name: Ünïcode
+  href: unicode
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    xrefmap = tmp_path / "xrefmap.yml"
+    xrefmap.write_text(xrefmap_content, encoding="utf-8")
+    path = str(tmp_path / "xrefmap.idx")
+    assert XrefIndex.compile(str(xrefmap), path) == 4
+    index = XrefIndex(path)
+    yield index
+    index.close()
+
+
+def test_index_get(index):
+    assert index.get("System.String") == ("String", "https://docs.example.com/api/system.string")
+    assert index.get("System.Collections.Generic.List`1") == ("List<T>", "https://other.example.com/list")
+    # The name defaults to the last part of the uid
+    assert index.get("System.Int32") == ("Int32", "https://docs.example.com/api/system.int32")
+    assert index.get("Ünïcode.Type") == ("Ünïcode", "https://docs.example.com/api/unicode")
+
+
+def test_index_skips_references_without_url(index):
+    assert index.get("System.NoHref") is None
+
+
+@pytest.mark.parametrize("uid", ["", "A", "System", "System.String2", "System.Strin", "Z"])
+def test_index_missing(index, uid):
+    assert index.get(uid) is None
+
+
+def test_index_binary_search(tmp_path):
+    uids = ["N{:04}.T{}".format(i, i % 7) for i in range(0, 2000, 3)]
+    xrefmap = tmp_path / "xrefmap.yml"
+    xrefmap.write_text("references:\n" + "".join("- uid: {0}\n  href: https://x/{0}\n".format(x) for x in uids[::-1]),
+                       encoding="utf-8")
+    path = str(tmp_path / "xrefmap.idx")
+    assert XrefIndex.compile(str(xrefmap), path) == len(uids)
+    index = XrefIndex(path)
+    try:
+        for uid in uids:
+            assert index.get(uid) == (uid.rsplit(".", 1)[-1], "https://x/" + uid)
+        assert index.get("N0001.T1") is None
+        assert index.get("N9999.T0") is None
+    finally:
+        index.close()
+
+
+def test_index_rejects_other_files(tmp_path):
+    path = tmp_path / "xrefmap.yml"
+    path.write_text(xrefmap_content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        XrefIndex(str(path))
+
+
+def test_load_compiles_next_to_the_cache(tmp_path):
+    xrefmap_dir = tmp_path / "readonly"
+    xrefmap_dir.mkdir()
+    xrefmap = xrefmap_dir / "xrefmap.yml"
+    xrefmap.write_text(xrefmap_content, encoding="utf-8")
+    xrefmap_dir.chmod(0o555)
+    cache_path = str(tmp_path / "cache" / ".xref_cache.sqlite")
+    (tmp_path / "cache").mkdir()
+    try:
+        index = load_xref_index(str(xrefmap), cache_path)
+        try:
+            assert index.get("System.String") == ("String", "https://docs.example.com/api/system.string")
+        finally:
+            index.close()
+    finally:
+        xrefmap_dir.chmod(0o755)
+    compiled = list((tmp_path / "cache").glob(".xref_cache.*.idx"))
+    assert len(compiled) == 1
+    assert list(xrefmap_dir.iterdir()) == [xrefmap]
+    # The compiled index is reused, and can be given directly
+    mtime = compiled[0].stat().st_mtime_ns
+    load_xref_index(str(xrefmap), cache_path).close()
+    assert compiled[0].stat().st_mtime_ns == mtime
+    index = load_xref_index(str(compiled[0]), cache_path)
+    try:
+        assert index.get("System.Int32") == ("Int32", "https://docs.example.com/api/system.int32")
+    finally:
+        index.close()